@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+
+METRICS = ("p50_us", "p99_us", "throughput_per_s")
+
+
+def compare(baseline: dict, candidate: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, base in baseline["results"].items():
+        current = candidate["results"].get(name)
+        if current is None:
+            continue
+        for metric in METRICS:
+            before, after = base[metric], current[metric]
+            if not before:
+                continue
+            change = (after - before) / before
+            worse = change < -tolerance if metric == "throughput_per_s" else change > tolerance
+            marker = "REGRESSION" if worse else ""
+            print(f"{name:24s} {metric:18s} {before:12.1f} -> {after:12.1f} ({change:+.1%}) {marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown.")
+    args = parser.parse_args()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    candidate = json.loads(args.candidate.read_text(encoding="utf-8"))
+    regressions = compare(baseline, candidate, args.tolerance)
+    if regressions:
+        raise SystemExit(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.stub_dhan import StubDhanServer
+from benchmarks.synthetic import strike_steps, synthetic_master
+from bot.core.dhan_client import AsyncDhanClient, DhanClient, DhanCredentials
+from bot.core.instrument_cache import InstrumentCache
+from bot.core.order_manager import OrderManager
+from bot.core.order_types import OrderRequest
+from bot.core.position_manager import PositionManager
+from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.core.state_store import StateStore
+from bot.core.trading_control import TradingControl
+from bot.strategy.atm_option_selector import AtmOptionSelector
+from bot.strategy.scalping_logic import ScalpingLogic
+from bot.strategy.signal_router import SignalRouter
+from bot.strategy.strategies import ScalpAtmStrategy
+from bot.utils.metrics import LatencyRecorder
+from bot.webhook.listener import create_app
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _summarize(samples_ns: list[int], elapsed_s: float) -> dict[str, float]:
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+    return {
+        "count": count,
+        "throughput_per_s": count / elapsed_s if elapsed_s else 0.0,
+        "mean_us": statistics.fmean(ordered) / 1e3,
+        "p50_us": ordered[count // 2] / 1e3,
+        "p99_us": ordered[min(int(count * 0.99), count - 1)] / 1e3,
+        "max_us": ordered[-1] / 1e3,
+    }
+
+
+def _time_calls(func: Callable[[int], Any], iterations: int) -> dict[str, float]:
+    samples = []
+    started = time.perf_counter()
+    for iteration in range(iterations):
+        begin = time.perf_counter_ns()
+        func(iteration)
+        samples.append(time.perf_counter_ns() - begin)
+    return _summarize(samples, time.perf_counter() - started)
+
+
+def bench_cache_load(workdir: Path, instruments: list[dict[str, Any]], iterations: int) -> dict[str, float]:
+    cache = InstrumentCache(workdir / "instruments.bin")
+    cache.save(instruments)
+
+    def _load(_: int) -> None:
+        cache.load().close()
+
+    return _time_calls(_load, iterations)
+
+
+def bench_selector(instruments: list[dict[str, Any]], iterations: int) -> dict[str, float]:
+    selector = AtmOptionSelector(instruments, strike_steps(), metrics=LatencyRecorder())
+
+    def _select(iteration: int) -> None:
+        selector.select("NIFTY", 22000 + (iteration % 40) * 25, "BUY" if iteration % 2 else "SELL")
+
+    return _time_calls(_select, iterations)
+
+
+def _risk_manager(store: StateStore) -> RiskManager:
+    limits = RiskLimits(max_trades_per_day=10**9, max_daily_loss=10**12, risk_per_trade_pct=100.0)
+    return RiskManager(limits, store, PositionManager(store))
+
+
+def bench_risk_validate(workdir: Path, iterations: int) -> dict[str, float]:
+    risk_manager = _risk_manager(StateStore(workdir / "bot.db"))
+    request = OrderRequest(
+        symbol="NIFTY26FEB22000CE",
+        exchange="NFO",
+        side="BUY",
+        quantity=50,
+        order_type="MARKET",
+        product_type="INTRADAY",
+        reference_price=100.0,
+    )
+    return _time_calls(lambda _: risk_manager.validate_order(request), iterations)
+
+
+def _signal_app(workdir: Path, instruments: list[dict[str, Any]], mode: str, base_url: str) -> Any:
+    credentials = DhanCredentials(client_id="BENCH", access_token="BENCH", base_url=base_url)
+    metrics = LatencyRecorder()
+    store = StateStore(workdir / "bot.db")
+    trading_control = TradingControl(store)
+    order_manager = OrderManager(
+        DhanClient(credentials, metrics=metrics),
+        _risk_manager(store),
+        trading_control,
+        execution_mode=mode,
+        async_client=AsyncDhanClient(credentials, metrics=metrics),
+        metrics=metrics,
+    )
+    selector = AtmOptionSelector(instruments, strike_steps(), metrics=metrics)
+    strategy = ScalpAtmStrategy(selector=selector, logic=ScalpingLogic(sl_points=15, target_points=30))
+    router = SignalRouter({"SCALP_ATM"}, {"SCALP_ATM": strategy})
+    app = create_app(
+        router=router,
+        order_manager=order_manager,
+        signal_ttl_seconds=3600,
+        spot_price_provider=lambda symbol, price: price,
+        trading_control=trading_control,
+        metrics=metrics,
+    )
+    return app, metrics
+
+
+async def _drive_signals(app: Any, requests: int, concurrency: int) -> dict[str, float]:
+    samples: list[int] = []
+    failures = 0
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in range(requests):
+        queue.put_nowait(index)
+    transport = httpx.ASGITransport(app=app)
+
+    async def _worker(client: httpx.AsyncClient) -> None:
+        nonlocal failures
+        while not queue.empty():
+            index = queue.get_nowait()
+            payload = {
+                "strategy": "SCALP_ATM",
+                "symbol": "NIFTY",
+                "side": "BUY" if index % 2 else "SELL",
+                "timeframe": "1m",
+                "price": 22000 + (index % 40) * 25,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
+            begin = time.perf_counter_ns()
+            response = await client.post("/signal", json=payload)
+            samples.append(time.perf_counter_ns() - begin)
+            if response.status_code != 200:
+                failures += 1
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {**_summarize(samples, elapsed), "failures": failures, "concurrency": concurrency}
+
+
+def bench_signal(
+    workdir: Path,
+    instruments: list[dict[str, Any]],
+    mode: str,
+    requests: int,
+    concurrency: int,
+) -> dict[str, Any]:
+    with StubDhanServer() as server:
+        app, metrics = _signal_app(workdir, instruments, mode, server.base_url)
+        result = asyncio.run(_drive_signals(app, requests, concurrency))
+    return {**result, "stages": metrics.snapshot()["stages"]}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(rows: int, iterations: int, requests: int, concurrency: int) -> dict[str, Any]:
+    instruments = synthetic_master(rows)
+    with tempfile.TemporaryDirectory() as temp:
+        workdir = Path(temp)
+        results = {
+            "instrument_cache_load": bench_cache_load(workdir / "cache", instruments, max(iterations // 100, 10)),
+            "atm_select": bench_selector(instruments, iterations),
+            "risk_validate_order": bench_risk_validate(workdir / "risk", iterations),
+            "signal_paper": bench_signal(workdir / "paper", instruments, "paper", requests, concurrency),
+            "signal_live_stub": bench_signal(workdir / "live", instruments, "live", requests, concurrency),
+        }
+    return {
+        "revision": _git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"rows": rows, "iterations": iterations, "requests": requests, "concurrency": concurrency},
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the webhook and order pipeline.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic instrument master size.")
+    parser.add_argument("--iterations", type=int, default=10_000, help="Iterations per micro-benchmark.")
+    parser.add_argument("--requests", type=int, default=2_000, help="Signals sent per /signal benchmark.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent /signal clients.")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<revision>-<time>.json).")
+    args = parser.parse_args()
+
+    report = run(args.rows, args.iterations, args.requests, args.concurrency)
+    if args.output:
+        output = Path(args.output)
+    else:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{report['revision']}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    for name, result in report["results"].items():
+        print(f"{name:24s} p50={result['p50_us']:10.1f}us p99={result['p99_us']:10.1f}us "
+              f"rate={result['throughput_per_s']:10.1f}/s")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    order_ids = itertools.count(1)
+    instruments: list[dict[str, Any]] = []
+
+    def _reply(self, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/instruments"):
+            self._reply(self.instruments)
+        else:
+            self._reply([])
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply({"orderId": str(next(self.order_ids)), "orderStatus": "TRANSIT"})
+
+    def do_DELETE(self) -> None:
+        self._reply({"orderId": self.path.rsplit("/", 1)[-1], "orderStatus": "CANCELLED"})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StubDhanServer:
+    """Local stand-in for the Dhan REST API used by the live-mode benchmarks."""
+
+    def __init__(self, instruments: list[dict[str, Any]] | None = None) -> None:
+        handler = type("Handler", (_StubHandler,), {"instruments": instruments or []})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> StubDhanServer:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
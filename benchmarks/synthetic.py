@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+
+UNDERLYINGS = {"NIFTY": (22000, 50, 50), "BANKNIFTY": (48000, 100, 15), "FINNIFTY": (21000, 50, 40)}
+
+
+def synthetic_master(rows: int = 100_000, today: date | None = None) -> list[dict[str, Any]]:
+    today = today or date.today()
+    expiries = [today + timedelta(days=7 * week) for week in range(8)]
+    instruments: list[dict[str, Any]] = []
+    for symbol, (spot, step, lot_size) in UNDERLYINGS.items():
+        for expiry in expiries:
+            for offset in range(-100, 101):
+                strike = spot + offset * step
+                for option_type in ("CE", "PE"):
+                    instruments.append(
+                        {
+                            "symbol": symbol,
+                            "expiry": expiry.isoformat(),
+                            "strike": strike,
+                            "option_type": option_type,
+                            "trading_symbol": f"{symbol}{expiry:%d%b%y}{strike}{option_type}".upper(),
+                            "lot_size": lot_size,
+                            "exchange": "NFO",
+                            "tradable": True,
+                        }
+                    )
+    equity = 0
+    while len(instruments) < rows:
+        instruments.append(
+            {
+                "symbol": f"EQ{equity:06d}",
+                "expiry": None,
+                "strike": 0,
+                "option_type": "",
+                "trading_symbol": f"EQ{equity:06d}-EQ",
+                "lot_size": 1,
+                "exchange": "NSE",
+                "tradable": True,
+            }
+        )
+        equity += 1
+    return instruments[:rows]
+
+
+def strike_steps() -> dict[str, int]:
+    return {symbol: step for symbol, (_, step, _) in UNDERLYINGS.items()}
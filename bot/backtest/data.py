@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import csv
+import json
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from bot.core.instrument_cache import InstrumentCache, InstrumentTable
+from bot.strategy.scalping_logic import Signal
+from bot.utils.time_utils import parse_timestamp
+
+
+_IST_OFFSET_SECONDS = 19_800
+_BAR_COLUMNS = ("trading_symbol", "timestamp", "open", "high", "low", "close")
+
+
+def epoch_seconds(value: str) -> int:
+    moment = parse_timestamp(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def ist_day(epoch: np.ndarray | int) -> np.ndarray | int:
+    return (epoch + _IST_OFFSET_SECONDS) // 86_400
+
+
+class BarSet:
+    """Option OHLC bars as sorted columns, contiguous per trading symbol."""
+
+    def __init__(
+        self,
+        symbols: np.ndarray,
+        timestamps: np.ndarray,
+        open_: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+    ) -> None:
+        order = np.lexsort((timestamps, symbols))
+        self.symbols = symbols[order]
+        self.timestamps = timestamps[order].astype(np.int64)
+        self.open = open_[order].astype(np.float64)
+        self.high = high[order].astype(np.float64)
+        self.low = low[order].astype(np.float64)
+        self.close = close[order].astype(np.float64)
+        self.days = ist_day(self.timestamps)
+        unique, starts = np.unique(self.symbols, return_index=True)
+        ends = np.append(starts[1:], len(self.symbols))
+        self._segments = {str(symbol): (int(start), int(end)) for symbol, start, end in zip(unique, starts, ends)}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def first_at_or_after(self, symbol: str, epoch: int) -> tuple[int, int] | None:
+        """Index of the first bar of ``symbol`` at or after ``epoch`` and the end of its segment."""
+        segment = self._segments.get(symbol)
+        if segment is None:
+            return None
+        start, end = segment
+        index = start + int(np.searchsorted(self.timestamps[start:end], epoch, side="left"))
+        if index >= end:
+            return None
+        return index, end
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list[Any]]) -> BarSet:
+        missing = [name for name in _BAR_COLUMNS if name not in columns]
+        if missing:
+            raise ValueError(f"Bar file is missing columns: {', '.join(missing)}")
+        return cls(
+            symbols=np.asarray(columns["trading_symbol"], dtype=str),
+            timestamps=np.array([epoch_seconds(str(value)) for value in columns["timestamp"]], dtype=np.int64),
+            open_=np.asarray(columns["open"], dtype=np.float64),
+            high=np.asarray(columns["high"], dtype=np.float64),
+            low=np.asarray(columns["low"], dtype=np.float64),
+            close=np.asarray(columns["close"], dtype=np.float64),
+        )
+
+
+def read_columns(path: Path) -> dict[str, list[Any]]:
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as exc:
+            raise RuntimeError("Reading Parquet files requires pyarrow") from exc
+        return parquet.read_table(path).to_pydict()
+    with path.open("r", encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    if not rows:
+        return {}
+    return {name: [row[name] for row in rows] for name in rows[0]}
+
+
+def load_signals(path: Path) -> list[Signal]:
+    columns = read_columns(path)
+    if not columns:
+        return []
+    signals = [
+        Signal(
+            strategy=str(strategy),
+            symbol=str(symbol),
+            side=str(side),
+            timeframe=str(timeframe),
+            price=float(price),
+            timestamp=str(timestamp),
+        )
+        for strategy, symbol, side, timeframe, price, timestamp in zip(
+            columns["strategy"],
+            columns["symbol"],
+            columns["side"],
+            columns["timeframe"],
+            columns["price"],
+            columns["timestamp"],
+        )
+    ]
+    return signals
+
+
+def load_bars(path: Path) -> BarSet:
+    return BarSet.from_columns(read_columns(path))
+
+
+def load_instruments(path: Path) -> InstrumentTable | list[dict[str, Any]]:
+    if path.suffix == ".bin":
+        return InstrumentCache(path).load()
+    with path.open("r", encoding="utf-8") as file:
+        return json.load(file)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import itertools
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from bot.backtest.data import BarSet, epoch_seconds, ist_day
+from bot.core.instrument_cache import InstrumentTable
+from bot.core.risk_manager import RiskLimits, limit_violation
+from bot.strategy.atm_option_selector import AtmOptionSelector, AtmSelection
+from bot.strategy.scalping_logic import ScalpingLogic, Signal, TradePlan
+from bot.utils.metrics import LatencyRecorder
+from bot.utils.time_utils import IST
+
+
+EXIT_REASONS = ("STOP_LOSS", "TARGET", "TIME")
+
+
+@dataclass(frozen=True)
+class PreparedSignals:
+    """Signals resolved to contracts and entry bars; independent of SL/target parameters."""
+
+    signals: tuple[Signal, ...]
+    selections: tuple[AtmSelection, ...]
+    entry_index: np.ndarray
+    window: np.ndarray
+    valid: np.ndarray
+    skipped: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class BacktestTrade:
+    timestamp: str
+    symbol: str
+    side: str
+    quantity: int
+    entry_price: float
+    exit_price: float
+    exit_reason: str
+    pnl: float
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    sl_points: float
+    target_points: float
+    trades: tuple[BacktestTrade, ...]
+    rejected: dict[str, int]
+    skipped: dict[str, int]
+
+    def summary(self) -> dict[str, Any]:
+        pnl = np.array([trade.pnl for trade in self.trades], dtype=np.float64)
+        equity = np.cumsum(pnl)
+        drawdown = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:] - equity if len(pnl) else pnl
+        return {
+            "sl_points": self.sl_points,
+            "target_points": self.target_points,
+            "trades": len(self.trades),
+            "wins": int((pnl > 0).sum()),
+            "losses": int((pnl < 0).sum()),
+            "win_rate": float((pnl > 0).mean()) if len(pnl) else 0.0,
+            "total_pnl": float(pnl.sum()),
+            "max_drawdown": float(drawdown.max()) if len(pnl) else 0.0,
+            "exits": dict(Counter(trade.exit_reason for trade in self.trades)),
+            "rejected": dict(self.rejected),
+            "skipped": dict(self.skipped),
+        }
+
+
+def prepare_signals(
+    signals: list[Signal],
+    instruments: InstrumentTable | list[dict[str, Any]],
+    strike_steps: dict[str, int],
+    bars: BarSet,
+    max_holding_bars: int = 375,
+    strike_offset: int = 0,
+) -> PreparedSignals:
+    """Select each signal's contract as the live bot would have on that day and find its bars.
+
+    The entry fills at the open of the first bar at or after the signal. The
+    holding window runs up to ``max_holding_bars`` bars, never past the end of
+    the IST trading day.
+    """
+    # The selector only rolls its expiry calendar forward, so walk signals in time order.
+    signals = sorted(signals, key=lambda signal: epoch_seconds(signal.timestamp))
+    start = epoch_seconds(signals[0].timestamp) if signals else 0
+    clock = [datetime.fromtimestamp(start, tz=IST)]
+    selector = AtmOptionSelector(
+        instruments,
+        strike_steps,
+        metrics=LatencyRecorder(),
+        clock_source=lambda: clock[0],
+    )
+    kept_signals: list[Signal] = []
+    selections: list[AtmSelection] = []
+    entries: list[int] = []
+    ends: list[int] = []
+    skipped: Counter[str] = Counter()
+    for signal in signals:
+        epoch = epoch_seconds(signal.timestamp)
+        clock[0] = datetime.fromtimestamp(epoch, tz=IST)
+        try:
+            selection = selector.select(signal.symbol, signal.price, signal.side, strike_offset)
+        except ValueError:
+            skipped["no_contract"] += 1
+            continue
+        located = bars.first_at_or_after(selection.symbol, epoch)
+        if located is None or bars.days[located[0]] != ist_day(epoch):
+            skipped["no_bars"] += 1
+            continue
+        kept_signals.append(signal)
+        selections.append(selection)
+        entries.append(located[0])
+        ends.append(located[1])
+    entry_index = np.asarray(entries, dtype=np.int64)
+    offsets = np.arange(max_holding_bars, dtype=np.int64)
+    window = entry_index[:, None] + offsets[None, :]
+    inside = window < np.asarray(ends, dtype=np.int64)[:, None]
+    window = np.where(inside, window, entry_index[:, None])
+    valid = inside & (bars.days[window] == bars.days[entry_index][:, None])
+    valid = np.logical_and.accumulate(valid, axis=1)
+    return PreparedSignals(
+        signals=tuple(kept_signals),
+        selections=tuple(selections),
+        entry_index=entry_index,
+        window=window,
+        valid=valid,
+        skipped=dict(skipped),
+    )
+
+
+def simulate(
+    prepared: PreparedSignals,
+    bars: BarSet,
+    limits: RiskLimits,
+    sl_points: float,
+    target_points: float,
+) -> BacktestResult:
+    logic = ScalpingLogic(sl_points=sl_points, target_points=target_points)
+    plans = [logic.build_trade(signal, selection) for signal, selection in zip(prepared.signals, prepared.selections)]
+    count = len(plans)
+    if count == 0:
+        return BacktestResult(sl_points, target_points, (), {}, dict(prepared.skipped))
+    # Plans are priced off the signal, which carries the underlying's level; the
+    # SL/target distances are re-anchored on the option's entry fill.
+    entry_price = bars.open[prepared.entry_index]
+    anchor = entry_price - np.array([signal.price for signal in prepared.signals], dtype=np.float64)
+    long = np.array([plan.entry.side == "BUY" for plan in plans])[:, None]
+    stop = (np.array([plan.stop_loss_price for plan in plans], dtype=np.float64) + anchor)[:, None]
+    target = (
+        np.array(
+            [plan.target_price if plan.target_price is not None else np.nan for plan in plans],
+            dtype=np.float64,
+        )
+        + anchor
+    )[:, None]
+    highs = bars.high[prepared.window]
+    lows = bars.low[prepared.window]
+    stop_hit = np.where(long, lows <= stop, highs >= stop) & prepared.valid
+    target_hit = np.where(long, highs >= target, lows <= target) & prepared.valid
+    horizon = prepared.window.shape[1]
+    last = prepared.valid.sum(axis=1) - 1
+    first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), horizon)
+    first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), horizon)
+    # A bar that touches both levels is counted as a stop: OHLC cannot tell which came first.
+    by_stop = first_stop <= np.minimum(first_target, last)
+    by_target = ~by_stop & (first_target <= last)
+    exit_offset = np.where(by_stop, first_stop, np.where(by_target, first_target, last))
+    rows = np.arange(count)
+    exit_index = prepared.window[rows, exit_offset]
+    exit_open = bars.open[exit_index]
+    long_flat = long[:, 0]
+    stop_fill = np.where(long_flat, np.minimum(exit_open, stop[:, 0]), np.maximum(exit_open, stop[:, 0]))
+    target_fill = np.where(long_flat, np.maximum(exit_open, target[:, 0]), np.minimum(exit_open, target[:, 0]))
+    exit_price = np.where(by_stop, stop_fill, np.where(by_target, target_fill, bars.close[exit_index]))
+    quantity = np.array([plan.entry.quantity for plan in plans], dtype=np.float64)
+    pnl = (exit_price - entry_price) * quantity * np.where(long_flat, 1.0, -1.0)
+    reasons = np.where(by_stop, 0, np.where(by_target, 1, 2))
+    accepted, rejected = _apply_risk_limits(plans, prepared, bars, exit_index, pnl, limits)
+    trades = tuple(
+        BacktestTrade(
+            timestamp=prepared.signals[row].timestamp,
+            symbol=plans[row].entry.symbol,
+            side=plans[row].entry.side,
+            quantity=plans[row].entry.quantity,
+            entry_price=float(entry_price[row]),
+            exit_price=float(exit_price[row]),
+            exit_reason=EXIT_REASONS[reasons[row]],
+            pnl=float(pnl[row]),
+        )
+        for row in np.flatnonzero(accepted)
+    )
+    return BacktestResult(sl_points, target_points, trades, rejected, dict(prepared.skipped))
+
+
+def _apply_risk_limits(
+    plans: list[TradePlan],
+    prepared: PreparedSignals,
+    bars: BarSet,
+    exit_index: np.ndarray,
+    pnl: np.ndarray,
+    limits: RiskLimits,
+) -> tuple[np.ndarray, dict[str, int]]:
+    """Replay RiskManager's entry rules in time order; the only sequential step."""
+    entry_times = bars.timestamps[prepared.entry_index]
+    exit_times = bars.timestamps[exit_index]
+    accepted = np.zeros(len(plans), dtype=bool)
+    rejected: Counter[str] = Counter()
+    open_positions: list[tuple[int, int]] = []
+    open_symbols: Counter[str] = Counter()
+    day = None
+    trades = 0
+    daily_loss = 0.0
+    for row in np.argsort(entry_times, kind="stable"):
+        if bars.days[prepared.entry_index[row]] != day:
+            day = bars.days[prepared.entry_index[row]]
+            trades = 0
+            daily_loss = 0.0
+        while open_positions and open_positions[0][0] <= entry_times[row]:
+            _, closed = heapq.heappop(open_positions)
+            open_symbols[plans[closed].entry.symbol] -= 1
+            if bars.days[exit_index[closed]] == day:
+                daily_loss += max(-pnl[closed], 0.0)
+        request = plans[row].entry
+        violation = limit_violation(limits, request, trades, daily_loss)
+        if violation is None and open_symbols[request.symbol] > 0:
+            violation = "Open position exists for symbol"
+        if violation is not None:
+            rejected[violation] += 1
+            continue
+        accepted[row] = True
+        trades += 1
+        open_symbols[request.symbol] += 1
+        heapq.heappush(open_positions, (int(exit_times[row]), int(row)))
+    return accepted, dict(rejected)
+
+
+_worker_state: dict[str, Any] = {}
+
+
+def _install_worker(prepared: PreparedSignals, bars: BarSet, limits: RiskLimits) -> None:
+    _worker_state.update(prepared=prepared, bars=bars, limits=limits)
+
+
+def _run_point(sl_points: float, target_points: float) -> dict[str, Any]:
+    return simulate(_worker_state["prepared"], _worker_state["bars"], _worker_state["limits"], sl_points, target_points).summary()
+
+
+def sweep(
+    prepared: PreparedSignals,
+    bars: BarSet,
+    limits: RiskLimits,
+    sl_values: list[float],
+    target_values: list[float],
+    workers: int | None = None,
+) -> list[dict[str, Any]]:
+    """Run every (sl_points, target_points) pair on a process pool, best total P&L first."""
+    grid = list(itertools.product(sl_values, target_values))
+    if not grid:
+        return []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_install_worker,
+        initargs=(prepared, bars, limits),
+    ) as pool:
+        summaries = list(pool.map(_run_point, *zip(*grid)))
+    return sorted(summaries, key=lambda summary: summary["total_pnl"], reverse=True)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from bot.backtest.data import load_bars, load_instruments, load_signals
+from bot.backtest.engine import prepare_signals, simulate, sweep
+from bot.core.risk_manager import RiskLimits
+
+
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+
+
+def _load_yaml(path: Path) -> dict[str, Any]:
+    with path.open("r", encoding="utf-8") as file:
+        return yaml.safe_load(file)
+
+
+def _floats(value: str) -> list[float]:
+    return [float(item) for item in value.split(",") if item.strip()]
+
+
+def main() -> None:
+    risk_config = _load_yaml(CONFIG_DIR / "risk.yaml")
+    strategy_config = _load_yaml(CONFIG_DIR / "strategy.yaml")
+
+    parser = argparse.ArgumentParser(description="Backtest ScalpingLogic and ATM selection on historical option bars.")
+    parser.add_argument("--signals", required=True, help="CSV or Parquet of webhook signals.")
+    parser.add_argument("--bars", required=True, help="CSV or Parquet of option OHLC bars keyed by trading_symbol.")
+    parser.add_argument("--instruments", required=True, help="Instrument master (.bin cache or .json records).")
+    parser.add_argument("--sl", default=str(risk_config["sl_points"]["scalping"]), help="SL points, comma separated.")
+    parser.add_argument(
+        "--target",
+        default=str(risk_config["target_points"]["scalping"]),
+        help="Target points, comma separated.",
+    )
+    parser.add_argument("--max-holding-bars", type=int, default=375, help="Bars before a time exit.")
+    parser.add_argument("--workers", type=int, help="Processes for parameter sweeps (default: all cores).")
+    parser.add_argument("--output", help="Write the summary (and trades for a single run) to this JSON file.")
+    args = parser.parse_args()
+
+    bars = load_bars(Path(args.bars))
+    prepared = prepare_signals(
+        load_signals(Path(args.signals)),
+        load_instruments(Path(args.instruments)),
+        strategy_config["index_strike_steps"],
+        bars,
+        max_holding_bars=args.max_holding_bars,
+        strike_offset=int(strategy_config.get("strike_offset", 0)),
+    )
+    limits = RiskLimits(
+        max_trades_per_day=risk_config["max_trades_per_day"],
+        max_daily_loss=risk_config["max_daily_loss"],
+        risk_per_trade_pct=risk_config["risk_per_trade_pct"],
+        capital=risk_config.get("capital"),
+    )
+    sl_values = _floats(args.sl)
+    target_values = _floats(args.target)
+    if len(sl_values) == 1 and len(target_values) == 1:
+        result = simulate(prepared, bars, limits, sl_values[0], target_values[0])
+        report: dict[str, Any] = {"summary": result.summary(), "trades": [asdict(trade) for trade in result.trades]}
+        summaries = [report["summary"]]
+    else:
+        summaries = sweep(prepared, bars, limits, sl_values, target_values, workers=args.workers)
+        report = {"sweep": summaries}
+
+    for summary in summaries:
+        print(
+            f"sl={summary['sl_points']:8.2f} target={summary['target_points']:8.2f} "
+            f"trades={summary['trades']:5d} win_rate={summary['win_rate']:6.1%} "
+            f"pnl={summary['total_pnl']:12.2f} max_dd={summary['max_drawdown']:12.2f}"
+        )
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from bot.core.state_store import StateStore
 from bot.core.trading_control import TradingControl
 
 
@@ -18,9 +19,9 @@ def _build_parser() -> argparse.ArgumentParser:
         help="Optional reason for enabling/disabling trading.",
     )
     parser.add_argument(
-        "--state-path",
-        default=str(Path(__file__).resolve().parent / "state" / "trading.json"),
-        help="Path to trading control state file.",
+        "--state-db",
+        default=str(Path(__file__).resolve().parent / "state" / "bot.db"),
+        help="Path to the bot's state database.",
     )
     return parser
 
@@ -29,13 +30,17 @@ def main() -> None:
     parser = _build_parser()
     args = parser.parse_args()
 
-    control = TradingControl(Path(args.state_path))
-    if args.action == "enable":
-        state = control.enable(reason=args.reason)
-    elif args.action == "disable":
-        state = control.disable(reason=args.reason)
-    else:
-        state = control.status()
+    store = StateStore(Path(args.state_db))
+    try:
+        control = TradingControl(store)
+        if args.action == "enable":
+            state = control.enable(reason=args.reason)
+        elif args.action == "disable":
+            state = control.disable(reason=args.reason)
+        else:
+            state = control.status()
+    finally:
+        store.close()
 
     print(f"enabled={state.enabled} updated_at={state.updated_at} reason={state.reason}")
 
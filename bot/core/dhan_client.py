@@ -1,11 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 
+from bot.core.rate_limiter import ENTRY_PRIORITY, ORDER_PRIORITIES, RequestScheduler
+from bot.core.security_ids import SecurityIdMap
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+from bot.utils.retry import BackoffPolicy, parse_retry_after
 
 
 @dataclass(frozen=True)
@@ -15,40 +26,317 @@ class DhanCredentials:
     base_url: str
 
 
+@dataclass(frozen=True)
+class EndpointTimeout:
+    connect: float
+    read: float
+
+
+@dataclass(frozen=True)
+class DhanConnectionSettings:
+    pool_size: int = 10
+    timeouts: dict[str, EndpointTimeout] = field(
+        default_factory=lambda: {
+            "orders": EndpointTimeout(connect=3.0, read=10.0),
+            "positions": EndpointTimeout(connect=3.0, read=5.0),
+            "instruments": EndpointTimeout(connect=5.0, read=60.0),
+            "data": EndpointTimeout(connect=2.0, read=3.0),
+        }
+    )
+
+    def timeout_for(self, endpoint: str) -> EndpointTimeout:
+        return self.timeouts.get(endpoint, EndpointTimeout(connect=5.0, read=30.0))
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    new_connections: int = 0
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+
+# Connections opened by the request running on this thread; a thread sends one
+# request at a time, so the count belongs to that request alone.
+_opened = threading.local()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self) -> Any:
+        _opened.count = getattr(_opened, "count", 0) + 1
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self) -> Any:
+        _opened.count = getattr(_opened, "count", 0) + 1
+        return super()._new_conn()
+
+
+class _CountingAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _build_headers(credentials: DhanCredentials) -> dict[str, str]:
+    return {
+        "ClientID": credentials.client_id,
+        "access-token": credentials.access_token,
+        "Content-Type": "application/json",
+    }
+
+
+def _with_security_id(payload: dict[str, Any], security_ids: SecurityIdMap | None) -> dict[str, Any]:
+    if security_ids is None or "securityId" in payload:
+        return payload
+    ref = security_ids.resolve(str(payload.get("symbol", "")))
+    if ref is None:
+        return payload
+    return {**payload, "securityId": str(ref.security_id), "exchangeSegment": ref.segment}
+
+
+def _snapshot_stats(stats: dict[str, EndpointStats]) -> dict[str, dict[str, int]]:
+    return {
+        endpoint: {
+            "requests": item.requests,
+            "new_connections": item.new_connections,
+            "reused_connections": item.reused_connections,
+        }
+        for endpoint, item in stats.items()
+    }
+
+
 class DhanClient:
-    def __init__(self, credentials: DhanCredentials) -> None:
+    def __init__(
+        self,
+        credentials: DhanCredentials,
+        settings: DhanConnectionSettings | None = None,
+        metrics: LatencyRecorder | None = None,
+        scheduler: RequestScheduler | None = None,
+        backoff: BackoffPolicy | None = None,
+        security_ids: SecurityIdMap | None = None,
+    ) -> None:
         self._credentials = credentials
+        self._settings = settings or DhanConnectionSettings()
+        self._metrics = metrics or get_recorder()
+        self._scheduler = scheduler
+        self._backoff = backoff or BackoffPolicy()
+        self._security_ids = security_ids
         self._logger = setup_logger(self.__class__.__name__)
+        self._headers = _build_headers(credentials)
+        self._adapter = _CountingAdapter(
+            pool_connections=1,
+            pool_maxsize=self._settings.pool_size,
+            pool_block=False,
+        )
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+        self._stats: dict[str, EndpointStats] = {}
+        self._stats_lock = threading.Lock()
 
-    def _headers(self) -> dict[str, str]:
-        return {
-            "ClientID": self._credentials.client_id,
-            "access-token": self._credentials.access_token,
-            "Content-Type": "application/json",
-        }
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        path: str,
+        priority: int = ENTRY_PRIORITY,
+        **kwargs: Any,
+    ) -> requests.Response:
+        for attempt in itertools.count():
+            if self._scheduler is not None:
+                self._scheduler.acquire_blocking(endpoint, priority)
+            response = self._send(method, endpoint, path, **kwargs)
+            if response.status_code != 429 or attempt + 1 >= self._backoff.max_attempts:
+                break
+            delay = self._backoff.delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            self._metrics.increment(f"dhan.{endpoint}.throttled")
+            self._logger.warning("Rate limited by broker", extra={"endpoint": endpoint, "retry_in": delay})
+            time.sleep(delay)
+        response.raise_for_status()
+        return response
+
+    def _send(self, method: str, endpoint: str, path: str, **kwargs: Any) -> requests.Response:
+        timeout = self._settings.timeout_for(endpoint)
+        _opened.count = 0
+        with self._metrics.stage(f"dhan.{endpoint}"):
+            response = self._session.request(
+                method,
+                f"{self._credentials.base_url}{path}",
+                timeout=(timeout.connect, timeout.read),
+                **kwargs,
+            )
+        opened = _opened.count
+        with self._stats_lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.new_connections += opened
+        if opened > 0 and endpoint == "orders":
+            self._logger.warning("Order request opened a new connection", extra={"opened": opened})
+        return response
+
+    def connection_stats(self) -> dict[str, dict[str, int]]:
+        with self._stats_lock:
+            return _snapshot_stats(self._stats)
+
+    def close(self) -> None:
+        self._session.close()
 
     def get_instruments(self) -> list[dict[str, Any]]:
-        url = f"{self._credentials.base_url}/instruments"
         self._logger.info("Fetching instrument master")
-        response = requests.get(url, headers=self._headers(), timeout=30)
-        response.raise_for_status()
-        payload = response.json()
+        payload = self._request("GET", "instruments", "/instruments").json()
         if not isinstance(payload, list):
             raise ValueError("Instrument master response is invalid")
         return payload
 
-    def place_order(self, payload: dict[str, Any]) -> dict[str, Any]:
-        url = f"{self._credentials.base_url}/orders"
+    def place_order(self, payload: dict[str, Any] | bytes, priority: int = ENTRY_PRIORITY) -> dict[str, Any]:
+        """Place an order from a payload dict or an already encoded JSON body."""
+        if isinstance(payload, bytes):
+            self._logger.info("Placing order", extra={"payload": payload.decode("utf-8")})
+            return self._request("POST", "orders", "/orders", priority=priority, data=payload).json()
+        payload = _with_security_id(payload, self._security_ids)
         self._logger.info("Placing order", extra={"payload": payload})
-        response = requests.post(url, json=payload, headers=self._headers(), timeout=30)
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", "orders", "/orders", priority=priority, json=payload).json()
+
+    def cancel_order(self, order_id: str, priority: int = ORDER_PRIORITIES["EXIT"]) -> dict[str, Any]:
+        self._logger.info("Cancelling order", extra={"order_id": order_id})
+        return self._request("DELETE", "orders", f"/orders/{order_id}", priority=priority).json()
 
     def get_positions(self) -> list[dict[str, Any]]:
-        url = f"{self._credentials.base_url}/positions"
-        response = requests.get(url, headers=self._headers(), timeout=30)
+        payload = self._request("GET", "positions", "/positions").json()
+        if not isinstance(payload, list):
+            raise ValueError("Positions response is invalid")
+        return payload
+
+    def get_orders(self) -> list[dict[str, Any]]:
+        payload = self._request("GET", "order_book", "/orders").json()
+        if not isinstance(payload, list):
+            raise ValueError("Order book response is invalid")
+        return payload
+
+    def get_ltp(self, instruments: dict[str, list[int]]) -> dict[str, dict[str, float]]:
+        payload = self._request("POST", "data", "/marketfeed/ltp", json=instruments).json()
+        data = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            raise ValueError("LTP response is invalid")
+        return {
+            segment: {str(security_id): float(quote["last_price"]) for security_id, quote in quotes.items()}
+            for segment, quotes in data.items()
+        }
+
+
+class AsyncDhanClient:
+    def __init__(
+        self,
+        credentials: DhanCredentials,
+        settings: DhanConnectionSettings | None = None,
+        metrics: LatencyRecorder | None = None,
+        scheduler: RequestScheduler | None = None,
+        backoff: BackoffPolicy | None = None,
+        security_ids: SecurityIdMap | None = None,
+    ) -> None:
+        self._credentials = credentials
+        self._settings = settings or DhanConnectionSettings()
+        self._metrics = metrics or get_recorder()
+        self._scheduler = scheduler
+        self._backoff = backoff or BackoffPolicy()
+        self._security_ids = security_ids
+        self._logger = setup_logger(self.__class__.__name__)
+        self._client = httpx.AsyncClient(
+            base_url=credentials.base_url,
+            headers=_build_headers(credentials),
+            limits=httpx.Limits(
+                max_connections=self._settings.pool_size,
+                max_keepalive_connections=self._settings.pool_size,
+            ),
+        )
+        self._stats: dict[str, EndpointStats] = {}
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        path: str,
+        priority: int = ENTRY_PRIORITY,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        for attempt in itertools.count():
+            if self._scheduler is not None:
+                await self._scheduler.acquire(endpoint, priority)
+            response = await self._send(method, endpoint, path, **kwargs)
+            if response.status_code != 429 or attempt + 1 >= self._backoff.max_attempts:
+                break
+            delay = self._backoff.delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            self._metrics.increment(f"dhan.{endpoint}.throttled")
+            self._logger.warning("Rate limited by broker", extra={"endpoint": endpoint, "retry_in": delay})
+            await asyncio.sleep(delay)
         response.raise_for_status()
-        payload = response.json()
+        return response
+
+    async def _send(self, method: str, endpoint: str, path: str, **kwargs: Any) -> httpx.Response:
+        timeout = self._settings.timeout_for(endpoint)
+        stats = self._stats.setdefault(endpoint, EndpointStats())
+
+        async def _trace(event: str, info: dict[str, Any]) -> None:
+            if event == "connection.connect_tcp.complete":
+                stats.new_connections += 1
+                if endpoint == "orders":
+                    self._logger.warning("Order request opened a new connection")
+
+        with self._metrics.stage(f"dhan.{endpoint}"):
+            response = await self._client.request(
+                method,
+                path,
+                timeout=httpx.Timeout(timeout.read, connect=timeout.connect),
+                extensions={"trace": _trace},
+                **kwargs,
+            )
+        stats.requests += 1
+        return response
+
+    def connection_stats(self) -> dict[str, dict[str, int]]:
+        return _snapshot_stats(self._stats)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def get_instruments(self) -> list[dict[str, Any]]:
+        self._logger.info("Fetching instrument master")
+        payload = (await self._request("GET", "instruments", "/instruments")).json()
+        if not isinstance(payload, list):
+            raise ValueError("Instrument master response is invalid")
+        return payload
+
+    async def place_order(self, payload: dict[str, Any] | bytes, priority: int = ENTRY_PRIORITY) -> dict[str, Any]:
+        """Place an order from a payload dict or an already encoded JSON body."""
+        if isinstance(payload, bytes):
+            self._logger.info("Placing order", extra={"payload": payload.decode("utf-8")})
+            body = {"content": payload}
+        else:
+            payload = _with_security_id(payload, self._security_ids)
+            self._logger.info("Placing order", extra={"payload": payload})
+            body = {"json": payload}
+        return (await self._request("POST", "orders", "/orders", priority=priority, **body)).json()
+
+    async def cancel_order(self, order_id: str, priority: int = ORDER_PRIORITIES["EXIT"]) -> dict[str, Any]:
+        self._logger.info("Cancelling order", extra={"order_id": order_id})
+        return (await self._request("DELETE", "orders", f"/orders/{order_id}", priority=priority)).json()
+
+    async def get_positions(self) -> list[dict[str, Any]]:
+        payload = (await self._request("GET", "positions", "/positions")).json()
         if not isinstance(payload, list):
             raise ValueError("Positions response is invalid")
         return payload
+
+    async def get_orders(self) -> list[dict[str, Any]]:
+        payload = (await self._request("GET", "order_book", "/orders")).json()
+        if not isinstance(payload, list):
+            raise ValueError("Order book response is invalid")
+        return payload
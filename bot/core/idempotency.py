@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from bot.core.state_store import StateStore
+
+
+class IdempotencyCache:
+    """Bounded LRU of responses keyed by an idempotency key.
+
+    Entries expire ``ttl_seconds`` after they were stored. With a ``store``
+    every stored response is also written to ``namespace``, and expired or
+    evicted rows are pruned on start-up, so a retry after a restart still
+    gets the original response instead of a second order.
+    """
+
+    def __init__(
+        self,
+        store: StateStore | None = None,
+        namespace: str = "idempotency",
+        max_entries: int = 10_000,
+        ttl_seconds: float = 86_400.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._store = store
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+        if store is not None:
+            self._restore(store)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, response = entry
+            if self._clock() - stored_at > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        stored_at = self._clock()
+        with self._lock:
+            self._entries[key] = (stored_at, response)
+            self._entries.move_to_end(key)
+            evicted = self._evict()
+        if self._store is not None:
+            with self._store.transaction(durable=True):
+                self._store.put(self._namespace, key, {"stored_at": stored_at, "response": response})
+                for old_key in evicted:
+                    self._store.delete(self._namespace, old_key)
+
+    def _evict(self) -> list[str]:
+        evicted = []
+        while len(self._entries) > self._max_entries:
+            evicted.append(self._entries.popitem(last=False)[0])
+        return evicted
+
+    def _restore(self, store: StateStore) -> None:
+        now = self._clock()
+        records = sorted(store.items(self._namespace), key=lambda item: item[1]["stored_at"])
+        stale = []
+        for key, record in records:
+            if now - record["stored_at"] > self._ttl_seconds:
+                stale.append(key)
+                continue
+            self._entries[key] = (record["stored_at"], record["response"])
+        stale.extend(self._evict())
+        with store.transaction():
+            for key in stale:
+                store.delete(self._namespace, key)
@@ -1,25 +1,290 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import mmap
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
 from typing import Any
 
+from bot.core.state_store import StateStore
 from bot.utils.logger import setup_logger
 
 
+_MAGIC = b"APIC"
+_VERSION = 2
+_HEADER = struct.Struct("<4sHxxII")
+_ALIGNMENT = 8
+
+# (name, array typecode); string columns hold ids into the interned string table.
+_NUMERIC_COLUMNS = (("strike", "d"), ("security_id", "q"), ("expiry", "i"), ("lot_size", "i"), ("tradable", "B"))
+_STRING_COLUMNS = ("symbol", "option_type", "trading_symbol", "exchange", "segment")
+
+# Dhan exchange segment for masters that only name the exchange.
+EXCHANGE_SEGMENTS = {"NFO": "NSE_FNO", "BFO": "BSE_FNO", "NSE": "NSE_EQ", "BSE": "BSE_EQ"}
+
+
+def _expiry_ordinal(value: Any) -> int:
+    if not value:
+        return 0
+    try:
+        return datetime.fromisoformat(str(value)).date().toordinal()
+    except ValueError:
+        return 0
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGNMENT)
+
+
+def _file_version(path: Path) -> int | None:
+    with path.open("rb") as file:
+        header = file.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    magic, version, _, _ = _HEADER.unpack(header)
+    return version if magic == _MAGIC else None
+
+
+class InstrumentTable:
+    """Read-only columnar view over the instrument master.
+
+    Numeric fields are fixed-width columns and text fields are ids into an
+    interned string table, so a memory-mapped file can be read without
+    materialising a dict per row.
+    """
+
+    def __init__(self, buffer: Any, mapping: mmap.mmap | None = None) -> None:
+        self._mapping = mapping
+        view = memoryview(buffer)
+        magic, version, rows, strings = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Unsupported instrument cache format")
+        self._rows = rows
+        offset = _HEADER.size + len(_padding(_HEADER.size))
+        self._columns: dict[str, memoryview] = {}
+        for name, typecode in (*_NUMERIC_COLUMNS, *((name, "I") for name in _STRING_COLUMNS)):
+            size = rows * array(typecode).itemsize
+            self._columns[name] = view[offset : offset + size].cast(typecode)
+            offset += size + len(_padding(size))
+        offsets_size = (strings + 1) * 4
+        self._string_offsets = view[offset : offset + offsets_size].cast("I")
+        offset += offsets_size
+        self._string_blob = view[offset:]
+
+    @classmethod
+    def open(cls, path: Path) -> InstrumentTable:
+        with path.open("rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, mapping)
+
+    @classmethod
+    def from_records(cls, instruments: list[dict[str, Any]]) -> InstrumentTable:
+        return cls(encode_instruments(instruments))
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str) -> memoryview:
+        return self._columns[name]
+
+    def string(self, string_id: int) -> str:
+        start = self._string_offsets[string_id]
+        end = self._string_offsets[string_id + 1]
+        return str(self._string_blob[start:end], "utf-8")
+
+    def expiry(self, row: int) -> str | None:
+        ordinal = self._columns["expiry"][row]
+        return date.fromordinal(ordinal).isoformat() if ordinal else None
+
+    def record(self, row: int) -> dict[str, Any]:
+        return {
+            "symbol": self.string(self._columns["symbol"][row]),
+            "expiry": self.expiry(row),
+            "strike": self._columns["strike"][row],
+            "option_type": self.string(self._columns["option_type"][row]),
+            "trading_symbol": self.string(self._columns["trading_symbol"][row]),
+            "lot_size": self._columns["lot_size"][row],
+            "exchange": self.string(self._columns["exchange"][row]),
+            "tradable": bool(self._columns["tradable"][row]),
+            "security_id": self._columns["security_id"][row],
+            "segment": self.string(self._columns["segment"][row]),
+        }
+
+    def to_records(self) -> list[dict[str, Any]]:
+        return [self.record(row) for row in range(self._rows)]
+
+    def close(self) -> None:
+        if self._mapping is None:
+            return
+        for column in self._columns.values():
+            column.release()
+        self._string_offsets.release()
+        self._string_blob.release()
+        self._mapping.close()
+        self._mapping = None
+
+
+def encode_instruments(instruments: list[dict[str, Any]]) -> bytes:
+    strings: dict[str, int] = {}
+    numeric = {name: array(typecode) for name, typecode in _NUMERIC_COLUMNS}
+    text = {name: array("I") for name in _STRING_COLUMNS}
+    for instrument in instruments:
+        numeric["strike"].append(float(instrument.get("strike") or 0))
+        numeric["security_id"].append(int(instrument.get("security_id") or 0))
+        numeric["expiry"].append(_expiry_ordinal(instrument.get("expiry")))
+        numeric["lot_size"].append(int(instrument.get("lot_size") or 0))
+        numeric["tradable"].append(1 if instrument.get("tradable", True) else 0)
+        exchange = str(instrument.get("exchange") or "NFO")
+        for name in _STRING_COLUMNS:
+            if name == "exchange":
+                value = exchange
+            elif name == "segment":
+                value = str(instrument.get("segment") or EXCHANGE_SEGMENTS.get(exchange, ""))
+            else:
+                value = str(instrument.get(name) or "")
+            text[name].append(strings.setdefault(value, len(strings)))
+    header = _HEADER.pack(_MAGIC, _VERSION, len(instruments), len(strings))
+    parts = [header, _padding(len(header))]
+    for column in (*numeric.values(), *text.values()):
+        payload = column.tobytes()
+        parts.extend((payload, _padding(len(payload))))
+    blob = bytearray()
+    offsets = array("I", [0])
+    for value in strings:
+        blob.extend(value.encode("utf-8"))
+        offsets.append(len(blob))
+    parts.extend((offsets.tobytes(), bytes(blob)))
+    return b"".join(parts)
+
+
+def content_hash(encoded: bytes) -> str:
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass(frozen=True)
+class InstrumentCacheMetadata:
+    trading_date: str
+    content_hash: str
+    count: int
+
+
+@dataclass(frozen=True)
+class InstrumentDelta:
+    added: list[dict[str, Any]]
+    removed: list[dict[str, Any]]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def diff_instruments(old: InstrumentTable, new: InstrumentTable) -> InstrumentDelta:
+    previous = {record["trading_symbol"]: record for record in old.to_records()}
+    current = {record["trading_symbol"]: record for record in new.to_records()}
+    added = [record for key, record in current.items() if previous.get(key) != record]
+    removed = [record for key, record in previous.items() if current.get(key) != record]
+    return InstrumentDelta(added=added, removed=removed)
+
+
 class InstrumentCache:
-    def __init__(self, cache_path: Path) -> None:
+    """The binary instrument master plus its metadata.
+
+    With a ``store`` the metadata lives in the state store, under the cache
+    file's name; otherwise it sits next to the cache in a ``.meta.json`` file.
+    """
+
+    def __init__(self, cache_path: Path, store: StateStore | None = None) -> None:
         self._cache_path = cache_path
+        self._metadata_path = cache_path.with_suffix(".meta.json")
+        self._store = store
         self._logger = setup_logger(self.__class__.__name__)
 
-    def load(self) -> list[dict[str, Any]]:
+    def load(self) -> InstrumentTable:
         if not self._cache_path.exists():
-            return []
-        with self._cache_path.open("r", encoding="utf-8") as file:
-            return json.load(file)
+            legacy_path = self._cache_path.with_suffix(".json")
+            if legacy_path.exists():
+                return self.import_json(legacy_path)
+            return InstrumentTable.from_records([])
+        if not self._current_format():
+            self._logger.warning("Instrument cache format is outdated; waiting for a refresh")
+            return InstrumentTable.from_records([])
+        return InstrumentTable.open(self._cache_path)
+
+    def _current_format(self) -> bool:
+        return _file_version(self._cache_path) == _VERSION
+
+    def metadata(self) -> InstrumentCacheMetadata | None:
+        """Metadata of the cached master; ``None`` when there is no usable cache."""
+        if not self._cache_path.exists() or not self._current_format():
+            return None
+        if self._store is not None:
+            payload = self._store.get("instruments", self._cache_path.name)
+        elif self._metadata_path.exists():
+            with self._metadata_path.open("r", encoding="utf-8") as file:
+                payload = json.load(file)
+        else:
+            payload = None
+        if payload is None:
+            return None
+        return InstrumentCacheMetadata(
+            trading_date=str(payload.get("trading_date", "")),
+            content_hash=str(payload.get("content_hash", "")),
+            count=int(payload.get("count", 0)),
+        )
 
-    def save(self, instruments: list[dict[str, Any]]) -> None:
+    def is_stale(self, trading_date: date) -> bool:
+        metadata = self.metadata()
+        return metadata is None or metadata.trading_date != trading_date.isoformat()
+
+    def save(self, instruments: list[dict[str, Any]], trading_date: date | None = None) -> InstrumentCacheMetadata:
+        return self.write(encode_instruments(instruments), trading_date)
+
+    def write(self, encoded: bytes, trading_date: date | None = None) -> InstrumentCacheMetadata:
         self._cache_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._cache_path.open("w", encoding="utf-8") as file:
-            json.dump(instruments, file)
-        self._logger.info("Instrument master cached", extra={"count": len(instruments)})
+        temp_path = self._cache_path.with_suffix(".tmp")
+        with temp_path.open("wb") as file:
+            file.write(encoded)
+        os.replace(temp_path, self._cache_path)
+        metadata = InstrumentCacheMetadata(
+            trading_date=(trading_date or date.today()).isoformat(),
+            content_hash=content_hash(encoded),
+            count=_HEADER.unpack_from(encoded, 0)[2],
+        )
+        self.stamp(metadata)
+        self._logger.info("Instrument master cached", extra={"count": metadata.count})
+        return metadata
+
+    def stamp(self, metadata: InstrumentCacheMetadata) -> None:
+        payload = {
+            "trading_date": metadata.trading_date,
+            "content_hash": metadata.content_hash,
+            "count": metadata.count,
+        }
+        if self._store is not None:
+            self._store.put("instruments", self._cache_path.name, payload)
+            self._store.flush()
+            return
+        temp_path = self._metadata_path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as file:
+            json.dump(payload, file)
+        os.replace(temp_path, self._metadata_path)
+
+    def import_json(self, path: Path) -> InstrumentTable:
+        with path.open("r", encoding="utf-8") as file:
+            instruments = json.load(file)
+        self.save(instruments)
+        return InstrumentTable.open(self._cache_path)
+
+    def export_json(self, path: Path) -> None:
+        table = self.load()
+        try:
+            records = table.to_records()
+        finally:
+            table.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(records, file)
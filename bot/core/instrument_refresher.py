@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import replace
+from datetime import date, datetime, time as clock, timedelta
+from typing import Protocol
+
+from bot.core.dhan_client import DhanClient
+from bot.core.instrument_cache import (
+    InstrumentCache,
+    InstrumentDelta,
+    InstrumentTable,
+    content_hash,
+    diff_instruments,
+    encode_instruments,
+)
+from bot.utils.logger import setup_logger
+from bot.utils.time_utils import ist_now
+
+
+class InstrumentIndex(Protocol):
+    def apply_delta(self, delta: InstrumentDelta) -> None: ...
+
+
+class InstrumentRefresher:
+    def __init__(
+        self,
+        client: DhanClient,
+        cache: InstrumentCache,
+        index: InstrumentIndex,
+        refresh_time: clock,
+        poll_seconds: float = 30.0,
+        security_ids: InstrumentIndex | None = None,
+    ) -> None:
+        self._client = client
+        self._cache = cache
+        self._index = index
+        self._security_ids = security_ids
+        self._refresh_time = refresh_time
+        self._poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def expected_trading_date(self, now: datetime | None = None) -> date:
+        now = now or ist_now()
+        if now.time() >= self._refresh_time:
+            return now.date()
+        return now.date() - timedelta(days=1)
+
+    def refresh_if_stale(self, now: datetime | None = None) -> bool:
+        trading_date = self.expected_trading_date(now)
+        if not self._cache.is_stale(trading_date):
+            return False
+        self.refresh(trading_date)
+        return True
+
+    def refresh(self, trading_date: date) -> InstrumentDelta:
+        with self._lock:
+            encoded = encode_instruments(self._client.get_instruments())
+            metadata = self._cache.metadata()
+            if metadata is not None and metadata.content_hash == content_hash(encoded):
+                self._cache.stamp(replace(metadata, trading_date=trading_date.isoformat()))
+                self._logger.info("Instrument master unchanged", extra={"trading_date": trading_date.isoformat()})
+                return InstrumentDelta(added=[], removed=[])
+            previous = self._cache.load()
+            try:
+                delta = diff_instruments(previous, InstrumentTable(encoded))
+            finally:
+                previous.close()
+            self._cache.write(encoded, trading_date)
+            self._index.apply_delta(delta)
+            if self._security_ids is not None:
+                self._security_ids.apply_delta(delta)
+            self._logger.info(
+                "Instrument master refreshed",
+                extra={
+                    "trading_date": trading_date.isoformat(),
+                    "added": len(delta.added),
+                    "removed": len(delta.removed),
+                },
+            )
+            return delta
+
+    def start(self) -> threading.Thread:
+        def _loop() -> None:
+            while True:
+                try:
+                    self.refresh_if_stale()
+                except Exception as exc:  # noqa: BLE001 - logs and retries next poll
+                    self._logger.error("Instrument refresh error", extra={"error": str(exc)})
+                time.sleep(self._poll_seconds)
+
+        thread = threading.Thread(target=_loop, daemon=True)
+        thread.start()
+        return thread
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import replace
 from typing import Any
 
-from bot.core.dhan_client import DhanClient
-from bot.core.order_types import OrderRequest
+from bot.core.dhan_client import AsyncDhanClient, DhanClient
+from bot.core.idempotency import IdempotencyCache
+from bot.core.order_registry import OrderEvent, OrderRegistry
+from bot.core.order_templates import OrderTemplateCache
+from bot.core.order_types import BracketResult, OrderRequest
+from bot.core.paper_broker import PaperBroker, PaperFill
+from bot.core.rate_limiter import order_priority
 from bot.core.risk_manager import RiskManager
+from bot.core.state_store import StateStore
 from bot.core.trading_control import TradingControl
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
 
 
 class OrderManager:
@@ -16,49 +26,242 @@ class OrderManager:
         risk_manager: RiskManager,
         trading_control: TradingControl,
         execution_mode: str = "paper",
+        async_client: AsyncDhanClient | None = None,
+        metrics: LatencyRecorder | None = None,
+        idempotency_cache: IdempotencyCache | None = None,
+        paper_broker: PaperBroker | None = None,
+        state_store: StateStore | None = None,
+        order_registry: OrderRegistry | None = None,
+        order_templates: OrderTemplateCache | None = None,
     ) -> None:
         self._client = client
+        self._async_client = async_client
         self._risk_manager = risk_manager
         self._trading_control = trading_control
-        self._execution_mode = execution_mode
+        self._paper = execution_mode.lower() == "paper"
+        self._metrics = metrics or get_recorder()
+        self._idempotency_cache = idempotency_cache
+        self._paper_broker = paper_broker
+        self._state_store = state_store
+        self._order_registry = order_registry
+        self._templates = order_templates if order_templates is not None else OrderTemplateCache(metrics=self._metrics)
         self._logger = setup_logger(self.__class__.__name__)
+        if paper_broker is not None:
+            paper_broker.set_fill_handler(self._on_paper_fill)
+        if order_registry is not None:
+            order_registry.subscribe(self._on_order_event)
 
-    def place_order(self, request: OrderRequest) -> dict[str, Any] | None:
-        if request.order_tag not in {"STOP_LOSS", "TARGET", "EXIT"}:
+    def _approve(self, request: OrderRequest) -> bool:
+        return self._approve_batch([request])[0]
+
+    def _approve_batch(self, requests: list[OrderRequest]) -> list[bool]:
+        with self._metrics.stage("risk_validation"):
+            return self._check_batch(requests)
+
+    def _check_batch(self, requests: list[OrderRequest]) -> list[bool]:
+        if any(request.order_tag not in {"STOP_LOSS", "TARGET", "EXIT"} for request in requests):
             if not self._trading_control.status().enabled:
                 self._logger.warning("Trading disabled by manual control")
-                return None
-        if not self._risk_manager.validate_order(request):
-            self._logger.warning("Order rejected by risk manager", extra={"symbol": request.symbol})
+                return [request.order_tag in {"STOP_LOSS", "TARGET", "EXIT"} for request in requests]
+        decisions = self._risk_manager.reserve_batch(requests)
+        for request, accepted in zip(requests, decisions):
+            if not accepted:
+                self._logger.warning("Order rejected by risk manager", extra={"symbol": request.symbol})
+        return decisions
+
+    def _replay(self, request: OrderRequest) -> dict[str, Any] | None:
+        if self._idempotency_cache is None or request.idempotency_key is None:
             return None
-        if self._execution_mode.lower() == "paper":
-            response = {
-                "ok": True,
-                "mode": "paper",
-                "symbol": request.symbol,
-                "side": request.side,
-                "quantity": request.quantity,
-                "order_type": request.order_type,
-                "product_type": request.product_type,
-                "price": request.price,
-                "order_tag": request.order_tag,
-            }
+        response = self._idempotency_cache.get(request.idempotency_key)
+        if response is not None:
+            self._metrics.increment("duplicate_orders")
+            self._logger.info("Duplicate order replayed", extra={"idempotency_key": request.idempotency_key})
+        return response
+
+    def _remember(self, request: OrderRequest, response: dict[str, Any]) -> None:
+        if self._idempotency_cache is not None and request.idempotency_key is not None:
+            self._idempotency_cache.put(request.idempotency_key, response)
+
+    def _record(self, request: OrderRequest, response: dict[str, Any]) -> None:
+        if self._order_registry is not None:
+            self._order_registry.track(request, response)
+        # The replay entry and the trade count commit together, so a crash can
+        # never leave an order that is counted but not replayable, or vice versa.
+        with self._transaction():
+            self._remember(request, response)
             self._risk_manager.record_trade(request, response)
-            return response
-        payload = {
+
+    def _on_order_event(self, event: OrderEvent) -> None:
+        """Cancel the open protective legs of a trade that no longer needs them.
+
+        That is the sibling leg once a stop loss or target fills, and both
+        legs once the entry ends rejected or cancelled without filling.
+        """
+        request = event.order.request
+        if request.trade_id is None:
+            return
+        if event.order.is_entry:
+            if event.kind not in {"REJECTED", "CANCELLED"} or event.order.filled_quantity:
+                return
+        elif event.kind != "FILLED":
+            return
+        for sibling in self._order_registry.orders_for(request.trade_id):
+            if sibling.is_open and sibling.request.order_tag in {"STOP_LOSS", "TARGET"}:
+                self._logger.info(
+                    "Cancelling sibling leg",
+                    extra={"order_id": sibling.order_id, "trade_id": request.trade_id},
+                )
+                if self._paper_broker is not None and self._is_paper():
+                    self._paper_broker.cancel(sibling.order_id)
+                else:
+                    self._client.cancel_order(sibling.order_id)
+
+    def _transaction(self) -> AbstractContextManager[None]:
+        return self._state_store.transaction(durable=True) if self._state_store is not None else nullcontext()
+
+    def _is_paper(self) -> bool:
+        return self._paper
+
+    def _on_paper_fill(self, fill: PaperFill) -> None:
+        if fill.pnl is not None:
+            self._risk_manager.record_trade(fill.request, fill.as_response())
+
+    def _paper_response(self, request: OrderRequest) -> dict[str, Any]:
+        if self._paper_broker is not None:
+            return self._paper_broker.submit(request)
+        return {
+            "ok": True,
+            "mode": "paper",
             "symbol": request.symbol,
-            "exchange": request.exchange,
             "side": request.side,
             "quantity": request.quantity,
             "order_type": request.order_type,
             "product_type": request.product_type,
             "price": request.price,
+            "order_tag": request.order_tag,
         }
-        response = self._client.place_order(payload)
-        self._risk_manager.record_trade(request, response)
+
+    def _payload(self, request: OrderRequest) -> bytes:
+        return self._templates.payload(request)
+
+    def place_order(self, request: OrderRequest) -> dict[str, Any] | None:
+        replayed = self._replay(request)
+        if replayed is not None:
+            return replayed
+        if not self._approve(request):
+            return None
+        try:
+            if self._is_paper():
+                response = self._paper_response(request)
+            else:
+                response = self._client.place_order(self._payload(request), priority=order_priority(request.order_tag))
+        except BaseException:
+            self._risk_manager.release(request)
+            raise
+        self._record(request, response)
+        return response
+
+    async def place_order_async(self, request: OrderRequest) -> dict[str, Any] | None:
+        replayed = self._replay(request)
+        if replayed is not None:
+            return replayed
+        if not self._approve(request):
+            return None
+        return await self._submit_async(request)
+
+    async def place_entries_async(self, requests: list[OrderRequest]) -> list[dict[str, Any] | BaseException | None]:
+        replayed = [self._replay(request) for request in requests]
+        fresh = [request for request, response in zip(requests, replayed) if response is None]
+        decisions = self._approve_batch(fresh) if fresh else []
+        submissions = [self._submit_async(request) for request, accepted in zip(fresh, decisions) if accepted]
+        placed = iter(await asyncio.gather(*submissions, return_exceptions=True))
+        placed_fresh = iter([next(placed) if accepted else None for accepted in decisions])
+        return [response if response is not None else next(placed_fresh) for response in replayed]
+
+    async def _submit_async(self, request: OrderRequest) -> dict[str, Any]:
+        try:
+            if self._is_paper():
+                response = self._paper_response(request)
+            elif self._async_client is not None:
+                response = await self._async_client.place_order(
+                    self._payload(request),
+                    priority=order_priority(request.order_tag),
+                )
+            else:
+                response = await asyncio.to_thread(
+                    self._client.place_order,
+                    self._payload(request),
+                    priority=order_priority(request.order_tag),
+                )
+        except BaseException:
+            # The entry never reached the book; hand its risk slot back.
+            self._risk_manager.release(request)
+            raise
+        self._record(request, response)
         return response
 
     def place_stop_loss(self, request: OrderRequest) -> dict[str, Any] | None:
         if request.order_tag != "STOP_LOSS":
             raise ValueError("Stop loss order must include order_tag=STOP_LOSS")
         return self.place_order(request)
+
+    async def place_stop_loss_async(self, request: OrderRequest) -> dict[str, Any] | None:
+        if request.order_tag != "STOP_LOSS":
+            raise ValueError("Stop loss order must include order_tag=STOP_LOSS")
+        return await self.place_order_async(request)
+
+    async def cancel_order_async(self, response: dict[str, Any]) -> dict[str, Any] | None:
+        if response.get("mode") == "paper":
+            if self._paper_broker is not None and response.get("orderId") is not None:
+                self._paper_broker.cancel(str(response["orderId"]))
+            return {"ok": True, "mode": "paper", "cancelled": response.get("order_tag")}
+        order_id = response.get("orderId")
+        if order_id is None:
+            self._logger.error("Cannot cancel order without orderId", extra={"order": response})
+            return None
+        if self._async_client is not None:
+            return await self._async_client.cancel_order(str(order_id))
+        return await asyncio.to_thread(self._client.cancel_order, str(order_id))
+
+    async def place_bracket_async(
+        self,
+        stop_loss: OrderRequest,
+        target: OrderRequest | None = None,
+    ) -> BracketResult:
+        legs = [self.place_stop_loss_async(stop_loss)]
+        if target is not None:
+            legs.append(self.place_order_async(target))
+        results = await asyncio.gather(*legs, return_exceptions=True)
+        responses = [self._leg_response(leg, result) for leg, result in zip((stop_loss, target), results)]
+        sl_response = responses[0]
+        target_response = responses[1] if target is not None else None
+        if sl_response is not None:
+            if target is not None and target_response is None:
+                self._logger.error(
+                    "Target leg failed; position protected by stop loss only",
+                    extra={"symbol": stop_loss.symbol},
+                )
+            return BracketResult(stop_loss=sl_response, target=target_response)
+        self._logger.critical("Stop loss leg failed; flattening position", extra={"symbol": stop_loss.symbol})
+        if target_response is not None:
+            try:
+                await self.cancel_order_async(target_response)
+            except Exception as exc:  # noqa: BLE001 - exit must still be attempted
+                self._logger.error("Target cancel failed", extra={"error": str(exc)})
+        exit_key = f"{stop_loss.idempotency_key}:exit" if stop_loss.idempotency_key else None
+        exit_request = replace(stop_loss, order_type="MARKET", price=None, order_tag="EXIT", idempotency_key=exit_key)
+        try:
+            exit_response = await self.place_order_async(exit_request)
+        except Exception as exc:  # noqa: BLE001 - surfaced as an unprotected bracket
+            self._logger.critical("Exit after failed stop loss failed", extra={"error": str(exc)})
+            exit_response = None
+        return BracketResult(stop_loss=None, target=None, exit=exit_response)
+
+    def _leg_response(self, request: OrderRequest | None, result: Any) -> dict[str, Any] | None:
+        if isinstance(result, BaseException):
+            self._logger.error(
+                "Bracket leg failed",
+                extra={"order_tag": request.order_tag if request else None, "error": str(result)},
+            )
+            return None
+        return result
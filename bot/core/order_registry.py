@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from bot.core.order_types import OrderRequest
+from bot.utils.logger import setup_logger
+
+
+TERMINAL_STATUSES = frozenset({"TRADED", "CANCELLED", "REJECTED", "EXPIRED"})
+_EVENT_KINDS = {
+    "TRADED": "FILLED",
+    "PART_TRADED": "PARTIALLY_FILLED",
+    "CANCELLED": "CANCELLED",
+    "EXPIRED": "CANCELLED",
+    "REJECTED": "REJECTED",
+}
+_PROTECTIVE_TAGS = frozenset({"STOP_LOSS", "TARGET", "EXIT"})
+
+
+@dataclass(frozen=True)
+class TrackedOrder:
+    order_id: str
+    request: OrderRequest
+    status: str
+    filled_quantity: int = 0
+    average_price: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.status not in TERMINAL_STATUSES
+
+    @property
+    def is_entry(self) -> bool:
+        return self.request.order_tag not in _PROTECTIVE_TAGS
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    kind: str
+    order: TrackedOrder
+    previous: TrackedOrder
+
+
+class OrderRegistry:
+    """Open orders, indexed by broker order id and by parent trade.
+
+    ``poll_once`` reconciles every open order from a single order-book call
+    and emits FILLED / PARTIALLY_FILLED / CANCELLED / REJECTED events to
+    subscribers. An order is dropped once it reaches a terminal status, so
+    the registry never grows past what is open. Open entry orders are
+    counted per symbol so the risk layer can see pending exposure without
+    asking the broker.
+    """
+
+    def __init__(self, order_book: Callable[[], list[dict[str, Any]]]) -> None:
+        self._order_book = order_book
+        self._orders: dict[str, TrackedOrder] = {}
+        self._by_trade: dict[str, list[str]] = {}
+        self._pending_entries: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[OrderEvent], None]] = []
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def subscribe(self, listener: Callable[[OrderEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def track(self, request: OrderRequest, response: dict[str, Any]) -> TrackedOrder | None:
+        order_id = response.get("orderId") if isinstance(response, dict) else None
+        if order_id is None:
+            return None
+        order = TrackedOrder(order_id=str(order_id), request=request, status=str(response.get("orderStatus", "TRANSIT")))
+        if not order.is_open:
+            return order
+        with self._lock:
+            if order.order_id in self._orders:
+                return self._orders[order.order_id]
+            self._orders[order.order_id] = order
+            if request.trade_id is not None:
+                self._by_trade.setdefault(request.trade_id, []).append(order.order_id)
+            if order.is_entry:
+                self._pending_entries[request.symbol] += 1
+        return order
+
+    def get(self, order_id: str) -> TrackedOrder | None:
+        return self._orders.get(order_id)
+
+    def orders_for(self, trade_id: str) -> list[TrackedOrder]:
+        with self._lock:
+            return [self._orders[order_id] for order_id in self._by_trade.get(trade_id, ())]
+
+    def open_orders(self) -> list[TrackedOrder]:
+        with self._lock:
+            return list(self._orders.values())
+
+    def has_pending_entry(self, symbol: str) -> bool:
+        return self._pending_entries.get(symbol, 0) > 0
+
+    def pending_exposure(self) -> dict[str, float]:
+        """Unfilled notional of open entry orders per symbol, at their reference price."""
+        exposure: Counter[str] = Counter()
+        with self._lock:
+            for order in self._orders.values():
+                if order.is_entry:
+                    price = order.request.reference_price or order.request.price or 0.0
+                    exposure[order.request.symbol] += (order.request.quantity - order.filled_quantity) * price
+        return dict(exposure)
+
+    def apply(self, book: list[dict[str, Any]]) -> list[OrderEvent]:
+        events = []
+        with self._lock:
+            for row in book:
+                order_id = str(row.get("orderId"))
+                previous = self._orders.get(order_id)
+                if previous is None:
+                    continue
+                average_price = row.get("averageTradedPrice")
+                current = replace(
+                    previous,
+                    status=str(row.get("orderStatus", previous.status)),
+                    filled_quantity=int(row.get("filledQty", previous.filled_quantity)),
+                    average_price=float(average_price) if average_price is not None else previous.average_price,
+                )
+                if current == previous:
+                    continue
+                if current.is_open:
+                    self._orders[order_id] = current
+                else:
+                    self._forget(current)
+                kind = _EVENT_KINDS.get(current.status)
+                if kind is not None and (current.status != previous.status or kind == "PARTIALLY_FILLED"):
+                    events.append(OrderEvent(kind, current, previous))
+        for event in events:
+            self._logger.info(
+                "Order event",
+                extra={"kind": event.kind, "order_id": event.order.order_id, "trade_id": event.order.request.trade_id},
+            )
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception as exc:  # noqa: BLE001 - one listener must not stop reconciliation
+                    self._logger.error("Order listener error", extra={"error": str(exc)})
+        return events
+
+    def _forget(self, order: TrackedOrder) -> None:
+        del self._orders[order.order_id]
+        trade_id = order.request.trade_id
+        if trade_id is not None and trade_id in self._by_trade:
+            siblings = [order_id for order_id in self._by_trade[trade_id] if order_id != order.order_id]
+            if siblings:
+                self._by_trade[trade_id] = siblings
+            else:
+                del self._by_trade[trade_id]
+        if order.is_entry:
+            self._pending_entries[order.request.symbol] -= 1
+            if self._pending_entries[order.request.symbol] <= 0:
+                del self._pending_entries[order.request.symbol]
+
+    def poll_once(self) -> list[OrderEvent]:
+        if not self._orders:
+            return []
+        return self.apply(self._order_book())
+
+    def start(self, interval_seconds: float = 1.0) -> threading.Thread:
+        def _loop() -> None:
+            while True:
+                try:
+                    self.poll_once()
+                except Exception as exc:  # noqa: BLE001 - logs and continues
+                    self._logger.error("Order reconciliation error", extra={"error": str(exc)})
+                time.sleep(interval_seconds)
+
+        thread = threading.Thread(target=_loop, daemon=True)
+        thread.start()
+        return thread
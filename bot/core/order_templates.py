@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from bot.core.order_types import OrderRequest
+from bot.core.security_ids import SecurityIdMap
+from bot.utils.metrics import LatencyRecorder, get_recorder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to the stdlib encoder
+    orjson = None
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+class Contract(Protocol):
+    symbol: str
+    exchange: str
+    security_id: int
+    segment: str
+
+
+@dataclass(frozen=True)
+class OrderTemplate:
+    """The per-contract part of an order payload, encoded once.
+
+    ``render`` appends only the per-signal fields, so placing an order
+    encodes four values instead of the whole payload.
+    """
+
+    symbol: str
+    exchange: str
+    product_type: str
+    prefix: bytes
+    security_id: int = 0
+
+    @classmethod
+    def for_contract(
+        cls,
+        symbol: str,
+        exchange: str,
+        product_type: str,
+        security_id: int = 0,
+        segment: str = "",
+    ) -> OrderTemplate:
+        fields: dict[str, Any] = {"symbol": symbol, "exchange": exchange, "product_type": product_type}
+        if security_id:
+            fields.update(securityId=str(security_id), exchangeSegment=segment)
+        fixed = dumps(fields)
+        return cls(
+            symbol=symbol,
+            exchange=exchange,
+            product_type=product_type,
+            prefix=fixed[:-1] + b",",
+            security_id=security_id,
+        )
+
+    def render(self, side: str, quantity: int, order_type: str, price: float | None) -> bytes:
+        return self.prefix + dumps({"side": side, "quantity": quantity, "order_type": order_type, "price": price})[1:]
+
+
+class OrderTemplateCache:
+    """Order templates keyed by (symbol, exchange, product type).
+
+    Warmed from each strike ladder as it is built, so the first order for a
+    contract already finds its template. Misses build the template on the
+    spot, resolving the security id from ``security_ids``, and count as
+    ``order_template_miss``; a template whose id is not known yet is not
+    kept, so it resolves once a refresh adds the contract. A warmed contract
+    whose security id changed replaces its template. Publishing is a single dict assignment, so
+    readers need no lock.
+    """
+
+    def __init__(
+        self,
+        product_type: str = "INTRADAY",
+        metrics: LatencyRecorder | None = None,
+        security_ids: SecurityIdMap | None = None,
+    ) -> None:
+        self._product_type = product_type
+        self._metrics = metrics or get_recorder()
+        self._security_ids = security_ids
+        self._templates: dict[tuple[str, str, str], OrderTemplate] = {}
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def warm(self, contracts: Iterable[Contract]) -> None:
+        for contract in contracts:
+            key = (contract.symbol, contract.exchange, self._product_type)
+            existing = self._templates.get(key)
+            if existing is None or existing.security_id != contract.security_id:
+                self._templates[key] = OrderTemplate.for_contract(*key, contract.security_id, contract.segment)
+
+    def payload(self, request: OrderRequest) -> bytes:
+        key = (request.symbol, request.exchange, request.product_type)
+        template = self._templates.get(key)
+        if template is None:
+            self._metrics.increment("order_template_miss")
+            if self._security_ids is None:
+                template = self._templates[key] = OrderTemplate.for_contract(*key)
+            else:
+                ref = self._security_ids.resolve(request.symbol)
+                if ref is None:
+                    # Not cached: a later master refresh may still add the contract's id.
+                    template = OrderTemplate.for_contract(*key)
+                else:
+                    template = self._templates[key] = OrderTemplate.for_contract(*key, ref.security_id, ref.segment)
+        return template.render(request.side, request.quantity, request.order_type, request.price)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass(frozen=True)
@@ -14,3 +15,16 @@ class OrderRequest:
     price: float | None = None
     reference_price: float | None = None
     order_tag: str | None = None
+    idempotency_key: str | None = None
+    trade_id: str | None = None
+
+
+@dataclass(frozen=True)
+class BracketResult:
+    stop_loss: dict[str, Any] | None
+    target: dict[str, Any] | None
+    exit: dict[str, Any] | None = None
+
+    @property
+    def protected(self) -> bool:
+        return self.stop_loss is not None
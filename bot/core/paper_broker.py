@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from bot.core.order_types import OrderRequest
+from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+
+
+PROTECTIVE_TAGS = frozenset({"STOP_LOSS", "TARGET", "EXIT"})
+_STOP_TYPES = frozenset({"SL-M", "SL"})
+
+
+@dataclass(frozen=True)
+class PaperExecutionSettings:
+    """Simulated broker behaviour: orders rest for ``latency_ms`` before they can
+    fill, and market and stop fills pay ``slippage_points`` against the tick."""
+
+    latency_ms: float = 0.0
+    slippage_points: float = 0.0
+
+
+@dataclass(frozen=True)
+class PaperFill:
+    order_id: str
+    request: OrderRequest
+    price: float
+    pnl: float | None
+
+    def as_response(self) -> dict[str, Any]:
+        response = {
+            "ok": True,
+            "mode": "paper",
+            "orderId": self.order_id,
+            "orderStatus": "TRADED",
+            "symbol": self.request.symbol,
+            "side": self.request.side,
+            "quantity": self.request.quantity,
+            "price": self.price,
+            "order_tag": self.request.order_tag,
+        }
+        if self.pnl is not None:
+            response["pnl"] = self.pnl
+        return response
+
+
+@dataclass(eq=False)
+class _PaperOrder:
+    order_id: str
+    request: OrderRequest
+    active_at: float
+    status: str = "PENDING"
+    fill_price: float | None = None
+
+
+@dataclass
+class _SymbolBook:
+    """Open orders for one symbol; each heap's top is the next order to trigger.
+
+    Cancelled orders stay in their heap and are skipped when they surface, so
+    cancel is O(1) and a tick costs O(log n) per fill plus O(1) otherwise.
+    """
+
+    pending: deque[_PaperOrder] = field(default_factory=deque)
+    buy_stops: list[tuple[float, int, _PaperOrder]] = field(default_factory=list)
+    sell_stops: list[tuple[float, int, _PaperOrder]] = field(default_factory=list)
+    buy_limits: list[tuple[float, int, _PaperOrder]] = field(default_factory=list)
+    sell_limits: list[tuple[float, int, _PaperOrder]] = field(default_factory=list)
+    protective: dict[str, _PaperOrder] = field(default_factory=dict)
+    quantity: int = 0
+    average_price: float = 0.0
+
+
+class PaperBroker:
+    """Fills paper orders against a price stream.
+
+    MARKET orders fill on the first tick after the latency window. SL-M legs
+    trigger when the price crosses them and LIMIT legs fill at their price or
+    better. Protective legs (STOP_LOSS, TARGET, EXIT) only ever reduce a
+    position; once it is flat the remaining legs on that symbol are cancelled
+    (OCO). Fills are reported to the fill handler outside the broker's lock.
+    """
+
+    def __init__(
+        self,
+        settings: PaperExecutionSettings | None = None,
+        metrics: LatencyRecorder | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        closed_retention_seconds: float = 60.0,
+    ) -> None:
+        self._settings = settings or PaperExecutionSettings()
+        self._metrics = metrics or get_recorder()
+        self._clock = clock
+        self._closed_retention = closed_retention_seconds
+        self._books: dict[str, _SymbolBook] = {}
+        self._orders: dict[str, _PaperOrder] = {}
+        self._closed: OrderedDict[str, tuple[float, _PaperOrder]] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._fill_handler: Callable[[PaperFill], None] | None = None
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def set_fill_handler(self, handler: Callable[[PaperFill], None]) -> None:
+        self._fill_handler = handler
+
+    def submit(self, request: OrderRequest) -> dict[str, Any]:
+        if request.order_type != "MARKET" and request.price is None:
+            raise ValueError(f"{request.order_type} paper order needs a price")
+        with self._lock:
+            order = _PaperOrder(
+                order_id=f"PAPER-{next(self._ids)}",
+                request=request,
+                active_at=self._clock() + self._settings.latency_ms / 1000,
+            )
+            book = self._books.setdefault(request.symbol, _SymbolBook())
+            book.pending.append(order)
+            if request.order_tag in PROTECTIVE_TAGS:
+                book.protective[order.order_id] = order
+            self._orders[order.order_id] = order
+        return {
+            "ok": True,
+            "mode": "paper",
+            "orderId": order.order_id,
+            "orderStatus": order.status,
+            "symbol": request.symbol,
+            "side": request.side,
+            "quantity": request.quantity,
+            "order_type": request.order_type,
+            "product_type": request.product_type,
+            "price": request.price,
+            "order_tag": request.order_tag,
+        }
+
+    def cancel(self, order_id: str) -> bool:
+        with self._lock:
+            order = self._orders.get(order_id)
+            if order is None:
+                return False
+            self._close(order, "CANCELLED")
+            return True
+
+    def open_orders(self) -> int:
+        return len(self._orders)
+
+    def order_book(self) -> list[dict[str, Any]]:
+        """Open paper orders plus those closed within the retention window,
+        shaped like the broker's order book."""
+        with self._lock:
+            expired = self._clock() - self._closed_retention
+            while self._closed and next(iter(self._closed.values()))[0] < expired:
+                self._closed.popitem(last=False)
+            orders = [*self._orders.values(), *(order for _, order in self._closed.values())]
+        return [
+            {
+                "orderId": order.order_id,
+                "orderStatus": order.status,
+                "tradingSymbol": order.request.symbol,
+                "transactionType": order.request.side,
+                "quantity": order.request.quantity,
+                "filledQty": order.request.quantity if order.status == "TRADED" else 0,
+                "averageTradedPrice": order.fill_price,
+            }
+            for order in orders
+        ]
+
+    def active_symbols(self) -> set[str]:
+        """Symbols with an open order or position; these need a price stream to fill."""
+        with self._lock:
+            symbols = {order.request.symbol for order in self._orders.values()}
+            symbols.update(symbol for symbol, book in self._books.items() if book.quantity != 0)
+        return symbols
+
+    def position(self, symbol: str) -> tuple[int, float]:
+        book = self._books.get(symbol)
+        if book is None:
+            return 0, 0.0
+        return book.quantity, book.average_price
+
+    def on_tick(self, symbol: str, price: float) -> list[PaperFill]:
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+        with self._lock:
+            fills = self._match(book, price, self._clock())
+        if fills:
+            self._metrics.increment("paper_fills", len(fills))
+            for fill in fills:
+                self._logger.info(
+                    "Paper order filled",
+                    extra={"order_id": fill.order_id, "symbol": symbol, "price": fill.price, "pnl": fill.pnl},
+                )
+                if self._fill_handler is not None:
+                    try:
+                        self._fill_handler(fill)
+                    except Exception as exc:  # noqa: BLE001 - the price stream must keep flowing
+                        self._logger.error("Paper fill handler error", extra={"error": str(exc)})
+        return fills
+
+    def _match(self, book: _SymbolBook, price: float, now: float) -> list[PaperFill]:
+        fills: list[PaperFill] = []
+        while book.pending and book.pending[0].active_at <= now:
+            order = book.pending.popleft()
+            if order.status != "PENDING":
+                continue
+            request = order.request
+            if request.order_type == "MARKET":
+                self._fill(book, order, self._slipped(request.side, price), fills)
+            elif request.order_type in _STOP_TYPES:
+                heap, key = (book.buy_stops, request.price) if request.side == "BUY" else (book.sell_stops, -request.price)
+                heapq.heappush(heap, (key, next(self._sequence), order))
+            else:
+                heap, key = (book.buy_limits, -request.price) if request.side == "BUY" else (book.sell_limits, request.price)
+                heapq.heappush(heap, (key, next(self._sequence), order))
+        for heap, triggered, stop in (
+            (book.buy_stops, lambda key: price >= key, True),
+            (book.sell_stops, lambda key: price <= -key, True),
+            (book.buy_limits, lambda key: price <= -key, False),
+            (book.sell_limits, lambda key: price >= key, False),
+        ):
+            while heap and (heap[0][2].status != "PENDING" or triggered(heap[0][0])):
+                _, _, order = heapq.heappop(heap)
+                if order.status != "PENDING":
+                    continue
+                request = order.request
+                if stop:
+                    fill_price = self._slipped(request.side, price)
+                elif request.side == "BUY":
+                    fill_price = min(price, request.price)
+                else:
+                    fill_price = max(price, request.price)
+                self._fill(book, order, fill_price, fills)
+        return fills
+
+    def _slipped(self, side: str, price: float) -> float:
+        slippage = self._settings.slippage_points
+        return price + slippage if side == "BUY" else max(price - slippage, 0.0)
+
+    def _fill(self, book: _SymbolBook, order: _PaperOrder, price: float, fills: list[PaperFill]) -> None:
+        request = order.request
+        signed = request.quantity if request.side == "BUY" else -request.quantity
+        protective = request.order_tag in PROTECTIVE_TAGS
+        if protective and (book.quantity == 0 or (book.quantity > 0) == (signed > 0)):
+            self._close(order, "CANCELLED")
+            return
+        pnl = None
+        if book.quantity != 0 and (book.quantity > 0) != (signed > 0):
+            closed = min(abs(signed), abs(book.quantity))
+            direction = 1 if book.quantity > 0 else -1
+            pnl = (price - book.average_price) * closed * direction
+            if protective:
+                signed = -direction * closed
+            remainder = book.quantity + signed
+            if remainder == 0 or (remainder > 0) == (book.quantity > 0):
+                book.quantity = remainder
+            else:
+                book.quantity, book.average_price = remainder, price
+        else:
+            total = book.quantity + signed
+            book.average_price = (book.average_price * abs(book.quantity) + price * abs(signed)) / abs(total)
+            book.quantity = total
+        if book.quantity == 0:
+            book.average_price = 0.0
+        order.fill_price = price
+        self._close(order, "TRADED")
+        fills.append(PaperFill(order_id=order.order_id, request=request, price=price, pnl=pnl))
+        if book.quantity == 0 and book.protective:
+            for leg in list(book.protective.values()):
+                self._close(leg, "CANCELLED")
+
+    def _close(self, order: _PaperOrder, status: str) -> None:
+        order.status = status
+        if self._orders.pop(order.order_id, None) is not None:
+            self._closed[order.order_id] = (self._clock(), order)
+        book = self._books.get(order.request.symbol)
+        if book is not None:
+            book.protective.pop(order.order_id, None)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
+import threading
 from dataclasses import dataclass
-from pathlib import Path
 from typing import Any
 
+from bot.core.security_ids import SecurityIdMap
+from bot.core.state_store import StateStore
 from bot.utils.logger import setup_logger
 
 
@@ -17,45 +18,77 @@ class Position:
     status: str
 
 
+@dataclass(frozen=True)
+class _PositionBook:
+    positions: tuple[Position, ...]
+    by_symbol: dict[str, Position]
+    open_symbols: frozenset[str]
+
+
+def _build_book(positions: list[Position]) -> _PositionBook:
+    return _PositionBook(
+        positions=tuple(positions),
+        by_symbol={position.symbol: position for position in positions},
+        open_symbols=frozenset(position.symbol for position in positions if position.status != "EXITED"),
+    )
+
+
 class PositionManager:
-    def __init__(self, state_path: Path) -> None:
-        self._state_path = state_path
+    def __init__(self, store: StateStore, security_ids: SecurityIdMap | None = None) -> None:
         self._logger = setup_logger(self.__class__.__name__)
+        self._store = store
+        self._security_ids = security_ids
+        self._write_lock = threading.Lock()
+        self._book = _build_book(self._restore())
 
-    def load(self) -> list[Position]:
-        if not self._state_path.exists():
+    def _restore(self) -> list[Position]:
+        data = self._store.get("positions", "book")
+        if data is None:
             return []
-        with self._state_path.open("r", encoding="utf-8") as file:
-            data = json.load(file)
-        return [Position(**item) for item in data]
+        items = data["positions"] if isinstance(data, dict) else data
+        return [Position(**item) for item in items]
+
+    def load(self) -> list[Position]:
+        return list(self._book.positions)
 
-    def save(self, positions: list[Position]) -> None:
-        self._state_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._state_path.open("w", encoding="utf-8") as file:
-            json.dump([position.__dict__ for position in positions], file)
+    def get(self, symbol: str) -> Position | None:
+        return self._book.by_symbol.get(symbol)
 
     def has_open_position(self, symbol: str) -> bool:
-        positions = self.load()
-        for position in positions:
-            if position.symbol == symbol and position.status != "EXITED":
-                return True
-        return False
-
-    def update_positions(self, positions: list[Position]) -> None:
-        self.save(positions)
+        return symbol in self._book.open_symbols
+
+    def update_positions(self, positions: list[Position]) -> bool:
+        with self._write_lock:
+            if list(self._book.positions) == positions:
+                return False
+            self._book = _build_book(positions)
+            self._store.put("positions", "book", {"positions": [position.__dict__ for position in positions]})
         self._logger.info("Positions updated", extra={"count": len(positions)})
+        return True
 
-    def record_from_broker(self, payload: list[dict[str, Any]]) -> list[Position]:
+    def _symbol(self, item: dict[str, Any]) -> str:
+        symbol = item.get("symbol") or item.get("tradingSymbol")
+        if symbol:
+            return symbol
+        if self._security_ids is not None and item.get("securityId") is not None:
+            return self._security_ids.symbol(item["securityId"], item.get("exchangeSegment")) or ""
+        return ""
+
+    def parse_broker(self, payload: list[dict[str, Any]]) -> list[Position]:
         positions = []
         for item in payload:
             positions.append(
                 Position(
-                    symbol=item.get("symbol", ""),
+                    symbol=self._symbol(item),
                     quantity=int(item.get("quantity", 0)),
                     side=item.get("side", ""),
                     entry_price=float(item.get("entry_price", 0.0)),
                     status=item.get("status", ""),
                 )
             )
+        return positions
+
+    def record_from_broker(self, payload: list[dict[str, Any]]) -> list[Position]:
+        positions = self.parse_broker(payload)
         self.update_positions(positions)
         return positions
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, time as clock
+
+from bot.core.dhan_client import DhanClient
+from bot.core.position_manager import Position, PositionManager
+from bot.utils.logger import setup_logger
+from bot.utils.time_utils import ist_now
+
+
+@dataclass(frozen=True)
+class PositionEvent:
+    kind: str
+    symbol: str
+    previous: Position | None
+    current: Position | None
+
+
+@dataclass(frozen=True)
+class PollingPolicy:
+    active_seconds: float = 1.0
+    flat_seconds: float = 5.0
+    closed_seconds: float = 60.0
+    market_open: clock = clock(9, 15)
+    market_close: clock = clock(15, 30)
+
+    def market_is_open(self, now: datetime) -> bool:
+        return now.weekday() < 5 and self.market_open <= now.time() <= self.market_close
+
+
+def _is_open(position: Position | None) -> bool:
+    return position is not None and position.status != "EXITED" and position.quantity != 0
+
+
+def diff_positions(previous: dict[str, Position], current: dict[str, Position]) -> list[PositionEvent]:
+    events = []
+    for symbol in previous.keys() | current.keys():
+        before = previous.get(symbol)
+        after = current.get(symbol)
+        if _is_open(after) and not _is_open(before):
+            events.append(PositionEvent("OPENED", symbol, before, after))
+        elif _is_open(before) and not _is_open(after):
+            events.append(PositionEvent("CLOSED", symbol, before, after))
+        elif _is_open(before) and before.quantity != after.quantity:
+            events.append(PositionEvent("QUANTITY_CHANGED", symbol, before, after))
+    return sorted(events, key=lambda event: event.symbol)
+
+
+class PositionMonitor:
+    def __init__(
+        self,
+        client: DhanClient,
+        position_manager: PositionManager,
+        policy: PollingPolicy | None = None,
+        clock_source: Callable[[], datetime] = ist_now,
+    ) -> None:
+        self._client = client
+        self._position_manager = position_manager
+        self._policy = policy or PollingPolicy()
+        self._clock = clock_source
+        self._listeners: list[Callable[[PositionEvent], None]] = []
+        self._snapshot = {position.symbol: position for position in position_manager.load()}
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def subscribe(self, listener: Callable[[PositionEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def has_open_positions(self) -> bool:
+        return any(_is_open(position) for position in self._snapshot.values())
+
+    def poll_once(self) -> list[PositionEvent]:
+        positions = self._position_manager.parse_broker(self._client.get_positions())
+        current = {position.symbol: position for position in positions}
+        events = diff_positions(self._snapshot, current)
+        if current != self._snapshot:
+            self._position_manager.update_positions(positions)
+            self._snapshot = current
+        for event in events:
+            self._logger.info("Position event", extra={"kind": event.kind, "symbol": event.symbol})
+            for listener in self._listeners:
+                try:
+                    listener(event)
+                except Exception as exc:  # noqa: BLE001 - one listener must not stop the monitor
+                    self._logger.error("Position listener error", extra={"error": str(exc)})
+        return events
+
+    def next_interval(self) -> float:
+        if self.has_open_positions():
+            return self._policy.active_seconds
+        if not self._policy.market_is_open(self._clock()):
+            return self._policy.closed_seconds
+        return self._policy.flat_seconds
+
+    def start(self) -> threading.Thread:
+        def _loop() -> None:
+            while True:
+                try:
+                    self.poll_once()
+                except Exception as exc:  # noqa: BLE001 - logs and continues
+                    self._logger.error("Position monitor error", extra={"error": str(exc)})
+                time.sleep(self.next_interval())
+
+        thread = threading.Thread(target=_loop, daemon=True)
+        thread.start()
+        return thread
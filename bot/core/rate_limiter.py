@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from bot.utils.metrics import LatencyRecorder, get_recorder
+
+
+ORDER_PRIORITIES = {"EXIT": 0, "STOP_LOSS": 1, "TARGET": 2}
+ENTRY_PRIORITY = 3
+
+_ENDPOINT_BUCKETS = {"orders": "orders", "data": "data"}
+
+
+def order_priority(order_tag: str | None) -> int:
+    return ORDER_PRIORITIES.get(order_tag or "", ENTRY_PRIORITY)
+
+
+def bucket_for(endpoint: str) -> str:
+    return _ENDPOINT_BUCKETS.get(endpoint, "non_trading")
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    requests_per_second: dict[str, float] = field(
+        default_factory=lambda: {"orders": 25.0, "data": 1.0, "non_trading": 20.0}
+    )
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second: float, burst: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = rate_per_second
+        self._capacity = burst if burst is not None else max(rate_per_second, 1.0)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self._rate
+
+
+class _PriorityGate:
+    """Hands out a bucket's tokens in priority order to coroutines and threads.
+
+    Coroutines queue in ``_waiters`` and are released by one drain task;
+    threads queue in ``_blocked`` and take turns by priority. Whichever side
+    holds the better priority gets the next token.
+    """
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self._bucket = bucket
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._draining = False
+        self._blocked: list[tuple[int, int]] = []
+        self._condition = threading.Condition()
+
+    def _blocked_ahead_of(self, priority: int) -> bool:
+        with self._condition:
+            return bool(self._blocked) and self._blocked[0][0] < priority
+
+    def acquire_blocking(self, priority: int) -> None:
+        ticket = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._blocked, ticket)
+        try:
+            while True:
+                with self._condition:
+                    while self._blocked[0] != ticket:
+                        self._condition.wait()
+                wait = self._bucket.try_acquire()
+                if wait == 0:
+                    return
+                time.sleep(wait)
+        finally:
+            with self._condition:
+                self._blocked.remove(ticket)
+                heapq.heapify(self._blocked)
+                self._condition.notify_all()
+
+    async def acquire(self, priority: int) -> None:
+        if not self._waiters and not self._blocked_ahead_of(priority) and self._bucket.try_acquire() == 0:
+            return
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if not self._draining:
+            self._draining = True
+            loop.create_task(self._drain())
+        await future
+
+    async def _drain(self) -> None:
+        try:
+            while self._waiters:
+                if self._waiters[0][2].cancelled():
+                    heapq.heappop(self._waiters)
+                    continue
+                if self._blocked_ahead_of(self._waiters[0][0]):
+                    await asyncio.sleep(0.001)
+                    continue
+                wait = self._bucket.try_acquire()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                    continue
+                _, _, future = heapq.heappop(self._waiters)
+                if future.cancelled():
+                    continue
+                future.set_result(None)
+        finally:
+            self._draining = False
+
+
+class RequestScheduler:
+    """Token buckets in front of the Dhan clients, one per API limit group.
+
+    Callers queue by priority, so protective orders (EXIT, STOP_LOSS,
+    TARGET) leave before new entries once a bucket runs dry. Sync callers
+    block until their turn; async callers await it.
+    """
+
+    def __init__(self, settings: RateLimitSettings | None = None, metrics: LatencyRecorder | None = None) -> None:
+        settings = settings or RateLimitSettings()
+        self._buckets = {name: TokenBucket(rate) for name, rate in settings.requests_per_second.items()}
+        self._gates = {name: _PriorityGate(bucket) for name, bucket in self._buckets.items()}
+        self._metrics = metrics or get_recorder()
+
+    async def acquire(self, endpoint: str, priority: int = ENTRY_PRIORITY) -> None:
+        gate = self._gates.get(bucket_for(endpoint))
+        if gate is None:
+            return
+        started = time.perf_counter_ns()
+        await gate.acquire(priority)
+        self._record_wait(endpoint, started)
+
+    def acquire_blocking(self, endpoint: str, priority: int = ENTRY_PRIORITY) -> None:
+        gate = self._gates.get(bucket_for(endpoint))
+        if gate is None:
+            return
+        started = time.perf_counter_ns()
+        gate.acquire_blocking(priority)
+        self._record_wait(endpoint, started)
+
+    def _record_wait(self, endpoint: str, started: int) -> None:
+        waited = time.perf_counter_ns() - started
+        if waited > 1_000_000:
+            self._metrics.record(f"rate_limit.{bucket_for(endpoint)}", waited)
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
+import threading
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date
-from pathlib import Path
 from typing import Any
 
+from bot.core.order_registry import OrderRegistry
 from bot.core.order_types import OrderRequest
+from bot.core.paper_broker import PaperBroker
 from bot.core.position_manager import PositionManager
+from bot.core.state_store import StateStore
 from bot.utils.logger import setup_logger
 
 
@@ -19,23 +22,43 @@ class RiskLimits:
     capital: float | None = None
 
 
+def limit_violation(limits: RiskLimits, request: OrderRequest, trades: int, daily_loss: float) -> str | None:
+    if trades >= limits.max_trades_per_day:
+        return "Max trades per day reached"
+    if daily_loss >= limits.max_daily_loss:
+        return "Max daily loss reached"
+    if limits.capital is not None:
+        reference_price = request.reference_price or request.price
+        if reference_price is not None:
+            allowed = limits.capital * (limits.risk_per_trade_pct / 100)
+            if reference_price * request.quantity > allowed:
+                return "Order notional exceeds risk per trade"
+    return None
+
+
 class RiskManager:
-    def __init__(self, limits: RiskLimits, state_path: Path, position_manager: PositionManager) -> None:
+    def __init__(
+        self,
+        limits: RiskLimits,
+        store: StateStore,
+        position_manager: PositionManager,
+        order_registry: OrderRegistry | None = None,
+        paper_broker: PaperBroker | None = None,
+    ) -> None:
         self._limits = limits
-        self._state_path = state_path
         self._position_manager = position_manager
+        self._order_registry = order_registry
+        # Paper fills never reach the broker's position book, so ask the paper broker directly.
+        self._paper_broker = paper_broker
         self._logger = setup_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        # Entries approved by reserve_batch whose broker response is not in yet.
+        self._reserved: Counter[str] = Counter()
+        self._store = store
+        self._state = self._reset_if_new_day(store.get("risk", "daily") or self._new_state())
 
-    def _load_state(self) -> dict[str, Any]:
-        if not self._state_path.exists():
-            return {"date": date.today().isoformat(), "trades": 0, "daily_loss": 0.0}
-        with self._state_path.open("r", encoding="utf-8") as file:
-            return json.load(file)
-
-    def _save_state(self, state: dict[str, Any]) -> None:
-        self._state_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._state_path.open("w", encoding="utf-8") as file:
-            json.dump(state, file)
+    def _new_state(self) -> dict[str, Any]:
+        return {"date": date.today().isoformat(), "trades": 0, "daily_loss": 0.0}
 
     def _reset_if_new_day(self, state: dict[str, Any]) -> dict[str, Any]:
         today = date.today().isoformat()
@@ -43,49 +66,114 @@ class RiskManager:
             return {"date": today, "trades": 0, "daily_loss": 0.0}
         return state
 
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            self._state = self._reset_if_new_day(self._state)
+            return dict(self._state)
+
     def validate_order(self, request: OrderRequest) -> bool:
-        state = self._reset_if_new_day(self._load_state())
+        return self.validate_batch([request])[0]
+
+    def validate_batch(self, requests: list[OrderRequest]) -> list[bool]:
+        with self._lock:
+            return self._decide(requests)
+
+    def reserve_batch(self, requests: list[OrderRequest]) -> list[bool]:
+        """Validate ``requests`` and hold a slot for every accepted entry.
+
+        A held slot counts as a trade and as an entry for its symbol until
+        ``record_trade`` or ``release`` hands it back, so orders approved
+        concurrently cannot both use the last trade of the day.
+        """
+        with self._lock:
+            decisions = self._decide(requests)
+            for request, accepted in zip(requests, decisions):
+                if accepted and request.order_tag not in {"STOP_LOSS", "TARGET", "EXIT"}:
+                    self._reserved[request.symbol] += 1
+            return decisions
+
+    def release(self, request: OrderRequest) -> None:
+        """Give back the slot of an entry that was never placed."""
+        if request.order_tag in {"STOP_LOSS", "TARGET", "EXIT"}:
+            return
+        with self._lock:
+            self._unreserve(request.symbol)
+
+    def _unreserve(self, symbol: str) -> None:
+        if self._reserved[symbol] > 1:
+            self._reserved[symbol] -= 1
+        else:
+            self._reserved.pop(symbol, None)
+
+    def _decide(self, requests: list[OrderRequest]) -> list[bool]:
+        self._state = self._reset_if_new_day(self._state)
+        trades = self._state["trades"] + sum(self._reserved.values())
+        batch_symbols = set(self._reserved)
+        decisions = []
+        for request in requests:
+            accepted = self._check_entry(request, trades, self._state["daily_loss"], batch_symbols)
+            if accepted and request.order_tag not in {"STOP_LOSS", "TARGET", "EXIT"}:
+                trades += 1
+                batch_symbols.add(request.symbol)
+            decisions.append(accepted)
+        return decisions
+
+    def _check_entry(self, request: OrderRequest, trades: int, daily_loss: float, batch_symbols: set[str]) -> bool:
         if request.order_tag == "STOP_LOSS":
             return True
         if request.order_tag == "TARGET":
             return True
-        if state["trades"] >= self._limits.max_trades_per_day:
-            self._logger.warning("Max trades per day reached")
-            return False
-        if state["daily_loss"] >= self._limits.max_daily_loss:
-            self._logger.warning("Max daily loss reached")
+        if request.order_tag == "EXIT":
+            return True
+        violation = limit_violation(self._limits, request, trades, daily_loss)
+        if violation is not None:
+            self._logger.warning(violation, extra={"symbol": request.symbol})
             return False
-        if self._limits.capital is not None:
-            reference_price = request.reference_price or request.price
-            if reference_price is not None:
-                allowed = self._limits.capital * (self._limits.risk_per_trade_pct / 100)
-                notional = reference_price * request.quantity
-                if notional > allowed:
-                    self._logger.warning(
-                        "Order notional exceeds risk per trade",
-                        extra={"notional": notional, "allowed": allowed},
-                    )
-                    return False
-        if self._position_manager.has_open_position(request.symbol):
+        if request.symbol in batch_symbols or self._has_open_position(request.symbol):
             self._logger.warning("Open position exists for symbol", extra={"symbol": request.symbol})
             return False
+        if self._order_registry is not None and self._order_registry.has_pending_entry(request.symbol):
+            self._logger.warning("Pending entry order exists for symbol", extra={"symbol": request.symbol})
+            return False
         return True
 
+    def _has_open_position(self, symbol: str) -> bool:
+        if self._paper_broker is not None and self._paper_broker.position(symbol)[0] != 0:
+            return True
+        return self._position_manager.has_open_position(symbol)
+
     def record_trade(self, request: OrderRequest, response: dict[str, Any]) -> None:
-        if request.order_tag == "STOP_LOSS":
-            self._logger.info("Stop loss order recorded", extra={"symbol": request.symbol, "order": response})
-            return
-        if request.order_tag == "TARGET":
-            self._logger.info("Target order recorded", extra={"symbol": request.symbol, "order": response})
+        """Count an entry, and add any realised loss reported in ``response``.
+
+        Protective legs (STOP_LOSS, TARGET, EXIT) never count as trades; their
+        fills carry the ``pnl`` that feeds the daily loss limit.
+        """
+        closing = request.order_tag in {"STOP_LOSS", "TARGET", "EXIT"}
+        if closing and not (isinstance(response, dict) and "pnl" in response):
+            if request.order_tag == "STOP_LOSS":
+                self._logger.info("Stop loss order recorded", extra={"symbol": request.symbol, "order": response})
+            elif request.order_tag == "TARGET":
+                self._logger.info("Target order recorded", extra={"symbol": request.symbol, "order": response})
+            else:
+                self._logger.info("Exit order recorded", extra={"symbol": request.symbol, "order": response})
             return
-        state = self._reset_if_new_day(self._load_state())
-        state["trades"] += 1
+        loss = 0.0
         if isinstance(response, dict) and "pnl" in response:
             try:
                 pnl_value = float(response["pnl"])
                 if pnl_value < 0:
-                    state["daily_loss"] += abs(pnl_value)
+                    loss = abs(pnl_value)
             except (TypeError, ValueError):
                 self._logger.warning("Invalid pnl in response", extra={"pnl": response.get("pnl")})
-        self._save_state(state)
-        self._logger.info("Trade recorded", extra={"symbol": request.symbol, "order": response})
+        with self._lock:
+            state = dict(self._reset_if_new_day(self._state))
+            if not closing:
+                self._unreserve(request.symbol)
+                state["trades"] += 1
+            state["daily_loss"] += loss
+            self._state = state
+            self._store.put("risk", "daily", state, durable=True)
+        if closing:
+            self._logger.info("Position closed", extra={"symbol": request.symbol, "order": response})
+        else:
+            self._logger.info("Trade recorded", extra={"symbol": request.symbol, "order": response})
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from bot.core.instrument_cache import InstrumentDelta, InstrumentTable
+from bot.utils.logger import setup_logger
+
+
+@dataclass(frozen=True)
+class SecurityRef:
+    security_id: int
+    segment: str
+
+
+@dataclass(frozen=True)
+class _SecurityIndex:
+    by_symbol: dict[str, SecurityRef]
+    by_id: dict[tuple[str, int], str]
+
+
+class SecurityIdMap:
+    """Trading symbol <-> Dhan (security id, exchange segment), both ways.
+
+    Built in one pass per instrument master load and patched from refresh
+    deltas; lookups are plain dict reads against an immutable snapshot.
+    Instruments without a security id (id 0) are left out.
+    """
+
+    def __init__(self, instruments: InstrumentTable | None = None) -> None:
+        self._write_lock = threading.Lock()
+        self._index = _SecurityIndex(by_symbol={}, by_id={})
+        self._logger = setup_logger(self.__class__.__name__)
+        if instruments is not None:
+            self.load(instruments)
+
+    def __len__(self) -> int:
+        return len(self._index.by_symbol)
+
+    def load(self, instruments: InstrumentTable) -> None:
+        ids = instruments.column("security_id")
+        trading_symbols = instruments.column("trading_symbol")
+        segments = instruments.column("segment")
+        names: dict[int, str] = {}
+        by_symbol: dict[str, SecurityRef] = {}
+        for row in range(len(instruments)):
+            if not ids[row]:
+                continue
+            symbol_id, segment_id = trading_symbols[row], segments[row]
+            if symbol_id not in names:
+                names[symbol_id] = instruments.string(symbol_id)
+            if segment_id not in names:
+                names[segment_id] = instruments.string(segment_id)
+            by_symbol[names[symbol_id]] = SecurityRef(security_id=ids[row], segment=names[segment_id])
+        with self._write_lock:
+            self._index = _build_index(by_symbol)
+        self._logger.info("Security id map built", extra={"count": len(by_symbol)})
+
+    def apply_delta(self, delta: InstrumentDelta) -> None:
+        if not delta:
+            return
+        with self._write_lock:
+            by_symbol = dict(self._index.by_symbol)
+            for record in delta.removed:
+                by_symbol.pop(record["trading_symbol"], None)
+            for record in delta.added:
+                if record.get("security_id"):
+                    by_symbol[record["trading_symbol"]] = SecurityRef(
+                        security_id=int(record["security_id"]),
+                        segment=str(record.get("segment") or ""),
+                    )
+            self._index = _build_index(by_symbol)
+
+    def resolve(self, symbol: str) -> SecurityRef | None:
+        return self._index.by_symbol.get(symbol)
+
+    def symbol(self, security_id: Any, segment: str | None = None) -> str | None:
+        """Trading symbol for a broker security id; ``segment`` narrows ids shared across segments."""
+        try:
+            key = int(security_id)
+        except (TypeError, ValueError):
+            return None
+        by_id = self._index.by_id
+        if segment is not None:
+            return by_id.get((segment, key))
+        return by_id.get(("", key))
+
+
+def _build_index(by_symbol: dict[str, SecurityRef]) -> _SecurityIndex:
+    by_id: dict[tuple[str, int], str] = {}
+    for symbol, ref in by_symbol.items():
+        by_id[(ref.segment, ref.security_id)] = symbol
+        by_id.setdefault(("", ref.security_id), symbol)
+    return _SecurityIndex(by_symbol=by_symbol, by_id=by_id)
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from bot.utils.logger import setup_logger
+
+
+_STOP = object()
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+_Write = tuple[str, str, str | None]
+
+
+@dataclass
+class _Commit:
+    writes: list[_Write] = field(default_factory=list)
+    durable: bool = False
+    done: threading.Event | None = None
+    error: Exception | None = None
+
+
+class StateStore:
+    """The bot's persistent state: JSON documents in one SQLite database in WAL mode.
+
+    Documents are addressed by ``(namespace, key)``. Writes are queued and a
+    single writer thread commits everything pending in one transaction, so
+    request threads never wait on the disk. A ``durable`` write instead
+    returns only once its commit is on disk; risk counters and idempotency
+    records use it so a crash cannot undo them. Writes made inside
+    ``transaction()`` are queued together and land atomically. Reads go
+    through their own connection and see only committed data; call
+    ``flush()`` first to read your own writes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._pending: ContextVar[_Commit | None] = ContextVar(f"state_store_{id(self)}", default=None)
+        self._logger = setup_logger(self.__class__.__name__)
+        writer = self._connect()
+        writer.execute(_SCHEMA)
+        self._reader = self._connect()
+        self._read_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(writer,), daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, isolation_level=None, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        return connection
+
+    def get(self, namespace: str, key: str) -> Any | None:
+        with self._read_lock:
+            row = self._reader.execute(
+                "SELECT value FROM state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def items(self, namespace: str) -> list[tuple[str, Any]]:
+        with self._read_lock:
+            rows = self._reader.execute("SELECT key, value FROM state WHERE namespace = ?", (namespace,)).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def data_version(self) -> int:
+        """Changes whenever another connection, in any process, commits."""
+        with self._read_lock:
+            return int(self._reader.execute("PRAGMA data_version").fetchone()[0])
+
+    def put(self, namespace: str, key: str, value: Any, durable: bool = False) -> None:
+        self._submit([(namespace, key, json.dumps(value, default=str))], durable)
+
+    def delete(self, namespace: str, key: str, durable: bool = False) -> None:
+        self._submit([(namespace, key, None)], durable)
+
+    @contextmanager
+    def transaction(self, durable: bool = False) -> Iterator[None]:
+        """Queue every write made in the block as one atomic commit.
+
+        Nested blocks join the outermost one, which becomes durable if any
+        block or write inside it asks to be. If the block raises, its writes
+        are dropped.
+        """
+        outer = self._pending.get()
+        if outer is not None:
+            outer.durable = outer.durable or durable
+            yield
+            return
+        commit = _Commit(durable=durable)
+        token = self._pending.set(commit)
+        try:
+            yield
+        finally:
+            self._pending.reset(token)
+        if commit.writes:
+            self._enqueue(commit)
+
+    def import_document(self, namespace: str, key: str, path: Path) -> bool:
+        """Move a pre-store JSON file (and its write-behind journal) into the store once."""
+        journal_path = path.with_suffix(".journal")
+        if self.get(namespace, key) is not None or not (path.exists() or journal_path.exists()):
+            return False
+        document = None
+        if path.exists():
+            with path.open("r", encoding="utf-8") as file:
+                document = json.load(file)
+        if journal_path.exists():
+            with journal_path.open("r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        document = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+        if document is not None:
+            self.put(namespace, key, document)
+            self.flush()
+        self._retire(path, journal_path)
+        self._logger.info("Legacy state imported", extra={"namespace": namespace, "path": str(path)})
+        return document is not None
+
+    def import_records(self, namespace: str, path: Path, key_field: str = "key") -> int:
+        """Move a JSON-lines log into ``namespace``, one document per record key."""
+        if not path.exists():
+            return 0
+        imported = 0
+        with self.transaction():
+            with path.open("r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    self.put(namespace, str(record.pop(key_field)), record)
+                    imported += 1
+        self.flush()
+        self._retire(path)
+        self._logger.info("Legacy records imported", extra={"namespace": namespace, "count": imported})
+        return imported
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+        with self._read_lock:
+            self._reader.close()
+
+    def _submit(self, writes: list[_Write], durable: bool) -> None:
+        pending = self._pending.get()
+        if pending is not None:
+            pending.writes.extend(writes)
+            pending.durable = pending.durable or durable
+        else:
+            self._enqueue(_Commit(writes=writes, durable=durable))
+
+    def _enqueue(self, commit: _Commit) -> None:
+        if not commit.durable:
+            self._queue.put(commit)
+            return
+        commit.done = threading.Event()
+        self._queue.put(commit)
+        commit.done.wait()
+        if commit.error is not None:
+            raise commit.error
+
+    def _retire(self, *paths: Path) -> None:
+        for path in paths:
+            if path.exists():
+                os.replace(path, path.with_name(path.name + ".migrated"))
+
+    def _run(self, writer: sqlite3.Connection) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            transactions = [item for item in batch if item is not _STOP]
+            try:
+                if transactions:
+                    self._commit(writer, [item.writes for item in transactions])
+            except Exception as exc:  # noqa: BLE001 - keeps the writer alive
+                self._logger.error("State store commit failed", extra={"error": str(exc)})
+                for item in transactions:
+                    item.error = exc
+            finally:
+                for item in transactions:
+                    if item.done is not None:
+                        item.done.set()
+                for _ in batch:
+                    self._queue.task_done()
+            if len(transactions) != len(batch):
+                writer.close()
+                return
+
+    def _commit(self, writer: sqlite3.Connection, transactions: list[list[_Write]]) -> None:
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            for writes in transactions:
+                for namespace, key, value in writes:
+                    if value is None:
+                        writer.execute("DELETE FROM state WHERE namespace = ? AND key = ?", (namespace, key))
+                    else:
+                        writer.execute(
+                            "INSERT INTO state (namespace, key, value) VALUES (?, ?, ?) "
+                            "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value",
+                            (namespace, key, value),
+                        )
+        except Exception:
+            writer.execute("ROLLBACK")
+            raise
+        writer.execute("COMMIT")
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
+import sqlite3
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any
 
+from bot.core.state_store import StateStore
 from bot.utils.logger import setup_logger
 
 
@@ -17,9 +17,21 @@ class TradingControlState:
 
 
 class TradingControl:
-    def __init__(self, state_path: Path) -> None:
-        self._state_path = state_path
+    """Manual kill switch shared with the ``bot.cli`` process through the state store.
+
+    ``status()`` answers from memory and checks the store's data version at
+    most once every ``refresh_interval_ms``, so a change committed by another
+    process is seen within that interval.
+    """
+
+    def __init__(self, store: StateStore, refresh_interval_ms: int = 250) -> None:
+        self._store = store
+        self._refresh_interval = refresh_interval_ms / 1000
         self._logger = setup_logger(self.__class__.__name__)
+        self._version: int | None = None
+        self._next_check = 0.0
+        self._state = self._default_state()
+        self._refresh(force=True)
 
     def _default_state(self) -> TradingControlState:
         return TradingControlState(enabled=True, updated_at=self._now_iso(), reason=None)
@@ -28,10 +40,9 @@ class TradingControl:
         return datetime.now(timezone.utc).isoformat()
 
     def _load_state(self) -> TradingControlState:
-        if not self._state_path.exists():
+        payload = self._store.get("control", "trading")
+        if payload is None:
             return self._default_state()
-        with self._state_path.open("r", encoding="utf-8") as file:
-            payload = json.load(file)
         return TradingControlState(
             enabled=bool(payload.get("enabled", True)),
             updated_at=str(payload.get("updated_at", self._now_iso())),
@@ -39,15 +50,33 @@ class TradingControl:
         )
 
     def _save_state(self, state: TradingControlState) -> None:
-        self._state_path.parent.mkdir(parents=True, exist_ok=True)
-        with self._state_path.open("w", encoding="utf-8") as file:
-            json.dump(
-                {"enabled": state.enabled, "updated_at": state.updated_at, "reason": state.reason},
-                file,
-            )
+        self._store.put(
+            "control",
+            "trading",
+            {"enabled": state.enabled, "updated_at": state.updated_at, "reason": state.reason},
+        )
+        self._store.flush()
+        self._state = state
+        self._version = self._store.data_version()
+
+    def _refresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        self._next_check = now + self._refresh_interval
+        try:
+            version = self._store.data_version()
+            if not force and version == self._version:
+                return
+            self._state = self._load_state()
+        except (sqlite3.Error, ValueError) as exc:
+            self._logger.warning("Trading control state unreadable; keeping cached state", extra={"error": str(exc)})
+            return
+        self._version = version
 
     def status(self) -> TradingControlState:
-        return self._load_state()
+        self._refresh()
+        return self._state
 
     def enable(self, reason: str | None = None) -> TradingControlState:
         state = TradingControlState(enabled=True, updated_at=self._now_iso(), reason=reason)
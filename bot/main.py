@@ -1,24 +1,42 @@
 from __future__ import annotations
 
-import threading
-import time
 from pathlib import Path
 from typing import Any
 
 import uvicorn
 import yaml
 
-from bot.core.dhan_client import DhanClient, DhanCredentials
+from bot.core.dhan_client import (
+    AsyncDhanClient,
+    DhanClient,
+    DhanConnectionSettings,
+    DhanCredentials,
+    EndpointTimeout,
+)
+from bot.core.idempotency import IdempotencyCache
 from bot.core.instrument_cache import InstrumentCache
+from bot.core.instrument_refresher import InstrumentRefresher
 from bot.core.order_manager import OrderManager
+from bot.core.order_registry import OrderRegistry
+from bot.core.order_templates import OrderTemplateCache
+from bot.core.paper_broker import PaperBroker, PaperExecutionSettings
 from bot.core.position_manager import PositionManager
+from bot.core.position_monitor import PollingPolicy, PositionMonitor
+from bot.core.rate_limiter import RateLimitSettings, RequestScheduler
 from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.core.security_ids import SecurityIdMap
+from bot.core.state_store import StateStore
 from bot.core.trading_control import TradingControl
+from bot.market_data.feeds import DhanLtpPollingFeed, ReplayFeed, Watchlist
+from bot.market_data.ltp_table import LtpTable
+from bot.market_data.spot_provider import SpotPriceProvider
 from bot.strategy.atm_option_selector import AtmOptionSelector
 from bot.strategy.scalping_logic import ScalpingLogic
-from bot.strategy.signal_router import SignalRouter
+from bot.strategy.signal_router import SignalRouter, StrategyExecution
 from bot.strategy.strategies import ScalpAtmStrategy
-from bot.utils.logger import setup_logger
+from bot.utils.logger import configure_logging, setup_logger
+from bot.utils.retry import BackoffPolicy
+from bot.utils.time_utils import parse_clock
 from bot.webhook.listener import create_app
 
 
@@ -27,21 +45,34 @@ def load_yaml(path: Path) -> dict[str, Any]:
         return yaml.safe_load(file)
 
 
-def start_position_monitor(client: DhanClient, position_manager: PositionManager) -> threading.Thread:
-    logger = setup_logger("PositionMonitor")
+def import_legacy_state(store: StateStore, state_dir: Path) -> None:
+    """One-off move of the per-component files that predate the state store."""
+    store.import_document("risk", "daily", state_dir / "risk.json")
+    store.import_document("positions", "book", state_dir / "positions.json")
+    store.import_document("control", "trading", state_dir / "trading.json")
+    store.import_document("instruments", "instruments.bin", state_dir / "instruments.meta.json")
+    store.import_records("order_idempotency", state_dir / "order_idempotency.jsonl")
+    store.import_records("signal_idempotency", state_dir / "signal_idempotency.jsonl")
 
-    def _loop() -> None:
-        while True:
-            try:
-                positions = client.get_positions()
-                position_manager.record_from_broker(positions)
-            except Exception as exc:  # noqa: BLE001 - logs and continues
-                logger.error("Position monitor error", extra={"error": str(exc)})
-            time.sleep(1)
 
-    thread = threading.Thread(target=_loop, daemon=True)
-    thread.start()
-    return thread
+def paper_watchlist(broker: PaperBroker, security_ids: SecurityIdMap) -> Watchlist:
+    """LTP subscriptions for the contracts the paper broker holds, so its orders can fill."""
+    logger = setup_logger("PaperWatchlist")
+    unresolved: set[str] = set()
+
+    def _watchlist() -> list[tuple[str, str, int]]:
+        instruments = []
+        for symbol in broker.active_symbols():
+            ref = security_ids.resolve(symbol)
+            if ref is None:
+                if symbol not in unresolved:
+                    unresolved.add(symbol)
+                    logger.warning("No security id for paper contract; it cannot fill", extra={"symbol": symbol})
+                continue
+            instruments.append((symbol, ref.segment, ref.security_id))
+        return instruments
+
+    return _watchlist
 
 
 def main() -> None:
@@ -53,53 +84,186 @@ def main() -> None:
     strategy_config = load_yaml(config_path / "strategy.yaml")
     trading_config = load_yaml(config_path / "trading.yaml")
 
+    logging_config = trading_config.get("logging") or {}
+    configure_logging(
+        queue_size=int(logging_config.get("queue_size", 10_000)),
+        overflow_policy=str(logging_config.get("overflow_policy", "drop_oldest")),
+        batch_size=int(logging_config.get("batch_size", 256)),
+    )
+
     credentials = DhanCredentials(
         client_id=dhan_config["client_id"],
         access_token=dhan_config["access_token"],
         base_url=dhan_config["base_url"],
     )
-    client = DhanClient(credentials)
+    timeouts = {
+        endpoint: EndpointTimeout(connect=float(values["connect"]), read=float(values["read"]))
+        for endpoint, values in (dhan_config.get("timeouts") or {}).items()
+    }
+    connection_settings = DhanConnectionSettings(
+        pool_size=int(dhan_config.get("pool_size", 10)),
+        **({"timeouts": timeouts} if timeouts else {}),
+    )
+    rate_limits = dhan_config.get("rate_limits")
+    scheduler = RequestScheduler(
+        RateLimitSettings({bucket: float(rate) for bucket, rate in rate_limits.items()}) if rate_limits else None
+    )
+    backoff_config = dhan_config.get("backoff") or {}
+    backoff = BackoffPolicy(
+        base_seconds=float(backoff_config.get("base_seconds", 0.25)),
+        max_seconds=float(backoff_config.get("max_seconds", 4.0)),
+        max_attempts=int(backoff_config.get("max_attempts", 4)),
+    )
+    security_ids = SecurityIdMap()
+    client = DhanClient(
+        credentials, connection_settings, scheduler=scheduler, backoff=backoff, security_ids=security_ids
+    )
+    async_client = AsyncDhanClient(
+        credentials, connection_settings, scheduler=scheduler, backoff=backoff, security_ids=security_ids
+    )
+
+    state_dir = base_path / "state"
+    state_store = StateStore(state_dir / "bot.db")
+    import_legacy_state(state_store, state_dir)
 
-    instrument_cache = InstrumentCache(base_path / "state" / "instruments.json")
+    instrument_cache = InstrumentCache(state_dir / "instruments.bin", store=state_store)
     instruments = instrument_cache.load()
-    if not instruments:
-        instruments = client.get_instruments()
-        instrument_cache.save(instruments)
+    security_ids.load(instruments)
 
-    position_manager = PositionManager(base_path / "state" / "positions.json")
+    position_manager = PositionManager(state_store, security_ids)
+    execution_mode = trading_config.get("execution_mode", "paper")
+    paper_config = trading_config.get("paper") or {}
+    paper_broker = (
+        PaperBroker(
+            PaperExecutionSettings(
+                latency_ms=float(paper_config.get("latency_ms", 0.0)),
+                slippage_points=float(paper_config.get("slippage_points", 0.0)),
+            )
+        )
+        if execution_mode.lower() == "paper"
+        else None
+    )
+    order_registry = OrderRegistry(paper_broker.order_book if paper_broker is not None else client.get_orders)
     risk_limits = RiskLimits(
         max_trades_per_day=risk_config["max_trades_per_day"],
         max_daily_loss=risk_config["max_daily_loss"],
         risk_per_trade_pct=risk_config["risk_per_trade_pct"],
         capital=risk_config.get("capital"),
     )
-    risk_manager = RiskManager(risk_limits, base_path / "state" / "risk.json", position_manager)
-    trading_control = TradingControl(base_path / "state" / "trading.json")
+    risk_manager = RiskManager(
+        risk_limits,
+        state_store,
+        position_manager,
+        order_registry=order_registry,
+        paper_broker=paper_broker,
+    )
+    trading_control = TradingControl(
+        state_store,
+        refresh_interval_ms=int(trading_config.get("control_refresh_ms", 250)),
+    )
     if trading_config.get("enabled", True):
         trading_control.enable(reason="startup")
     else:
         trading_control.disable(reason="startup")
+    idempotency_config = trading_config.get("idempotency") or {}
+    idempotency_settings = {
+        "max_entries": int(idempotency_config.get("max_entries", 10_000)),
+        "ttl_seconds": float(idempotency_config.get("ttl_seconds", 86_400)),
+    }
+    order_templates = OrderTemplateCache(security_ids=security_ids)
     order_manager = OrderManager(
         client,
         risk_manager,
         trading_control,
-        execution_mode=trading_config.get("execution_mode", "paper"),
+        execution_mode=execution_mode,
+        async_client=async_client,
+        idempotency_cache=IdempotencyCache(state_store, "order_idempotency", **idempotency_settings),
+        paper_broker=paper_broker,
+        state_store=state_store,
+        order_registry=order_registry,
+        order_templates=order_templates,
     )
+    order_registry.start(float(trading_config.get("order_poll_seconds", 1.0)))
 
-    selector = AtmOptionSelector(instruments, strategy_config["index_strike_steps"])
+    selector = AtmOptionSelector(
+        instruments,
+        strategy_config["index_strike_steps"],
+        ladder_depth=int(strategy_config.get("strike_ladder_depth", 5)),
+        on_ladder=lambda ladder: order_templates.warm(ladder.selections()),
+    )
+    instruments.close()
+    instrument_refresher = InstrumentRefresher(
+        client,
+        instrument_cache,
+        selector,
+        refresh_time=parse_clock(str(trading_config.get("instrument_refresh_time", "08:45"))),
+        security_ids=security_ids,
+    )
+    instrument_refresher.refresh_if_stale()
+    instrument_refresher.start()
     scalping_logic = ScalpingLogic(
         sl_points=risk_config["sl_points"]["scalping"],
         target_points=risk_config["target_points"]["scalping"],
     )
     strategies = {
-        "SCALP_ATM": ScalpAtmStrategy(selector=selector, logic=scalping_logic),
+        "SCALP_ATM": ScalpAtmStrategy(
+            selector=selector,
+            logic=scalping_logic,
+            strike_offset=int(strategy_config.get("strike_offset", 0)),
+        ),
     }
-    router = SignalRouter(set(strategy_config["allowed_strategies"]), strategies)
+    execution = {
+        name: StrategyExecution(
+            backend=str(values.get("backend", "inline")),
+            timeout_seconds=float(values["timeout_ms"]) / 1000 if values.get("timeout_ms") else None,
+        )
+        for name, values in (strategy_config.get("strategy_execution") or {}).items()
+    }
+    router = SignalRouter(
+        set(strategy_config["allowed_strategies"]),
+        strategies,
+        execution=execution,
+        subscriptions=strategy_config.get("strategy_subscriptions") or {},
+        max_workers=int(strategy_config.get("strategy_workers", 4)),
+    )
 
-    start_position_monitor(client, position_manager)
+    poll_config = trading_config.get("position_poll") or {}
+    position_monitor = PositionMonitor(
+        client,
+        position_manager,
+        PollingPolicy(
+            active_seconds=float(poll_config.get("active_seconds", 1.0)),
+            flat_seconds=float(poll_config.get("flat_seconds", 5.0)),
+            closed_seconds=float(poll_config.get("closed_seconds", 60.0)),
+        ),
+    )
+    position_monitor.start()
+
+    spot_config = strategy_config.get("spot_price") or {}
+    ltp_table = LtpTable()
+    if spot_config.get("replay_file"):
+        market_feed = ReplayFeed.from_csv(Path(spot_config["replay_file"]))
+    else:
+        market_feed = DhanLtpPollingFeed(
+            client,
+            {symbol: int(security_id) for symbol, security_id in spot_config.get("index_security_ids", {}).items()},
+            interval_seconds=float(spot_config.get("poll_seconds", 1.0)),
+            watchlist=paper_watchlist(paper_broker, security_ids) if paper_broker is not None else None,
+        )
+    if paper_broker is not None:
 
-    def spot_price_provider(symbol: str, fallback_price: float) -> float:
-        return fallback_price
+        def _on_tick(symbol: str, price: float) -> None:
+            ltp_table.update(symbol, price)
+            paper_broker.on_tick(symbol, price)
+
+        market_feed.start(_on_tick)
+    else:
+        market_feed.start(ltp_table.update)
+    spot_price_provider = SpotPriceProvider(
+        ltp_table,
+        max_age_seconds=float(spot_config.get("max_age_seconds", 5.0)),
+        fallback_to_signal_price=bool(spot_config.get("fallback_to_signal_price", False)),
+    )
 
     app = create_app(
         router=router,
@@ -107,9 +271,19 @@ def main() -> None:
         signal_ttl_seconds=strategy_config["signal_ttl_seconds"],
         spot_price_provider=spot_price_provider,
         trading_control=trading_control,
+        connection_stats_provider=lambda: {
+            "sync": client.connection_stats(),
+            "async": async_client.connection_stats(),
+        },
+        dedupe_window_seconds=strategy_config.get("dedupe_window_seconds", 300),
+        coalesce_window_ms=strategy_config.get("coalesce_window_ms", 0),
+        idempotency_cache=IdempotencyCache(state_store, "signal_idempotency", **idempotency_settings),
     )
 
-    uvicorn.run(app, host="0.0.0.0", port=strategy_config["webhook_port"])
+    try:
+        uvicorn.run(app, host="0.0.0.0", port=strategy_config["webhook_port"])
+    finally:
+        state_store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+import threading
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Protocol
+
+from bot.core.dhan_client import DhanClient
+from bot.utils.logger import setup_logger
+
+
+TickHandler = Callable[[str, float], None]
+# (symbol, exchange segment, security id) of an instrument to quote.
+Watchlist = Callable[[], Iterable[tuple[str, str, int]]]
+
+
+class MarketFeed(Protocol):
+    def start(self, on_tick: TickHandler) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class ReplayFeed:
+    def __init__(self, ticks: Iterable[tuple[float, str, float]], speed: float = 1.0) -> None:
+        self._ticks = list(ticks)
+        self._speed = speed
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_csv(cls, path: Path, speed: float = 1.0) -> ReplayFeed:
+        with path.open("r", encoding="utf-8", newline="") as file:
+            rows = [(float(row["offset_seconds"]), row["symbol"], float(row["price"])) for row in csv.DictReader(file)]
+        return cls(rows, speed=speed)
+
+    def start(self, on_tick: TickHandler) -> None:
+        def _replay() -> None:
+            started = time.monotonic()
+            for offset, symbol, price in self._ticks:
+                if self._speed > 0:
+                    delay = offset / self._speed - (time.monotonic() - started)
+                    if delay > 0 and self._stop.wait(delay):
+                        return
+                if self._stop.is_set():
+                    return
+                on_tick(symbol, price)
+
+        self._thread = threading.Thread(target=_replay, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+class DhanLtpPollingFeed:
+    """Polls Dhan LTPs for fixed instruments plus whatever ``watchlist`` returns.
+
+    The watchlist is read on every poll, so instruments such as the option
+    contracts the paper broker holds are quoted only while they are needed.
+    """
+
+    def __init__(
+        self,
+        client: DhanClient,
+        security_ids: dict[str, int],
+        segment: str = "IDX_I",
+        interval_seconds: float = 1.0,
+        watchlist: Watchlist | None = None,
+    ) -> None:
+        self._client = client
+        self._instruments = [(symbol, segment, security_id) for symbol, security_id in security_ids.items()]
+        self._watchlist = watchlist
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def poll_once(self, on_tick: TickHandler) -> None:
+        instruments = self._instruments
+        if self._watchlist is not None:
+            instruments = [*instruments, *self._watchlist()]
+        request: dict[str, list[int]] = {}
+        symbols: dict[tuple[str, str], str] = {}
+        for symbol, segment, security_id in instruments:
+            if (segment, str(security_id)) not in symbols:
+                request.setdefault(segment, []).append(security_id)
+                symbols[(segment, str(security_id))] = symbol
+        if not request:
+            return
+        quotes = self._client.get_ltp(request)
+        for segment, prices in quotes.items():
+            for security_id, price in prices.items():
+                symbol = symbols.get((segment, str(security_id)))
+                if symbol is not None:
+                    on_tick(symbol, price)
+
+    def start(self, on_tick: TickHandler) -> None:
+        def _loop() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.poll_once(on_tick)
+                except Exception as exc:  # noqa: BLE001 - logs and continues
+                    self._logger.error("LTP feed error", extra={"error": str(exc)})
+                self._stop.wait(self._interval)
+
+        threading.Thread(target=_loop, daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Tick:
+    symbol: str
+    price: float
+    received_at: float
+
+
+class LtpTable:
+    """Last traded price per symbol.
+
+    Writers publish a new immutable ``Tick`` with a single dict assignment and
+    readers take a single dict lookup, so neither side needs a lock.
+    """
+
+    def __init__(self) -> None:
+        self._ticks: dict[str, Tick] = {}
+
+    def update(self, symbol: str, price: float, received_at: float | None = None) -> None:
+        self._ticks[symbol] = Tick(
+            symbol=symbol,
+            price=price,
+            received_at=time.monotonic() if received_at is None else received_at,
+        )
+
+    def get(self, symbol: str) -> Tick | None:
+        return self._ticks.get(symbol)
+
+    def age_seconds(self, symbol: str) -> float | None:
+        tick = self._ticks.get(symbol)
+        if tick is None:
+            return None
+        return time.monotonic() - tick.received_at
+
+    def symbols(self) -> list[str]:
+        return list(self._ticks)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+
+from bot.market_data.ltp_table import LtpTable
+from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+
+
+class StalePriceError(ValueError):
+    pass
+
+
+class SpotPriceProvider:
+    def __init__(
+        self,
+        table: LtpTable,
+        max_age_seconds: float,
+        fallback_to_signal_price: bool = False,
+        metrics: LatencyRecorder | None = None,
+    ) -> None:
+        self._table = table
+        self._max_age_seconds = max_age_seconds
+        self._fallback_to_signal_price = fallback_to_signal_price
+        self._metrics = metrics or get_recorder()
+        self._logger = setup_logger(self.__class__.__name__)
+
+    def __call__(self, symbol: str, fallback_price: float) -> float:
+        tick = self._table.get(symbol)
+        age = None if tick is None else time.monotonic() - tick.received_at
+        if tick is not None and age <= self._max_age_seconds:
+            return tick.price
+        self._metrics.increment("spot_price_stale")
+        if self._fallback_to_signal_price:
+            self._logger.warning("Spot price stale; using signal price", extra={"symbol": symbol, "age": age})
+            return fallback_price
+        raise StalePriceError(f"No fresh spot price for {symbol}")
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
+import threading
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
 from typing import Any
 
+from bot.core.instrument_cache import InstrumentDelta, InstrumentTable
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+from bot.utils.time_utils import IST, ist_now
 
 
 @dataclass(frozen=True)
@@ -12,49 +18,275 @@ class AtmSelection:
     symbol: str
     exchange: str
     lot_size: int
+    security_id: int = 0
+    segment: str = ""
+
+
+@dataclass(frozen=True)
+class _UnderlyingIndex:
+    expiries: tuple[date, ...]
+    chains: tuple[dict[float, dict[str, AtmSelection]], ...]
+
+
+@dataclass(frozen=True)
+class StrikeLadder:
+    """Contracts of the front expiry from ATM - depth to ATM + depth.
+
+    Valid while spot stays strictly between ``lower`` and ``upper``; outside
+    that band the ATM strike changes and the ladder is rebuilt.
+    """
+
+    expiry: date
+    atm_strike: float
+    step: float
+    lower: float
+    upper: float
+    contracts: tuple[dict[str, AtmSelection], ...]
+
+    @property
+    def depth(self) -> int:
+        return len(self.contracts) // 2
+
+    def pick(self, option_type: str, offset: int = 0) -> AtmSelection | None:
+        """Contract ``offset`` strikes out of the money (negative: in the money)."""
+        position = self.depth + (offset if option_type == "CE" else -offset)
+        if not 0 <= position < len(self.contracts):
+            raise ValueError(f"Strike offset {offset} beyond ladder depth {self.depth}")
+        return self.contracts[position].get(option_type)
+
+    def selections(self) -> list[AtmSelection]:
+        return [selection for contracts in self.contracts for selection in contracts.values()]
+
+
+@dataclass(frozen=True)
+class _SelectorState:
+    index: dict[str, _UnderlyingIndex]
+    front: dict[str, int]
+    rollover_at: datetime
+    ladders: dict[str, StrikeLadder] = field(default_factory=dict)
+
+
+def _front_position(expiries: tuple[date, ...], today: date) -> int:
+    return min(bisect_left(expiries, today), len(expiries) - 1)
+
+
+def _build_state(index: dict[str, _UnderlyingIndex], now: datetime) -> _SelectorState:
+    today = now.astimezone(IST).date()
+    return _SelectorState(
+        index=index,
+        front={symbol: _front_position(underlying.expiries, today) for symbol, underlying in index.items()},
+        rollover_at=datetime.combine(today + timedelta(days=1), time.min, tzinfo=IST),
+    )
+
+
+def _build_ladder(
+    expiry: date,
+    chain: dict[float, dict[str, AtmSelection]],
+    atm_strike: float,
+    step: float,
+    depth: int,
+) -> StrikeLadder:
+    return StrikeLadder(
+        expiry=expiry,
+        atm_strike=atm_strike,
+        step=step,
+        lower=atm_strike - step / 2,
+        upper=atm_strike + step / 2,
+        contracts=tuple(chain.get(atm_strike + offset * step, {}) for offset in range(-depth, depth + 1)),
+    )
+
+
+def build_index(table: InstrumentTable, underlyings: set[str]) -> dict[str, _UnderlyingIndex]:
+    wanted = {
+        symbol_id
+        for symbol_id in set(table.column("symbol"))
+        if table.string(symbol_id) in underlyings
+    }
+    option_types = {
+        type_id: table.string(type_id)
+        for type_id in set(table.column("option_type"))
+        if table.string(type_id) in {"CE", "PE"}
+    }
+    symbols = table.column("symbol")
+    expiries = table.column("expiry")
+    strikes = table.column("strike")
+    types = table.column("option_type")
+    tradable = table.column("tradable")
+    trading_symbols = table.column("trading_symbol")
+    exchanges = table.column("exchange")
+    lot_sizes = table.column("lot_size")
+    security_ids = table.column("security_id")
+    segments = table.column("segment")
+    chains: dict[str, dict[int, dict[float, dict[str, AtmSelection]]]] = {}
+    for row in range(len(table)):
+        if symbols[row] not in wanted or not expiries[row] or types[row] not in option_types:
+            continue
+        if not tradable[row]:
+            continue
+        by_expiry = chains.setdefault(table.string(symbols[row]), {})
+        by_expiry.setdefault(expiries[row], {}).setdefault(strikes[row], {}).setdefault(
+            option_types[types[row]],
+            AtmSelection(
+                symbol=table.string(trading_symbols[row]),
+                exchange=table.string(exchanges[row]),
+                lot_size=lot_sizes[row],
+                security_id=security_ids[row],
+                segment=table.string(segments[row]),
+            ),
+        )
+    return {symbol: _freeze(by_expiry) for symbol, by_expiry in chains.items()}
+
+
+def _freeze(by_expiry: dict[int, dict[float, dict[str, AtmSelection]]]) -> _UnderlyingIndex:
+    ordered = sorted(ordinal for ordinal, by_strike in by_expiry.items() if by_strike)
+    return _UnderlyingIndex(
+        expiries=tuple(date.fromordinal(ordinal) for ordinal in ordered),
+        chains=tuple(by_expiry[ordinal] for ordinal in ordered),
+    )
+
+
+def _thaw(underlying: _UnderlyingIndex | None) -> dict[int, dict[float, dict[str, AtmSelection]]]:
+    if underlying is None:
+        return {}
+    return {
+        expiry.toordinal(): {strike: dict(contracts) for strike, contracts in chain.items()}
+        for expiry, chain in zip(underlying.expiries, underlying.chains)
+    }
+
+
+def _record_location(record: dict[str, Any]) -> tuple[int, float, str] | None:
+    if not record.get("expiry") or record.get("option_type") not in {"CE", "PE"}:
+        return None
+    expiry = datetime.fromisoformat(str(record["expiry"])).date().toordinal()
+    return expiry, float(record.get("strike") or 0), record["option_type"]
 
 
 class AtmOptionSelector:
-    def __init__(self, instruments: list[dict[str, Any]], strike_steps: dict[str, int]) -> None:
-        self._instruments = instruments
+    def __init__(
+        self,
+        instruments: InstrumentTable | list[dict[str, Any]],
+        strike_steps: dict[str, int],
+        metrics: LatencyRecorder | None = None,
+        ladder_depth: int = 5,
+        clock_source: Callable[[], datetime] = ist_now,
+        on_ladder: Callable[[StrikeLadder], None] | None = None,
+    ) -> None:
         self._strike_steps = strike_steps
+        self._on_ladder = on_ladder
+        self._metrics = metrics or get_recorder()
+        self._ladder_depth = ladder_depth
+        self._clock_source = clock_source
         self._logger = setup_logger(self.__class__.__name__)
+        self._write_lock = threading.Lock()
+        self._state = _build_state({}, clock_source())
+        self.load(instruments)
+
+    def load(self, instruments: InstrumentTable | list[dict[str, Any]]) -> None:
+        if not isinstance(instruments, InstrumentTable):
+            instruments = InstrumentTable.from_records(instruments)
+        index = build_index(instruments, set(self._strike_steps))
+        with self._write_lock:
+            self._state = _build_state(index, self._clock_source())
+        self._logger.info("Instrument index built", extra={"underlyings": len(index)})
 
-    def select(self, index_symbol: str, spot_price: float, side: str) -> AtmSelection:
+    def apply_delta(self, delta: InstrumentDelta) -> None:
+        with self._write_lock:
+            self._apply_delta(delta)
+
+    def _apply_delta(self, delta: InstrumentDelta) -> None:
+        current = self._state.index
+        affected: dict[str, dict[int, dict[float, dict[str, AtmSelection]]]] = {}
+        for record in delta.removed:
+            location = _record_location(record)
+            if location is None or record.get("symbol") not in self._strike_steps:
+                continue
+            if record["symbol"] not in affected:
+                affected[record["symbol"]] = _thaw(current.get(record["symbol"]))
+            expiry, strike, option_type = location
+            contracts = affected[record["symbol"]].get(expiry, {}).get(strike, {})
+            existing = contracts.get(option_type)
+            if existing is not None and existing.symbol == record.get("trading_symbol"):
+                del contracts[option_type]
+                if not contracts:
+                    del affected[record["symbol"]][expiry][strike]
+        for record in delta.added:
+            location = _record_location(record)
+            if location is None or record.get("symbol") not in self._strike_steps:
+                continue
+            if record["symbol"] not in affected:
+                affected[record["symbol"]] = _thaw(current.get(record["symbol"]))
+            if not record.get("tradable", True):
+                continue
+            expiry, strike, option_type = location
+            by_strike = affected[record["symbol"]].setdefault(expiry, {})
+            by_strike.setdefault(strike, {})[option_type] = AtmSelection(
+                symbol=record["trading_symbol"],
+                exchange=record.get("exchange") or "NFO",
+                lot_size=int(record.get("lot_size") or 0),
+                security_id=int(record.get("security_id") or 0),
+                segment=str(record.get("segment") or ""),
+            )
+        if not affected:
+            return
+        index = dict(current)
+        for symbol, by_expiry in affected.items():
+            underlying = _freeze(by_expiry)
+            if underlying.expiries:
+                index[symbol] = underlying
+            else:
+                index.pop(symbol, None)
+        self._state = _build_state(index, self._clock_source())
+        self._logger.info(
+            "Instrument index updated",
+            extra={"added": len(delta.added), "removed": len(delta.removed)},
+        )
+
+    def select(self, index_symbol: str, spot_price: float, side: str, offset: int = 0) -> AtmSelection:
+        with self._metrics.stage("atm_select"):
+            return self._select(index_symbol, spot_price, side, offset)
+
+    def _select(self, index_symbol: str, spot_price: float, side: str, offset: int) -> AtmSelection:
+        ladder = self.ladder(index_symbol, spot_price)
+        selection = ladder.pick("CE" if side == "BUY" else "PE", offset)
+        if selection is not None:
+            return selection
+        self._logger.error(
+            "ATM option not found",
+            extra={"symbol": index_symbol, "strike": ladder.atm_strike, "offset": offset},
+        )
+        raise ValueError("ATM option not found")
+
+    def ladder(self, index_symbol: str, spot_price: float) -> StrikeLadder:
+        state = self._current_state()
+        ladder = state.ladders.get(index_symbol)
+        if ladder is not None and ladder.lower < spot_price < ladder.upper:
+            return ladder
         step = self._strike_steps.get(index_symbol)
         if step is None:
             raise ValueError(f"No strike step configured for {index_symbol}")
-        strike = round(spot_price / step) * step
-        option_type = "CE" if side == "BUY" else "PE"
-        expiry = self._nearest_expiry(index_symbol)
-        for instrument in self._instruments:
-            if (
-                instrument.get("symbol") == index_symbol
-                and instrument.get("expiry") == expiry
-                and float(instrument.get("strike", 0)) == float(strike)
-                and instrument.get("option_type") == option_type
-                and instrument.get("tradable", True)
-            ):
-                return AtmSelection(
-                    symbol=instrument["trading_symbol"],
-                    exchange=instrument.get("exchange", "NFO"),
-                    lot_size=int(instrument.get("lot_size", 0)),
-                )
-        self._logger.error("ATM option not found", extra={"symbol": index_symbol, "strike": strike})
-        raise ValueError("ATM option not found")
-
-    def _nearest_expiry(self, index_symbol: str) -> str:
-        expiries = sorted(
-            {
-                instrument.get("expiry")
-                for instrument in self._instruments
-                if instrument.get("symbol") == index_symbol
-            }
-        )
-        if not expiries:
+        underlying = state.index.get(index_symbol)
+        if underlying is None:
             raise ValueError(f"No expiries found for {index_symbol}")
-        today = datetime.utcnow().date()
-        future_expiries = [e for e in expiries if datetime.fromisoformat(e).date() >= today]
-        if not future_expiries:
-            return expiries[-1]
-        return future_expiries[0]
+        position = state.front[index_symbol]
+        ladder = _build_ladder(
+            underlying.expiries[position],
+            underlying.chains[position],
+            float(round(spot_price / step) * step),
+            float(step),
+            self._ladder_depth,
+        )
+        state.ladders[index_symbol] = ladder
+        if self._on_ladder is not None:
+            self._on_ladder(ladder)
+        return ladder
+
+    def _current_state(self) -> _SelectorState:
+        state = self._state
+        if self._clock_source() < state.rollover_at:
+            return state
+        with self._write_lock:
+            now = self._clock_source()
+            if now >= self._state.rollover_at:
+                self._state = _build_state(self._state.index, now)
+                self._logger.info("Expiry calendar advanced", extra={"date": now.astimezone(IST).date().isoformat()})
+            return self._state
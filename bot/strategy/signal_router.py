@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
+from typing import Any
 
 from bot.strategy.scalping_logic import Signal, TradePlan
 from bot.strategy.strategies import Strategy
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+
+
+EXECUTION_BACKENDS = ("inline", "thread", "process")
+
+PlanHandler = Callable[[str, Signal, TradePlan], Awaitable[None]]
 
 
 @dataclass(frozen=True)
@@ -12,21 +22,167 @@ class SignalContext:
     spot_price: float
 
 
+@dataclass(frozen=True)
+class StrategyExecution:
+    """Where a strategy's ``build_trade`` runs.
+
+    ``inline`` runs on the caller's thread and ignores the timeout. ``thread``
+    and ``process`` run on the router's pools; a process-backed strategy must
+    be picklable and is shipped to each worker once, at pool start.
+    """
+
+    backend: str = "inline"
+    timeout_seconds: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.backend not in EXECUTION_BACKENDS:
+            raise ValueError(f"Unknown execution backend {self.backend}")
+
+
+_INLINE = StrategyExecution()
+
+
+class StrategyTimeout(ValueError):
+    pass
+
+
+_process_strategies: dict[str, Strategy] = {}
+
+
+def _install_strategies(strategies: dict[str, Strategy]) -> None:
+    _process_strategies.update(strategies)
+
+
+def _build_in_process(name: str, signal: Signal, spot_price: float) -> TradePlan:
+    return _process_strategies[name].build_trade(signal, spot_price)
+
+
 class SignalRouter:
     def __init__(
         self,
         allowed_strategies: set[str],
         strategies: dict[str, Strategy],
+        execution: dict[str, StrategyExecution] | None = None,
+        subscriptions: dict[str, list[str]] | None = None,
+        max_workers: int = 4,
+        metrics: LatencyRecorder | None = None,
     ) -> None:
         self._allowed_strategies = allowed_strategies
         self._strategies = strategies
+        self._execution = execution or {}
+        self._subscriptions = subscriptions or {}
+        self._metrics = metrics or get_recorder()
         self._logger = setup_logger(self.__class__.__name__)
+        self._plan_handler: PlanHandler | None = None
+        self._fan_out_tasks: set[asyncio.Task[None]] = set()
+        backends = {name: self._execution_for(name).backend for name in strategies}
+        self._thread_pool = (
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="strategy")
+            if "thread" in backends.values()
+            else None
+        )
+        self._process_pool = (
+            concurrent.futures.ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_install_strategies,
+                initargs=({name: strategies[name] for name, backend in backends.items() if backend == "process"},),
+            )
+            if "process" in backends.values()
+            else None
+        )
+
+    def set_plan_handler(self, handler: PlanHandler) -> None:
+        """Receives plans built by strategies subscribed to another strategy's signals."""
+        self._plan_handler = handler
 
     def route(self, signal: Signal, context: SignalContext) -> TradePlan:
-        if signal.strategy not in self._allowed_strategies:
+        self._resolve(signal.strategy)
+        execution = self._execution_for(signal.strategy)
+        with self._metrics.stage(f"strategy.{signal.strategy}"):
+            if execution.backend == "inline":
+                return self._strategies[signal.strategy].build_trade(signal, context.spot_price)
+            future = self._submit(signal.strategy, execution, signal, context)
+            try:
+                return future.result(timeout=execution.timeout_seconds)
+            except concurrent.futures.TimeoutError as exc:
+                raise self._timed_out(signal.strategy, execution) from exc
+
+    async def route_async(self, signal: Signal, context: SignalContext) -> TradePlan:
+        self._resolve(signal.strategy)
+        for name in self._subscriptions.get(signal.strategy, ()):
+            if name != signal.strategy:
+                task = asyncio.create_task(self._fan_out(name, signal, context))
+                self._fan_out_tasks.add(task)
+                task.add_done_callback(self._fan_out_tasks.discard)
+        return await self._run_async(signal.strategy, signal, context)
+
+    async def route_batch_async(
+        self,
+        signals: list[Signal],
+        contexts: list[SignalContext],
+    ) -> list[TradePlan | ValueError]:
+        results = await asyncio.gather(
+            *(self.route_async(signal, context) for signal, context in zip(signals, contexts)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, ValueError):
+                raise result
+        return list(results)
+
+    def close(self) -> None:
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _execution_for(self, name: str) -> StrategyExecution:
+        return self._execution.get(name, _INLINE)
+
+    def _resolve(self, name: str) -> Strategy:
+        if name not in self._allowed_strategies:
             raise ValueError("Unknown strategy")
-        strategy = self._strategies.get(signal.strategy)
-        if strategy is not None:
-            return strategy.build_trade(signal, context.spot_price)
-        self._logger.error("Strategy not implemented", extra={"strategy": signal.strategy})
-        raise ValueError("Strategy not implemented")
+        strategy = self._strategies.get(name)
+        if strategy is None:
+            self._logger.error("Strategy not implemented", extra={"strategy": name})
+            raise ValueError("Strategy not implemented")
+        return strategy
+
+    async def _run_async(self, name: str, signal: Signal, context: SignalContext) -> TradePlan:
+        execution = self._execution_for(name)
+        with self._metrics.stage(f"strategy.{name}"):
+            if execution.backend == "inline":
+                return self._strategies[name].build_trade(signal, context.spot_price)
+            future = asyncio.wrap_future(self._submit(name, execution, signal, context))
+            try:
+                return await asyncio.wait_for(future, execution.timeout_seconds)
+            except asyncio.TimeoutError as exc:
+                raise self._timed_out(name, execution) from exc
+
+    async def _fan_out(self, name: str, signal: Signal, context: SignalContext) -> None:
+        try:
+            self._resolve(name)
+            plan = await self._run_async(name, signal, context)
+            if self._plan_handler is not None:
+                await self._plan_handler(name, signal, plan)
+        except Exception as exc:  # noqa: BLE001 - a subscriber must not affect other strategies
+            self._logger.error("Subscribed strategy failed", extra={"strategy": name, "error": str(exc)})
+
+    def _submit(
+        self,
+        name: str,
+        execution: StrategyExecution,
+        signal: Signal,
+        context: SignalContext,
+    ) -> concurrent.futures.Future[Any]:
+        if execution.backend == "process":
+            return self._process_pool.submit(_build_in_process, name, signal, context.spot_price)
+        return self._thread_pool.submit(self._strategies[name].build_trade, signal, context.spot_price)
+
+    def _timed_out(self, name: str, execution: StrategyExecution) -> StrategyTimeout:
+        self._metrics.increment("strategy_timeouts")
+        self._logger.error(
+            "Strategy timed out",
+            extra={"strategy": name, "timeout_seconds": execution.timeout_seconds},
+        )
+        return StrategyTimeout(f"Strategy {name} timed out")
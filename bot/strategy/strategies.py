@@ -18,7 +18,8 @@ class ScalpAtmStrategy:
     selector: AtmOptionSelector
     logic: ScalpingLogic
     name: str = "SCALP_ATM"
+    strike_offset: int = 0
 
     def build_trade(self, signal: Signal, spot_price: float) -> TradePlan:
-        selection = self.selector.select(signal.symbol, spot_price, signal.side)
+        selection = self.selector.select(signal.symbol, spot_price, signal.side, self.strike_offset)
         return self.logic.build_trade(signal, selection)
@@ -1,15 +1,200 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
+import queue
+import sys
+import threading
+import traceback
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+_RESERVED_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+_STOP = object()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _BatchedRotatingFileHandler(RotatingFileHandler):
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class QueuedLogWriter:
+    """Background writer behind every logger and ``log_json`` call.
+
+    Callers only enqueue. When the bounded queue is full the overflow policy
+    decides whether the oldest record, the new record, or the caller gives way.
+    """
+
+    def __init__(
+        self,
+        log_path: Path,
+        queue_size: int = 10_000,
+        overflow_policy: str = "drop_oldest",
+        batch_size: int = 256,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy}")
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=queue_size)
+        self._overflow_policy = overflow_policy
+        self._batch_size = batch_size
+        self._file_handler = _BatchedRotatingFileHandler(log_path, maxBytes=5_000_000, backupCount=5)
+        self._file_handler.setFormatter(JsonLinesFormatter())
+        self._json_files: dict[Path, TextIO] = {}
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    def submit(self, item: Any) -> None:
+        if self._overflow_policy == "block":
+            self._queue.put(item)
+            return
+        try:
+            self._queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+        if self._overflow_policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(item)
+                self._dropped += 1
+                return
+            except queue.Full:
+                pass
+        self._dropped += 1
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def close(self) -> None:
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._file_handler.close()
+        for file in self._json_files.values():
+            file.close()
+        self._json_files.clear()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            try:
+                for item in batch:
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, logging.LogRecord):
+                        self._file_handler.handle(item)
+                    else:
+                        self._write_json(*item)
+                self._file_handler.flush_batch()
+                for file in self._json_files.values():
+                    file.flush()
+            except Exception:  # noqa: BLE001 - the writer thread must survive bad records
+                traceback.print_exc(file=sys.stderr)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_json(self, path: Path, payload: dict[str, Any]) -> None:
+        file = self._json_files.get(path)
+        if file is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file = path.open("a", encoding="utf-8")
+            self._json_files[path] = file
+        file.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+
+
+class _QueueingHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            get_log_writer().submit(record)
+        except Exception:  # noqa: BLE001 - logging must never raise into callers
+            self.handleError(record)
+
+
+_writer: QueuedLogWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> QueuedLogWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = QueuedLogWriter(LOG_DIR / "bot.log")
+    return _writer
+
+
+def configure_logging(queue_size: int = 10_000, overflow_policy: str = "drop_oldest", batch_size: int = 256) -> None:
+    global _writer
+    with _writer_lock:
+        previous = _writer
+        _writer = QueuedLogWriter(LOG_DIR / "bot.log", queue_size, overflow_policy, batch_size)
+    if previous is not None:
+        previous.close()
+
+
+def flush_logs() -> None:
+    if _writer is not None:
+        _writer.flush()
+
+
+def _shutdown() -> None:
+    if _writer is not None:
+        _writer.close()
+
+
+atexit.register(_shutdown)
+
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -17,17 +202,9 @@ def setup_logger(name: str) -> logging.Logger:
         return logger
 
     logger.setLevel(logging.INFO)
-    log_path = LOG_DIR / "bot.log"
-    handler = RotatingFileHandler(log_path, maxBytes=5_000_000, backupCount=5)
-    formatter = logging.Formatter(
-        "%(asctime)s %(levelname)s %(name)s %(message)s"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    logger.addHandler(_QueueingHandler())
     return logger
 
 
 def log_json(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as file:
-        file.write(json.dumps(payload, ensure_ascii=False) + "\n")
+    get_log_writer().submit((path, dict(payload)))
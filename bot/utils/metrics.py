@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class LatencyRecorder:
+    def __init__(self, window: int = 2048) -> None:
+        self._window = window
+        self._samples: dict[str, deque[int]] = {}
+        self._totals: dict[str, int] = {}
+        self._counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration_ns: int) -> None:
+        samples = self._samples.get(stage)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(stage, deque(maxlen=self._window))
+        samples.append(duration_ns)
+        self._totals[stage] = self._totals.get(stage, 0) + 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - started)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stages = {name: sorted(samples) for name, samples in self._samples.items()}
+            counters = dict(self._counters)
+        return {
+            "stages": {
+                name: {
+                    "count": self._totals.get(name, len(ordered)),
+                    "p50_ms": _percentile(ordered, 0.50),
+                    "p99_ms": _percentile(ordered, 0.99),
+                    "max_ms": ordered[-1] / 1e6 if ordered else 0.0,
+                }
+                for name, ordered in stages.items()
+            },
+            "counters": counters,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+            self._counters.clear()
+
+
+def _percentile(ordered: list[int], quantile: float) -> float:
+    if not ordered:
+        return 0.0
+    position = min(int(quantile * len(ordered)), len(ordered) - 1)
+    return ordered[position] / 1e6
+
+
+_recorder = LatencyRecorder()
+
+
+def get_recorder() -> LatencyRecorder:
+    return _recorder
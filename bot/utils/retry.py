@@ -1,25 +1,76 @@
 from __future__ import annotations
 
+import random
 import time
 from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import TypeVar
 
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class BackoffPolicy:
+    """Exponential backoff with jitter.
+
+    The n-th retry waits a random time between half and all of
+    ``base_seconds * 2**n`` (capped at ``max_seconds``). A server supplied
+    Retry-After is a floor: the wait is never shorter than it.
+    """
+
+    base_seconds: float = 0.25
+    max_seconds: float = 4.0
+    max_attempts: int = 4
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        ceiling = min(self.max_seconds, self.base_seconds * 2**attempt)
+        jittered = random.uniform(ceiling / 2, ceiling)
+        if retry_after is None:
+            return jittered
+        return retry_after + random.uniform(0, self.base_seconds)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def retry_after_from(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    return parse_retry_after(headers.get("Retry-After"))
+
+
 def retry(
     func: Callable[[], T],
     retries: int = 3,
     delay_seconds: float = 1.0,
 ) -> T:
+    policy = BackoffPolicy(base_seconds=delay_seconds, max_seconds=delay_seconds * 2 ** max(retries - 1, 0))
     last_error: Exception | None = None
-    for _ in range(retries):
+    for attempt in range(retries):
         try:
             return func()
         except Exception as exc:  # noqa: BLE001 - explicit retry policy
             last_error = exc
-            time.sleep(delay_seconds)
+            if attempt + 1 < retries:
+                time.sleep(policy.delay(attempt, retry_after_from(exc)))
     if last_error is None:
         raise RuntimeError("Retry failed without exception")
     raise last_error
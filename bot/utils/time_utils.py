@@ -1,11 +1,26 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
+
+
+IST = timezone(timedelta(hours=5, minutes=30), name="IST")
 
 
 def utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def ist_now() -> datetime:
+    return datetime.now(IST)
+
+
+def ist_today() -> date:
+    return ist_now().date()
+
+
 def parse_timestamp(value: str) -> datetime:
     return datetime.fromisoformat(value)
+
+
+def parse_clock(value: str) -> time:
+    return time.fromisoformat(value)
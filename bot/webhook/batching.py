@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from bot.strategy.scalping_logic import Signal
+
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SignalOutcome:
+    status_code: int
+    body: dict[str, Any] = field(default_factory=dict)
+    detail: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        if self.detail is not None:
+            return {"status_code": self.status_code, "detail": self.detail}
+        return {"status_code": self.status_code, **self.body}
+
+
+def signal_fingerprint(signal: Signal) -> str:
+    return "|".join((signal.strategy, signal.symbol, signal.side, signal.timestamp))
+
+
+class SignalDeduplicator:
+    def __init__(self, window_seconds: float, max_entries: int = 10_000) -> None:
+        self._window_seconds = window_seconds
+        self._max_entries = max_entries
+        self._seen: OrderedDict[str, float] = OrderedDict()
+
+    def is_duplicate(self, key: str) -> bool:
+        now = time.monotonic()
+        while self._seen:
+            oldest_key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at <= self._window_seconds and len(self._seen) <= self._max_entries:
+                break
+            del self._seen[oldest_key]
+        if key in self._seen:
+            return True
+        self._seen[key] = now
+        return False
+
+    def release(self, key: str) -> None:
+        self._seen.pop(key, None)
+
+
+class SignalCoalescer(Generic[T]):
+    """Groups signals that arrive within ``window_seconds`` into one batch call."""
+
+    def __init__(
+        self,
+        window_seconds: float,
+        process: Callable[[list[tuple[Signal, str]]], Awaitable[list[T]]],
+        max_batch: int = 100,
+    ) -> None:
+        self._window_seconds = window_seconds
+        self._process = process
+        self._max_batch = max_batch
+        self._pending: list[tuple[Signal, str, asyncio.Future[T]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def submit(self, signal: Signal, key: str) -> T:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[T] = loop.create_future()
+        self._pending.append((signal, key, future))
+        if len(self._pending) >= self._max_batch:
+            self._schedule_flush(loop)
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_seconds, self._schedule_flush, loop)
+        return await future
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            loop.create_task(self._flush(pending))
+
+    async def _flush(self, pending: list[tuple[Signal, str, asyncio.Future[T]]]) -> None:
+        try:
+            results = await self._process([(signal, key) for signal, key, _ in pending])
+        except Exception as exc:  # noqa: BLE001 - propagated to every waiting request
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
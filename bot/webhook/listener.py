@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, replace
 from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, ConfigDict, field_validator
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, TypeAdapter, ValidationError, field_validator
 
+from bot.core.idempotency import IdempotencyCache
 from bot.core.order_manager import OrderManager
 from bot.core.order_types import OrderRequest
 from bot.core.trading_control import TradingControl
+from bot.market_data.spot_provider import StalePriceError
 from bot.strategy.scalping_logic import Signal, TradePlan
-from bot.strategy.signal_router import SignalRouter, SignalContext
+from bot.strategy.signal_router import SignalContext, SignalRouter, StrategyTimeout
 from bot.utils.logger import setup_logger
+from bot.utils.metrics import LatencyRecorder, get_recorder
+from bot.webhook.batching import SignalCoalescer, SignalDeduplicator, SignalOutcome, signal_fingerprint
 
 
 class WebhookPayload(BaseModel):
@@ -34,14 +42,23 @@ class WebhookPayload(BaseModel):
         return value
 
 
+_BATCH_ADAPTER = TypeAdapter(list[WebhookPayload])
+
+
 def create_app(
     router: SignalRouter,
     order_manager: OrderManager,
     signal_ttl_seconds: int,
     spot_price_provider: callable,
     trading_control: TradingControl,
+    connection_stats_provider: Callable[[], dict[str, Any]] | None = None,
+    metrics: LatencyRecorder | None = None,
+    dedupe_window_seconds: float = 300.0,
+    coalesce_window_ms: float = 0.0,
+    idempotency_cache: IdempotencyCache | None = None,
 ) -> FastAPI:
     logger = setup_logger("Webhook")
+    recorder = metrics or get_recorder()
     app = FastAPI()
 
     @app.get("/control/status")
@@ -61,35 +78,171 @@ def create_app(
         state = trading_control.disable(reason=reason)
         return {"enabled": state.enabled, "updated_at": state.updated_at, "reason": state.reason}
 
+    @app.get("/metrics/connections")
+    def connection_stats() -> dict[str, Any]:
+        if connection_stats_provider is None:
+            return {}
+        return connection_stats_provider()
+
+    @app.get("/metrics")
+    def latency_metrics() -> dict[str, Any]:
+        return recorder.snapshot()
+
+    deduplicator = SignalDeduplicator(dedupe_window_seconds)
+    responses = idempotency_cache if idempotency_cache is not None else IdempotencyCache(ttl_seconds=dedupe_window_seconds)
+
+    async def _process_batch(items: list[tuple[Signal, str]]) -> list[SignalOutcome]:
+        signals = [signal for signal, _ in items]
+        keys = [key for _, key in items]
+        outcomes: list[SignalOutcome | None] = [None] * len(signals)
+        live: list[int] = []
+        contexts: list[SignalContext] = []
+        claimed: list[int] = []
+        for index, signal in enumerate(signals):
+            cached = responses.get(keys[index])
+            if cached is not None:
+                recorder.increment("duplicate_signals")
+                outcomes[index] = SignalOutcome(status_code=200, body=cached)
+                continue
+            if deduplicator.is_duplicate(keys[index]):
+                recorder.increment("duplicate_signals")
+                outcomes[index] = SignalOutcome(status_code=409, detail="Duplicate signal")
+                continue
+            claimed.append(index)
+            with recorder.stage("ttl_check"):
+                timestamp = datetime.fromisoformat(signal.timestamp).replace(tzinfo=timezone.utc)
+                now = datetime.now(timezone.utc)
+                stale = (now - timestamp).total_seconds() > signal_ttl_seconds
+            if stale:
+                outcomes[index] = SignalOutcome(status_code=400, detail="Stale signal")
+                continue
+            with recorder.stage("spot_price"):
+                try:
+                    spot_price = spot_price_provider(signal.symbol, signal.price)
+                except StalePriceError:
+                    outcomes[index] = SignalOutcome(status_code=503, detail="Stale spot price")
+                    continue
+            live.append(index)
+            contexts.append(SignalContext(spot_price=spot_price))
+        routed: list[int] = []
+        routed_plans: list[tuple[Signal, str, TradePlan]] = []
+        if live:
+            with recorder.stage("route"):
+                plans = await router.route_batch_async([signals[index] for index in live], contexts)
+            for index, plan in zip(live, plans):
+                if isinstance(plan, StrategyTimeout):
+                    outcomes[index] = SignalOutcome(status_code=504, detail=str(plan))
+                elif isinstance(plan, Exception):
+                    outcomes[index] = SignalOutcome(status_code=400, detail=str(plan))
+                else:
+                    routed.append(index)
+                    routed_plans.append((signals[index], keys[index], plan))
+        if routed:
+            for index, outcome in zip(routed, await _execute_plans(routed_plans)):
+                outcomes[index] = outcome
+        for index in claimed:
+            # Only in-flight and executed signals stay blocked; a failed one may be retried.
+            if outcomes[index] is None or outcomes[index].status_code != 200:
+                deduplicator.release(keys[index])
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    async def _execute_plans(items: list[tuple[Signal, str, TradePlan]]) -> list[SignalOutcome]:
+        outcomes: list[SignalOutcome | None] = [None] * len(items)
+        with recorder.stage("entry_order"):
+            entries = await order_manager.place_entries_async(
+                [replace(plan.entry, idempotency_key=f"{key}:entry", trade_id=key) for _, key, plan in items]
+            )
+        accepted: list[tuple[int, dict[str, Any]]] = []
+        for position, ((_, _, plan), entry) in enumerate(zip(items, entries)):
+            if entry is None:
+                outcomes[position] = SignalOutcome(status_code=400, detail="Risk checks failed")
+            elif isinstance(entry, BaseException):
+                logger.error("Entry order failed", extra={"symbol": plan.entry.symbol, "error": str(entry)})
+                outcomes[position] = SignalOutcome(status_code=502, detail="Entry order failed")
+            else:
+                accepted.append((position, entry))
+        if accepted:
+            with recorder.stage("bracket_orders"):
+                brackets = await asyncio.gather(
+                    *(
+                        order_manager.place_bracket_async(
+                            _build_stop_loss(items[position][2], items[position][1]),
+                            _build_target(items[position][2], items[position][1])
+                            if items[position][2].target_price is not None
+                            else None,
+                        )
+                        for position, _ in accepted
+                    )
+                )
+            for (position, entry), bracket in zip(accepted, brackets):
+                signal, key, _ = items[position]
+                body = {"entry": entry, "stop_loss": bracket.stop_loss, "target": bracket.target}
+                if not bracket.protected:
+                    body["exit"] = bracket.exit
+                logger.info("Signal executed", extra={"signal": asdict(signal)})
+                responses.put(key, body)
+                outcomes[position] = SignalOutcome(status_code=200, body=body)
+        return [outcome for outcome in outcomes if outcome is not None]
+
+    async def _execute_subscribed(strategy: str, signal: Signal, plan: TradePlan) -> None:
+        key = f"{signal_fingerprint(signal)}:{strategy}"
+        if responses.get(key) is not None:
+            recorder.increment("duplicate_signals")
+            return
+        outcome = (await _execute_plans([(signal, key, plan)]))[0]
+        logger.info(
+            "Subscribed strategy executed",
+            extra={"strategy": strategy, "status_code": outcome.status_code, "detail": outcome.detail},
+        )
+
+    router.set_plan_handler(_execute_subscribed)
+
+    coalescer = (
+        SignalCoalescer(coalesce_window_ms / 1000, _process_batch) if coalesce_window_ms > 0 else None
+    )
+
     @app.post("/signal")
-    def handle_signal(payload: WebhookPayload) -> dict[str, Any]:
-        signal = Signal(**payload.model_dump())
-        timestamp = datetime.fromisoformat(signal.timestamp).replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-        if (now - timestamp).total_seconds() > signal_ttl_seconds:
-            raise HTTPException(status_code=400, detail="Stale signal")
-        spot_price = spot_price_provider(signal.symbol, signal.price)
-        trade_plan = router.route(signal, SignalContext(spot_price=spot_price))
-        entry_response = order_manager.place_order(trade_plan.entry)
-        if entry_response is None:
-            raise HTTPException(status_code=400, detail="Risk checks failed")
-        sl_request = _build_stop_loss(trade_plan)
-        sl_response = order_manager.place_stop_loss(sl_request)
-        target_response = None
-        if trade_plan.target_price is not None:
-            target_request = _build_target(trade_plan)
-            target_response = order_manager.place_order(target_request)
-        logger.info("Signal executed", extra={"signal": payload.model_dump()})
-        return {
-            "entry": entry_response,
-            "stop_loss": sl_response,
-            "target": target_response,
-        }
+    async def handle_signal(request: Request) -> dict[str, Any]:
+        with recorder.stage("signal_total"):
+            with recorder.stage("payload_validation"):
+                payload = _parse_payload(await request.body())
+            signal = Signal(**payload.model_dump())
+            key = request.headers.get("Idempotency-Key") or signal_fingerprint(signal)
+            if coalescer is not None:
+                outcome = await coalescer.submit(signal, key)
+            else:
+                outcome = (await _process_batch([(signal, key)]))[0]
+        if outcome.detail is not None:
+            raise HTTPException(status_code=outcome.status_code, detail=outcome.detail)
+        return outcome.body
+
+    @app.post("/signals/batch")
+    async def handle_signal_batch(request: Request) -> dict[str, Any]:
+        with recorder.stage("batch_total"):
+            with recorder.stage("payload_validation"):
+                payloads = _parse_batch(await request.body())
+            signals = [Signal(**payload.model_dump()) for payload in payloads]
+            outcomes = await _process_batch([(signal, signal_fingerprint(signal)) for signal in signals])
+        return {"results": [outcome.as_dict() for outcome in outcomes]}
 
     return app
 
 
-def _build_stop_loss(trade_plan: TradePlan) -> OrderRequest:
+def _parse_payload(body: bytes) -> WebhookPayload:
+    try:
+        return WebhookPayload.model_validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+
+def _parse_batch(body: bytes) -> list[WebhookPayload]:
+    try:
+        return _BATCH_ADAPTER.validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors(include_url=False)) from exc
+
+
+def _build_stop_loss(trade_plan: TradePlan, signal_key: str | None = None) -> OrderRequest:
     side = "SELL" if trade_plan.entry.side == "BUY" else "BUY"
     return OrderRequest(
         symbol=trade_plan.entry.symbol,
@@ -100,10 +253,12 @@ def _build_stop_loss(trade_plan: TradePlan) -> OrderRequest:
         product_type=trade_plan.entry.product_type,
         price=trade_plan.stop_loss_price,
         order_tag="STOP_LOSS",
+        idempotency_key=f"{signal_key}:stop_loss" if signal_key else None,
+        trade_id=signal_key,
     )
 
 
-def _build_target(trade_plan: TradePlan) -> OrderRequest:
+def _build_target(trade_plan: TradePlan, signal_key: str | None = None) -> OrderRequest:
     side = "SELL" if trade_plan.entry.side == "BUY" else "BUY"
     return OrderRequest(
         symbol=trade_plan.entry.symbol,
@@ -114,4 +269,6 @@ def _build_target(trade_plan: TradePlan) -> OrderRequest:
         product_type=trade_plan.entry.product_type,
         price=trade_plan.target_price,
         order_tag="TARGET",
+        idempotency_key=f"{signal_key}:target" if signal_key else None,
+        trade_id=signal_key,
     )
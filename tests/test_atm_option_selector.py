@@ -3,10 +3,11 @@ from datetime import datetime, timedelta
 import pytest
 
 from bot.strategy.atm_option_selector import AtmOptionSelector
+from bot.utils.time_utils import IST, ist_today
 
 
 def _today_iso():
-    return datetime.utcnow().date().isoformat()
+    return ist_today().isoformat()
 
 
 def test_atm_option_selector_picks_nearest_expiry_and_strike():
@@ -47,3 +48,91 @@ def test_atm_option_selector_raises_when_missing_symbol():
 
     with pytest.raises(ValueError):
         selector.select("NIFTY", spot_price=22010, side="BUY")
+
+
+def _option(expiry, strike, option_type, tradable=True):
+    return {
+        "symbol": "NIFTY",
+        "expiry": expiry,
+        "strike": strike,
+        "option_type": option_type,
+        "trading_symbol": f"NIFTY{expiry}{strike}{option_type}",
+        "lot_size": 50,
+        "exchange": "NFO",
+        "tradable": tradable,
+    }
+
+
+def test_atm_option_selector_skips_past_expiries_and_untradable_contracts():
+    today = ist_today()
+    past = (today - timedelta(days=7)).isoformat()
+    near = (today + timedelta(days=2)).isoformat()
+    far = (today + timedelta(days=9)).isoformat()
+    instruments = [
+        _option(far, 22000, "PE"),
+        _option(past, 22000, "PE"),
+        _option(near, 22000, "PE"),
+        _option(near, 22050, "PE", tradable=False),
+    ]
+    selector = AtmOptionSelector(instruments, {"NIFTY": 50})
+
+    assert selector.select("NIFTY", spot_price=21990, side="SELL").symbol == f"NIFTY{near}22000PE"
+    with pytest.raises(ValueError):
+        selector.select("NIFTY", spot_price=22040, side="SELL")
+
+
+def test_atm_option_selector_load_replaces_index():
+    expiry = _today_iso()
+    selector = AtmOptionSelector([_option(expiry, 22000, "CE")], {"NIFTY": 50})
+
+    selector.load([_option(expiry, 22100, "CE")])
+
+    assert selector.select("NIFTY", spot_price=22110, side="BUY").symbol == f"NIFTY{expiry}22100CE"
+    with pytest.raises(ValueError):
+        selector.select("NIFTY", spot_price=22010, side="BUY")
+
+
+def test_atm_option_selector_picks_otm_and_itm_from_ladder():
+    expiry = _today_iso()
+    instruments = [
+        _option(expiry, strike, option_type)
+        for strike in (21900, 21950, 22000, 22050, 22100)
+        for option_type in ("CE", "PE")
+    ]
+    selector = AtmOptionSelector(instruments, {"NIFTY": 50}, ladder_depth=2)
+
+    ladder = selector.ladder("NIFTY", spot_price=22010)
+
+    assert ladder.atm_strike == 22000
+    assert selector.ladder("NIFTY", spot_price=21980) is ladder
+    assert selector.select("NIFTY", 22010, "BUY", offset=1).symbol == f"NIFTY{expiry}22050CE"
+    assert selector.select("NIFTY", 22010, "SELL", offset=1).symbol == f"NIFTY{expiry}21950PE"
+    assert selector.select("NIFTY", 22010, "BUY", offset=-2).symbol == f"NIFTY{expiry}21900CE"
+    assert selector.ladder("NIFTY", spot_price=22030).atm_strike == 22050
+    with pytest.raises(ValueError):
+        selector.select("NIFTY", 22010, "BUY", offset=3)
+
+
+def test_atm_option_selector_reports_new_ladders():
+    expiry = _today_iso()
+    instruments = [_option(expiry, strike, option_type) for strike in (21950, 22000, 22050) for option_type in ("CE", "PE")]
+    built = []
+    selector = AtmOptionSelector(instruments, {"NIFTY": 50}, ladder_depth=1, on_ladder=built.append)
+
+    selector.ladder("NIFTY", spot_price=22010)
+    selector.ladder("NIFTY", spot_price=21990)
+
+    assert len(built) == 1
+    assert {selection.symbol for selection in built[0].selections()} == {
+        f"NIFTY{expiry}{strike}{option_type}" for strike in (21950, 22000, 22050) for option_type in ("CE", "PE")
+    }
+
+
+def test_atm_option_selector_rolls_expiry_at_midnight_ist():
+    now = [datetime(2026, 2, 26, 23, 59, tzinfo=IST)]
+    instruments = [_option("2026-02-26", 22000, "CE"), _option("2026-03-05", 22000, "CE")]
+    selector = AtmOptionSelector(instruments, {"NIFTY": 50}, clock_source=lambda: now[0])
+
+    assert selector.select("NIFTY", 22000, "BUY").symbol == "NIFTY2026-02-2622000CE"
+    now[0] = datetime(2026, 2, 27, 0, 1, tzinfo=IST)
+    assert selector.select("NIFTY", 22000, "BUY").symbol == "NIFTY2026-03-0522000CE"
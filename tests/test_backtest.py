@@ -0,0 +1,117 @@
+import csv
+
+from bot.backtest.data import load_bars, load_signals
+from bot.backtest.engine import prepare_signals, simulate, sweep
+from bot.core.risk_manager import RiskLimits
+
+
+_INSTRUMENTS = [
+    {
+        "symbol": "NIFTY",
+        "expiry": expiry,
+        "strike": 22000,
+        "option_type": option_type,
+        "trading_symbol": f"NIFTY{expiry}22000{option_type}",
+        "lot_size": 50,
+        "exchange": "NFO",
+        "tradable": True,
+    }
+    for expiry in ("2026-02-03", "2026-02-10")
+    for option_type in ("CE", "PE")
+]
+
+
+def _write_csv(path, rows):
+    with path.open("w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def _bars(symbol, day, closes):
+    rows = []
+    for minute, close in enumerate(closes):
+        open_ = closes[minute - 1] if minute else close
+        rows.append(
+            {
+                "trading_symbol": symbol,
+                "timestamp": f"{day}T04:{minute:02d}:00+00:00",
+                "open": open_,
+                "high": max(open_, close) + 1,
+                "low": min(open_, close) - 1,
+                "close": close,
+            }
+        )
+    return rows
+
+
+def _signal(timestamp, side="BUY"):
+    return {
+        "strategy": "SCALP_ATM",
+        "symbol": "NIFTY",
+        "side": side,
+        "timeframe": "1m",
+        "price": 22010,
+        "timestamp": timestamp,
+    }
+
+
+def _prepared(tmp_path):
+    bars = load_bars(
+        _write_csv(
+            tmp_path / "bars.csv",
+            _bars("NIFTY2026-02-0322000CE", "2026-02-03", [100, 104, 109, 121, 125])
+            + _bars("NIFTY2026-02-0322000PE", "2026-02-03", [100, 96, 90, 84, 80])
+            + _bars("NIFTY2026-02-1022000CE", "2026-02-04", [100, 98, 95, 99, 104]),
+        )
+    )
+    signals = load_signals(
+        _write_csv(
+            tmp_path / "signals.csv",
+            [
+                _signal("2026-02-04T04:00:00+00:00"),
+                _signal("2026-02-03T04:00:00+00:00"),
+                _signal("2026-02-03T04:00:30+00:00", side="SELL"),
+                _signal("2026-02-03T04:01:00+00:00"),
+            ],
+        )
+    )
+    return prepare_signals(signals, _INSTRUMENTS, {"NIFTY": 50}, bars), bars
+
+
+def _limits(max_trades=10):
+    return RiskLimits(max_trades_per_day=max_trades, max_daily_loss=100_000, risk_per_trade_pct=1.0)
+
+
+def test_backtest_exits_on_target_and_time(tmp_path):
+    prepared, bars = _prepared(tmp_path)
+
+    result = simulate(prepared, bars, _limits(), sl_points=15, target_points=20)
+
+    trades = {(trade.timestamp, trade.side): trade for trade in result.trades}
+    buy = trades[("2026-02-03T04:00:00+00:00", "BUY")]
+    sell = trades[("2026-02-03T04:00:30+00:00", "SELL")]
+    rolled = trades[("2026-02-04T04:00:00+00:00", "BUY")]
+    assert (buy.symbol, buy.exit_reason, buy.exit_price, buy.pnl) == ("NIFTY2026-02-0322000CE", "TARGET", 120.0, 1000.0)
+    assert (sell.symbol, sell.entry_price, sell.exit_reason, sell.pnl) == ("NIFTY2026-02-0322000PE", 100.0, "TARGET", 1000.0)
+    assert (rolled.symbol, rolled.exit_reason, rolled.exit_price) == ("NIFTY2026-02-1022000CE", "TIME", 104.0)
+    assert result.rejected == {"Open position exists for symbol": 1}
+
+
+def test_backtest_applies_risk_limits_and_sweeps(tmp_path):
+    prepared, bars = _prepared(tmp_path)
+
+    limited = simulate(prepared, bars, _limits(max_trades=1), sl_points=15, target_points=20)
+    stopped = simulate(prepared, bars, _limits(), sl_points=3, target_points=50)
+    summaries = sweep(prepared, bars, _limits(), [10.0, 15.0], [5.0, 20.0], workers=2)
+
+    assert len(limited.trades) == 2
+    assert limited.rejected["Max trades per day reached"] == 2
+    rolled = next(trade for trade in stopped.trades if trade.timestamp.startswith("2026-02-04"))
+    assert (rolled.exit_reason, rolled.exit_price, rolled.pnl) == ("STOP_LOSS", 97.0, -150.0)
+    assert len(summaries) == 4
+    assert summaries[0]["total_pnl"] >= summaries[-1]["total_pnl"]
+    assert {(summary["sl_points"], summary["target_points"]) for summary in summaries} == {
+        (10.0, 5.0), (10.0, 20.0), (15.0, 5.0), (15.0, 20.0)
+    }
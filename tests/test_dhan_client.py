@@ -0,0 +1,149 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bot.core.dhan_client import AsyncDhanClient, DhanClient, DhanCredentials
+from bot.core.rate_limiter import RateLimitSettings, RequestScheduler
+from bot.utils.metrics import LatencyRecorder
+from bot.utils.retry import BackoffPolicy
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    throttled_posts = 0
+    get_delay = 0.0
+
+    def _reply(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(_StubHandler.get_delay)
+        self._reply([])
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        if _StubHandler.throttled_posts > 0:
+            _StubHandler.throttled_posts -= 1
+            self._reply({"errorCode": "DH-904"}, status=429)
+            return
+        self._reply({"ok": True, "client": self.headers.get("ClientID"), "symbol": payload["symbol"]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubHandler.throttled_posts = 0
+    _StubHandler.get_delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_dhan_client_reuses_pooled_connection(stub_server):
+    client = DhanClient(DhanCredentials(client_id="C1", access_token="T", base_url=stub_server))
+
+    client.get_positions()
+    responses = [client.place_order({"symbol": "OPT"}) for _ in range(3)]
+    stats = client.connection_stats()
+    client.close()
+
+    assert responses[0] == {"ok": True, "client": "C1", "symbol": "OPT"}
+    assert stats["positions"]["new_connections"] == 1
+    assert stats["orders"] == {"requests": 3, "new_connections": 0, "reused_connections": 3}
+
+
+def test_dhan_client_charges_new_connections_to_the_opening_request(stub_server):
+    client = DhanClient(DhanCredentials(client_id="C1", access_token="T", base_url=stub_server))
+    _StubHandler.get_delay = 0.2
+    poller = threading.Thread(target=client.get_positions)
+    poller.start()
+    time.sleep(0.05)
+
+    client.place_order({"symbol": "OPT"})
+    poller.join()
+    stats = client.connection_stats()
+    client.close()
+
+    assert stats["positions"]["new_connections"] == 1
+    assert stats["orders"]["new_connections"] == 1
+
+
+def test_async_dhan_client_reuses_pooled_connection(stub_server):
+    async def _run():
+        client = AsyncDhanClient(DhanCredentials(client_id="C1", access_token="T", base_url=stub_server))
+        first = await client.place_order({"symbol": "OPT"})
+        await asyncio.gather(*(client.get_positions() for _ in range(3)))
+        await client.place_order({"symbol": "OPT"})
+        stats = client.connection_stats()
+        await client.aclose()
+        return first, stats
+
+    first, stats = asyncio.run(_run())
+
+    assert first == {"ok": True, "client": "C1", "symbol": "OPT"}
+    assert stats["orders"]["requests"] == 2
+    assert stats["orders"]["new_connections"] == 1
+
+
+def test_dhan_clients_send_pre_encoded_payloads(stub_server):
+    credentials = DhanCredentials(client_id="C1", access_token="T", base_url=stub_server)
+    client = DhanClient(credentials)
+    response = client.place_order(b'{"symbol":"OPT"}')
+    client.close()
+
+    async def _run():
+        async_client = AsyncDhanClient(credentials)
+        result = await async_client.place_order(b'{"symbol":"OPT"}')
+        await async_client.aclose()
+        return result
+
+    assert response == {"ok": True, "client": "C1", "symbol": "OPT"}
+    assert asyncio.run(_run()) == response
+
+
+def test_async_dhan_client_backs_off_on_rate_limit(stub_server):
+    metrics = LatencyRecorder()
+    _StubHandler.throttled_posts = 2
+
+    async def _run():
+        client = AsyncDhanClient(
+            DhanCredentials(client_id="C1", access_token="T", base_url=stub_server),
+            metrics=metrics,
+            scheduler=RequestScheduler(RateLimitSettings({"orders": 100.0}), metrics=metrics),
+            backoff=BackoffPolicy(base_seconds=0.001),
+        )
+        response = await client.place_order({"symbol": "OPT"})
+        await client.aclose()
+        return response
+
+    assert asyncio.run(_run())["ok"] is True
+    assert metrics.counter("dhan.orders.throttled") == 2
+
+
+def test_dhan_client_gives_up_after_max_attempts(stub_server):
+    _StubHandler.throttled_posts = 5
+    client = DhanClient(
+        DhanCredentials(client_id="C1", access_token="T", base_url=stub_server),
+        backoff=BackoffPolicy(base_seconds=0.001, max_attempts=2),
+    )
+
+    with pytest.raises(Exception, match="429"):
+        client.place_order({"symbol": "OPT"})
+    client.close()
@@ -0,0 +1,44 @@
+from bot.core.idempotency import IdempotencyCache
+from bot.core.state_store import StateStore
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idempotency_cache_expires_and_evicts_least_recent():
+    clock = _Clock()
+    cache = IdempotencyCache(max_entries=2, ttl_seconds=60, clock=clock)
+
+    cache.put("a", {"orderId": "1"})
+    cache.put("b", {"orderId": "2"})
+    assert cache.get("a") == {"orderId": "1"}
+    cache.put("c", {"orderId": "3"})
+
+    assert cache.get("b") is None
+    clock.now += 61
+    assert cache.get("a") is None
+
+
+def test_idempotency_cache_restores_unexpired_entries_from_store(tmp_path):
+    clock = _Clock()
+    store = StateStore(tmp_path / "bot.db")
+    cache = IdempotencyCache(store, "orders", max_entries=2, ttl_seconds=60, clock=clock)
+    cache.put("old", {"orderId": "1"})
+    clock.now += 30
+    cache.put("new", {"orderId": "2"})
+    cache.put("newer", {"orderId": "3"})
+    store.flush()
+
+    clock.now += 45
+    restored = IdempotencyCache(store, "orders", max_entries=2, ttl_seconds=60, clock=clock)
+    store.flush()
+
+    assert restored.get("old") is None
+    assert restored.get("new") == {"orderId": "2"}
+    assert [key for key, _ in store.items("orders")] == ["new", "newer"]
+    assert store.items("signals") == []
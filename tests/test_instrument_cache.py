@@ -0,0 +1,94 @@
+import json
+from datetime import date
+
+from bot.core.instrument_cache import InstrumentCache, InstrumentTable
+from bot.core.state_store import StateStore
+from bot.strategy.atm_option_selector import AtmOptionSelector
+
+
+def _instruments():
+    return [
+        {
+            "symbol": "NIFTY",
+            "expiry": "2099-01-29",
+            "strike": 22000,
+            "option_type": "CE",
+            "trading_symbol": "NIFTY29JAN22000CE",
+            "lot_size": 50,
+            "exchange": "NFO",
+            "tradable": True,
+            "security_id": 35001,
+            "segment": "NSE_FNO",
+        },
+        {
+            "symbol": "RELIANCE",
+            "expiry": None,
+            "strike": 0,
+            "option_type": "",
+            "trading_symbol": "RELIANCE",
+            "lot_size": 1,
+            "exchange": "NSE",
+            "tradable": False,
+            "security_id": 2885,
+            "segment": "NSE_EQ",
+        },
+    ]
+
+
+def test_instrument_cache_round_trips_columnar_file(tmp_path):
+    cache = InstrumentCache(tmp_path / "instruments.bin")
+    cache.save(_instruments())
+
+    table = cache.load()
+
+    assert len(table) == 2
+    assert table.record(0) == {**_instruments()[0], "strike": 22000.0}
+    assert table.record(1)["expiry"] is None
+    assert table.record(1)["tradable"] is False
+    selection = AtmOptionSelector(table, {"NIFTY": 50}).select("NIFTY", spot_price=21990, side="BUY")
+    assert selection.symbol == "NIFTY29JAN22000CE"
+    assert (selection.security_id, selection.segment) == (35001, "NSE_FNO")
+    table.close()
+
+
+def test_instrument_cache_treats_outdated_format_as_stale(tmp_path):
+    cache = InstrumentCache(tmp_path / "instruments.bin")
+    cache.save(_instruments(), trading_date=date(2026, 2, 3))
+    encoded = bytearray((tmp_path / "instruments.bin").read_bytes())
+    encoded[4:6] = (1).to_bytes(2, "little")
+    (tmp_path / "instruments.bin").write_bytes(bytes(encoded))
+
+    assert cache.metadata() is None
+    assert cache.is_stale(date(2026, 2, 3))
+    assert len(cache.load()) == 0
+
+
+def test_instrument_cache_imports_legacy_json_and_exports(tmp_path):
+    legacy_path = tmp_path / "instruments.json"
+    legacy_path.write_text(json.dumps(_instruments()), encoding="utf-8")
+    cache = InstrumentCache(tmp_path / "instruments.bin")
+
+    table = cache.load()
+    assert len(table) == 2
+    table.close()
+
+    export_path = tmp_path / "export.json"
+    cache.export_json(export_path)
+    exported = json.loads(export_path.read_text(encoding="utf-8"))
+    assert [item["trading_symbol"] for item in exported] == ["NIFTY29JAN22000CE", "RELIANCE"]
+
+
+def test_instrument_table_handles_empty_master(tmp_path):
+    assert len(InstrumentCache(tmp_path / "missing.bin").load()) == 0
+    assert len(InstrumentTable.from_records([])) == 0
+
+
+def test_instrument_cache_keeps_metadata_in_state_store(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    cache = InstrumentCache(tmp_path / "instruments.bin", store=store)
+
+    metadata = cache.save(_instruments(), trading_date=date(2026, 2, 3))
+
+    assert not (tmp_path / "instruments.meta.json").exists()
+    assert InstrumentCache(tmp_path / "instruments.bin", store=store).metadata() == metadata
+    assert not cache.is_stale(date(2026, 2, 3))
@@ -0,0 +1,75 @@
+from datetime import date, datetime, time
+
+from bot.core.instrument_cache import InstrumentCache
+from bot.core.instrument_refresher import InstrumentRefresher
+from bot.strategy.atm_option_selector import AtmOptionSelector
+from bot.utils.time_utils import IST
+
+
+def _option(strike, expiry="2099-01-29"):
+    return {
+        "symbol": "NIFTY",
+        "expiry": expiry,
+        "strike": strike,
+        "option_type": "CE",
+        "trading_symbol": f"NIFTY{expiry}{strike}CE",
+        "lot_size": 50,
+        "exchange": "NFO",
+        "tradable": True,
+    }
+
+
+class _FakeClient:
+    def __init__(self, instruments):
+        self.instruments = instruments
+        self.calls = 0
+
+    def get_instruments(self):
+        self.calls += 1
+        return list(self.instruments)
+
+
+def _refresher(tmp_path, client, selector):
+    cache = InstrumentCache(tmp_path / "instruments.bin")
+    return cache, InstrumentRefresher(client, cache, selector, refresh_time=time(8, 45))
+
+
+def test_refresher_uses_previous_trading_date_before_refresh_time(tmp_path):
+    _, refresher = _refresher(tmp_path, _FakeClient([]), AtmOptionSelector([], {"NIFTY": 50}))
+
+    assert refresher.expected_trading_date(datetime(2026, 2, 3, 8, 0, tzinfo=IST)) == date(2026, 2, 2)
+    assert refresher.expected_trading_date(datetime(2026, 2, 3, 9, 0, tzinfo=IST)) == date(2026, 2, 3)
+
+
+def test_refresher_applies_only_changed_contracts_to_selector(tmp_path):
+    client = _FakeClient([_option(22000), _option(22050)])
+    selector = AtmOptionSelector([], {"NIFTY": 50})
+    cache, refresher = _refresher(tmp_path, client, selector)
+    morning = datetime(2026, 2, 3, 9, 0, tzinfo=IST)
+
+    assert refresher.refresh_if_stale(morning) is True
+    assert selector.select("NIFTY", spot_price=22040, side="BUY").symbol == "NIFTY2099-01-2922050CE"
+    assert refresher.refresh_if_stale(morning) is False
+    assert client.calls == 1
+
+    client.instruments = [_option(22000), _option(22100)]
+    delta = refresher.refresh(date(2026, 2, 4))
+
+    assert [record["strike"] for record in delta.added] == [22100.0]
+    assert [record["strike"] for record in delta.removed] == [22050.0]
+    assert selector.select("NIFTY", spot_price=22090, side="BUY").symbol == "NIFTY2099-01-2922100CE"
+    assert selector.select("NIFTY", spot_price=21990, side="BUY").symbol == "NIFTY2099-01-2922000CE"
+    assert cache.metadata().trading_date == "2026-02-04"
+
+
+def test_refresher_only_restamps_unchanged_master(tmp_path):
+    client = _FakeClient([_option(22000)])
+    cache, refresher = _refresher(tmp_path, client, AtmOptionSelector([], {"NIFTY": 50}))
+    refresher.refresh(date(2026, 2, 3))
+    content_hash = cache.metadata().content_hash
+
+    delta = refresher.refresh(date(2026, 2, 4))
+
+    assert not delta
+    assert cache.metadata().trading_date == "2026-02-04"
+    assert cache.metadata().content_hash == content_hash
@@ -0,0 +1,44 @@
+import json
+import logging
+
+from bot.utils.logger import JsonLinesFormatter, QueuedLogWriter
+
+
+def _record(message, **extra):
+    record = logging.makeLogRecord({"name": "Test", "levelname": "INFO", "levelno": logging.INFO, "msg": message})
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_lines_formatter_serializes_extra_fields():
+    line = JsonLinesFormatter().format(_record("Placing order", payload={"symbol": "OPT", "quantity": 50}))
+
+    body = json.loads(line)
+    assert body["message"] == "Placing order"
+    assert body["logger"] == "Test"
+    assert body["payload"] == {"symbol": "OPT", "quantity": 50}
+
+
+def test_queued_log_writer_writes_records_and_json_lines(tmp_path):
+    writer = QueuedLogWriter(tmp_path / "bot.log")
+
+    writer.submit(_record("Signal executed", symbol="NIFTY"))
+    writer.submit((tmp_path / "trades.jsonl", {"symbol": "NIFTY"}))
+    writer.submit((tmp_path / "trades.jsonl", {"symbol": "BANKNIFTY"}))
+    writer.flush()
+
+    log_lines = (tmp_path / "bot.log").read_text(encoding="utf-8").splitlines()
+    trade_lines = (tmp_path / "trades.jsonl").read_text(encoding="utf-8").splitlines()
+    writer.close()
+    assert json.loads(log_lines[0])["symbol"] == "NIFTY"
+    assert [json.loads(line)["symbol"] for line in trade_lines] == ["NIFTY", "BANKNIFTY"]
+
+
+def test_queued_log_writer_drops_newest_when_full(tmp_path):
+    writer = QueuedLogWriter(tmp_path / "bot.log", queue_size=1, overflow_policy="drop_newest")
+    writer.close()
+
+    writer.submit(_record("kept"))
+    writer.submit(_record("dropped"))
+
+    assert writer.dropped == 1
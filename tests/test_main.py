@@ -0,0 +1,36 @@
+from bot.core.instrument_cache import InstrumentTable
+from bot.core.order_types import OrderRequest
+from bot.core.paper_broker import PaperBroker
+from bot.core.security_ids import SecurityIdMap
+from bot.main import paper_watchlist
+from bot.market_data.feeds import DhanLtpPollingFeed
+from bot.utils.metrics import LatencyRecorder
+
+
+def test_paper_orders_fill_from_the_polled_option_price():
+    class _FakeClient:
+        def get_ltp(self, instruments):
+            quotes = {"IDX_I": {"13": 22001.0}}
+            if "NSE_FNO" in instruments:
+                quotes["NSE_FNO"] = {"35001": 101.0}
+            return quotes
+
+    broker = PaperBroker(metrics=LatencyRecorder())
+    security_ids = SecurityIdMap(
+        InstrumentTable.from_records([{"trading_symbol": "NIFTY26FEB22000CE", "exchange": "NFO", "security_id": 35001}])
+    )
+    feed = DhanLtpPollingFeed(_FakeClient(), {"NIFTY": 13}, watchlist=paper_watchlist(broker, security_ids))
+    broker.submit(
+        OrderRequest(
+            symbol="NIFTY26FEB22000CE",
+            exchange="NFO",
+            side="BUY",
+            quantity=50,
+            order_type="MARKET",
+            product_type="INTRADAY",
+        )
+    )
+
+    feed.poll_once(broker.on_tick)
+
+    assert broker.position("NIFTY26FEB22000CE") == (50, 101.0)
@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from bot.market_data.feeds import DhanLtpPollingFeed, ReplayFeed
+from bot.market_data.ltp_table import LtpTable
+from bot.market_data.spot_provider import SpotPriceProvider, StalePriceError
+from bot.utils.metrics import LatencyRecorder
+
+
+def test_replay_feed_publishes_latest_price_to_table():
+    table = LtpTable()
+    feed = ReplayFeed([(0.0, "NIFTY", 22000.0), (0.0, "BANKNIFTY", 48000.0), (0.0, "NIFTY", 22015.5)], speed=0)
+
+    feed.start(table.update)
+    feed.join(timeout=1)
+
+    assert table.get("NIFTY").price == 22015.5
+    assert sorted(table.symbols()) == ["BANKNIFTY", "NIFTY"]
+
+
+def test_spot_price_provider_guards_against_stale_prices():
+    table = LtpTable()
+    metrics = LatencyRecorder()
+    provider = SpotPriceProvider(table, max_age_seconds=5, metrics=metrics)
+    table.update("NIFTY", 22010.0)
+    table.update("BANKNIFTY", 48000.0, received_at=time.monotonic() - 10)
+
+    assert provider("NIFTY", 21000.0) == 22010.0
+    with pytest.raises(StalePriceError):
+        provider("BANKNIFTY", 47000.0)
+    with pytest.raises(StalePriceError):
+        provider("FINNIFTY", 21000.0)
+    assert metrics.counter("spot_price_stale") == 2
+
+
+def test_spot_price_provider_can_fall_back_to_signal_price():
+    provider = SpotPriceProvider(LtpTable(), max_age_seconds=5, fallback_to_signal_price=True, metrics=LatencyRecorder())
+
+    assert provider("NIFTY", 21990.0) == 21990.0
+
+
+def test_dhan_ltp_polling_feed_maps_security_ids_to_symbols():
+    class _FakeClient:
+        def get_ltp(self, instruments):
+            assert instruments == {"IDX_I": [13, 25]}
+            return {"IDX_I": {"13": 22001.0, "25": 48002.0}}
+
+    table = LtpTable()
+    DhanLtpPollingFeed(_FakeClient(), {"NIFTY": 13, "BANKNIFTY": 25}).poll_once(table.update)
+
+    assert table.get("NIFTY").price == 22001.0
+    assert table.get("BANKNIFTY").price == 48002.0
+
+
+def test_dhan_ltp_polling_feed_quotes_watchlist_instruments():
+    class _FakeClient:
+        def get_ltp(self, instruments):
+            assert instruments == {"IDX_I": [13], "NSE_FNO": [35001]}
+            return {"IDX_I": {"13": 22001.0}, "NSE_FNO": {"35001": 101.5}}
+
+    table = LtpTable()
+    feed = DhanLtpPollingFeed(_FakeClient(), {"NIFTY": 13}, watchlist=lambda: [("NIFTY26FEB22000CE", "NSE_FNO", 35001)])
+
+    feed.poll_once(table.update)
+
+    assert table.get("NIFTY26FEB22000CE").price == 101.5
@@ -0,0 +1,26 @@
+from bot.utils.metrics import LatencyRecorder
+
+
+def test_latency_recorder_reports_rolling_percentiles():
+    recorder = LatencyRecorder(window=100)
+    for value in range(1, 201):
+        recorder.record("route", value * 1_000_000)
+    recorder.increment("duplicates")
+
+    snapshot = recorder.snapshot()
+
+    route = snapshot["stages"]["route"]
+    assert route["count"] == 200
+    assert route["p50_ms"] == 151.0
+    assert route["p99_ms"] == 200.0
+    assert route["max_ms"] == 200.0
+    assert snapshot["counters"] == {"duplicates": 1}
+
+
+def test_latency_recorder_stage_context_records_duration():
+    recorder = LatencyRecorder()
+
+    with recorder.stage("select"):
+        pass
+
+    assert recorder.snapshot()["stages"]["select"]["count"] == 1
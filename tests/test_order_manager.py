@@ -0,0 +1,225 @@
+import asyncio
+import json
+from dataclasses import replace
+
+from bot.core.idempotency import IdempotencyCache
+from bot.core.state_store import StateStore
+from bot.core.order_manager import OrderManager
+from bot.core.order_templates import OrderTemplateCache
+from bot.core.order_types import OrderRequest
+from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.strategy.atm_option_selector import AtmSelection
+from bot.utils.metrics import LatencyRecorder
+
+
+class _FakeRiskManager:
+    def __init__(self, allow=True):
+        self.allow = allow
+        self.recorded = []
+
+    def reserve_batch(self, requests):
+        return [self.allow for _ in requests]
+
+    def record_trade(self, request, response):
+        self.recorded.append((request.order_tag, response))
+
+    def release(self, request):
+        pass
+
+
+class _FakeTradingControl:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+
+    def status(self):
+        return type("State", (), {"enabled": self.enabled})()
+
+
+class _FakeAsyncClient:
+    def __init__(self):
+        self.payloads = []
+
+    async def place_order(self, payload, priority=None):
+        self.payloads.append(json.loads(payload))
+        await asyncio.sleep(0)
+        return {"orderId": str(len(self.payloads)), "orderStatus": "TRANSIT"}
+
+
+def _request(order_tag=None, order_type="MARKET", price=None, symbol="NIFTY26FEB22000CE"):
+    return OrderRequest(
+        symbol=symbol,
+        exchange="NFO",
+        side="BUY",
+        quantity=50,
+        order_type=order_type,
+        product_type="INTRADAY",
+        price=price,
+        order_tag=order_tag,
+    )
+
+
+def test_order_manager_async_live_order_uses_async_client():
+    client = _FakeAsyncClient()
+    risk = _FakeRiskManager()
+    manager = OrderManager(None, risk, _FakeTradingControl(), execution_mode="live", async_client=client)
+
+    response = asyncio.run(manager.place_order_async(_request()))
+
+    assert response == {"orderId": "1", "orderStatus": "TRANSIT"}
+    assert client.payloads[0]["symbol"] == "NIFTY26FEB22000CE"
+    assert risk.recorded == [(None, response)]
+
+
+def test_order_manager_renders_orders_from_injected_template_cache():
+    metrics = LatencyRecorder()
+    templates = OrderTemplateCache(metrics=metrics)
+    client = _FakeAsyncClient()
+    manager = OrderManager(
+        None, _FakeRiskManager(), _FakeTradingControl(), execution_mode="live", async_client=client, order_templates=templates
+    )
+    templates.warm([AtmSelection(symbol="NIFTY26FEB22000CE", exchange="NFO", lot_size=50, security_id=35001, segment="NSE_FNO")])
+
+    asyncio.run(manager.place_order_async(_request()))
+
+    assert metrics.counter("order_template_miss") == 0
+    assert client.payloads[0]["securityId"] == "35001"
+
+
+def test_order_manager_async_blocks_entries_when_trading_disabled():
+    manager = OrderManager(None, _FakeRiskManager(), _FakeTradingControl(enabled=False))
+
+    assert asyncio.run(manager.place_order_async(_request())) is None
+    assert asyncio.run(manager.place_order_async(_request(order_tag="EXIT")))["mode"] == "paper"
+
+
+class _BracketClient:
+    def __init__(self, fail_tags=()):
+        self.fail_tags = set(fail_tags)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.placed = []
+        self.cancelled = []
+
+    async def place_order(self, payload, priority=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        payload = json.loads(payload)
+        tag = "SL" if payload["order_type"] == "SL-M" else payload["order_type"]
+        if tag in self.fail_tags:
+            raise RuntimeError(f"{tag} rejected")
+        self.placed.append(tag)
+        return {"orderId": tag}
+
+    async def cancel_order(self, order_id):
+        self.cancelled.append(order_id)
+        return {"orderId": order_id, "orderStatus": "CANCELLED"}
+
+
+def _bracket(client):
+    manager = OrderManager(None, _FakeRiskManager(), _FakeTradingControl(), execution_mode="live", async_client=client)
+    stop_loss = _request(order_tag="STOP_LOSS", order_type="SL-M", price=100.0)
+    target = _request(order_tag="TARGET", order_type="LIMIT", price=130.0)
+    return asyncio.run(manager.place_bracket_async(stop_loss, target))
+
+
+def test_order_manager_places_bracket_legs_concurrently():
+    client = _BracketClient()
+
+    result = _bracket(client)
+
+    assert client.max_in_flight == 2
+    assert result.protected
+    assert result.stop_loss == {"orderId": "SL"}
+    assert result.target == {"orderId": "LIMIT"}
+
+
+def test_order_manager_flattens_when_stop_loss_leg_fails():
+    client = _BracketClient(fail_tags={"SL"})
+
+    result = _bracket(client)
+
+    assert not result.protected
+    assert client.cancelled == ["LIMIT"]
+    assert result.exit == {"orderId": "MARKET"}
+
+
+def test_order_manager_keeps_stop_loss_when_target_leg_fails():
+    client = _BracketClient(fail_tags={"LIMIT"})
+
+    result = _bracket(client)
+
+    assert result.protected
+    assert result.target is None
+    assert client.cancelled == []
+
+
+def test_order_manager_replays_duplicate_idempotency_key(tmp_path):
+    client = _FakeAsyncClient()
+    risk = _FakeRiskManager()
+    metrics = LatencyRecorder()
+    cache = IdempotencyCache(StateStore(tmp_path / "bot.db"))
+    manager = OrderManager(
+        None,
+        risk,
+        _FakeTradingControl(),
+        execution_mode="live",
+        async_client=client,
+        metrics=metrics,
+        idempotency_cache=cache,
+    )
+    request = replace(_request(), idempotency_key="signal-1:entry")
+
+    first = asyncio.run(manager.place_order_async(request))
+    risk.allow = False
+    retried = asyncio.run(manager.place_entries_async([request, _request()]))
+
+    assert retried == [first, None]
+    assert len(client.payloads) == 1
+    assert len(risk.recorded) == 1
+    assert metrics.counter("duplicate_orders") == 1
+
+
+class _NoPositions:
+    def has_open_position(self, symbol):
+        return False
+
+
+def _last_trade_of_the_day(tmp_path):
+    limits = RiskLimits(max_trades_per_day=2, max_daily_loss=1000, risk_per_trade_pct=100.0)
+    risk = RiskManager(limits, StateStore(tmp_path / "bot.db"), _NoPositions())
+    risk.record_trade(_request(symbol="BANKNIFTY26FEB48000CE"), {"ok": True})
+    return risk
+
+
+def test_order_manager_concurrent_entries_cannot_share_last_trade(tmp_path):
+    client = _FakeAsyncClient()
+    risk = _last_trade_of_the_day(tmp_path)
+    manager = OrderManager(None, risk, _FakeTradingControl(), execution_mode="live", async_client=client)
+
+    async def _signals():
+        return await asyncio.gather(
+            manager.place_order_async(_request(symbol="NIFTY26FEB22000CE")),
+            manager.place_order_async(_request(symbol="NIFTY26FEB22000PE")),
+        )
+
+    responses = asyncio.run(_signals())
+
+    assert sum(response is not None for response in responses) == 1
+    assert len(client.payloads) == 1
+    assert risk.snapshot()["trades"] == 2
+
+
+def test_order_manager_failed_entry_hands_back_its_trade(tmp_path):
+    class _DownClient:
+        async def place_order(self, payload, priority=None):
+            raise ConnectionError("broker down")
+
+    risk = _last_trade_of_the_day(tmp_path)
+    manager = OrderManager(None, risk, _FakeTradingControl(), execution_mode="live", async_client=_DownClient())
+
+    failed = asyncio.run(manager.place_entries_async([_request()]))
+
+    assert isinstance(failed[0], ConnectionError)
+    assert risk.validate_order(_request()) is True
@@ -0,0 +1,188 @@
+import asyncio
+import json
+
+from bot.core.order_manager import OrderManager
+from bot.core.order_registry import OrderRegistry
+from bot.core.order_types import OrderRequest
+from bot.core.paper_broker import PaperBroker
+from bot.utils.metrics import LatencyRecorder
+
+
+def _request(order_tag=None, order_type="MARKET", price=None, side="BUY", trade_id="signal-1"):
+    return OrderRequest(
+        symbol="NIFTY26FEB22000CE",
+        exchange="NFO",
+        side=side,
+        quantity=50,
+        order_type=order_type,
+        product_type="INTRADAY",
+        price=price,
+        reference_price=100.0,
+        order_tag=order_tag,
+        trade_id=trade_id,
+    )
+
+
+class _OrderBook:
+    def __init__(self):
+        self.rows = {}
+        self.calls = 0
+
+    def set(self, order_id, status, filled=0, price=None):
+        self.rows[order_id] = {"orderId": order_id, "orderStatus": status, "filledQty": filled, "averageTradedPrice": price}
+
+    def __call__(self):
+        self.calls += 1
+        return list(self.rows.values())
+
+
+def test_order_registry_reconciles_open_orders_from_one_book_call():
+    book = _OrderBook()
+    registry = OrderRegistry(book)
+    seen = []
+    filled = []
+    registry.subscribe(lambda event: seen.append((event.kind, event.order.order_id)))
+    registry.subscribe(lambda event: filled.append(event.order.average_price) if event.kind == "FILLED" else None)
+    registry.track(_request(), {"orderId": "1", "orderStatus": "TRANSIT"})
+    registry.track(_request("STOP_LOSS", "SL-M", 90.0, "SELL"), {"orderId": "2", "orderStatus": "PENDING"})
+    registry.track(_request("TARGET", "LIMIT", 120.0, "SELL"), {"orderId": "3", "orderStatus": "PENDING"})
+
+    assert registry.has_pending_entry("NIFTY26FEB22000CE")
+    assert registry.pending_exposure() == {"NIFTY26FEB22000CE": 5000.0}
+
+    book.set("1", "TRADED", 50, 101.0)
+    book.set("2", "PENDING")
+    book.set("3", "REJECTED")
+    registry.poll_once()
+    registry.poll_once()
+
+    assert book.calls == 2
+    assert seen == [("FILLED", "1"), ("REJECTED", "3")]
+    assert not registry.has_pending_entry("NIFTY26FEB22000CE")
+    assert filled == [101.0]
+    assert registry.get("1") is None
+    assert [order.order_id for order in registry.open_orders()] == ["2"]
+    assert [order.order_id for order in registry.orders_for("signal-1")] == ["2"]
+
+
+def test_order_registry_skips_broker_when_nothing_is_open():
+    book = _OrderBook()
+    registry = OrderRegistry(book)
+    registry.track(_request(), {"orderId": "1", "orderStatus": "TRADED"})
+    registry.track(_request(), {"ok": True, "mode": "paper"})
+
+    assert registry.poll_once() == []
+    assert book.calls == 0
+
+
+def test_order_registry_releases_filled_paper_entry():
+    broker = PaperBroker(metrics=LatencyRecorder())
+    registry = OrderRegistry(broker.order_book)
+    registry.track(_request(), broker.submit(_request()))
+
+    assert registry.has_pending_entry("NIFTY26FEB22000CE")
+    broker.on_tick("NIFTY26FEB22000CE", 101.0)
+    registry.poll_once()
+
+    assert not registry.has_pending_entry("NIFTY26FEB22000CE")
+    assert registry.open_orders() == []
+
+
+class _CancellingClient:
+    def __init__(self):
+        self.cancelled = []
+
+    def cancel_order(self, order_id, priority=None):
+        self.cancelled.append(order_id)
+        return {"orderId": order_id, "orderStatus": "CANCELLED"}
+
+
+class _AsyncClient:
+    async def place_order(self, payload, priority=None):
+        return {"orderId": json.loads(payload)["order_type"], "orderStatus": "PENDING"}
+
+
+class _Risk:
+    def reserve_batch(self, requests):
+        return [True for _ in requests]
+
+    def record_trade(self, request, response):
+        pass
+
+
+class _Control:
+    def status(self):
+        return type("State", (), {"enabled": True})()
+
+
+def _live_manager(registry, client):
+    return OrderManager(
+        client,
+        _Risk(),
+        _Control(),
+        execution_mode="live",
+        async_client=_AsyncClient(),
+        order_registry=registry,
+    )
+
+
+def test_order_manager_cancels_sibling_leg_when_target_fills():
+    book = _OrderBook()
+    registry = OrderRegistry(book)
+    client = _CancellingClient()
+    manager = _live_manager(registry, client)
+    asyncio.run(
+        manager.place_bracket_async(
+            _request("STOP_LOSS", "SL-M", 90.0, "SELL"),
+            _request("TARGET", "LIMIT", 120.0, "SELL"),
+        )
+    )
+
+    book.set("SL-M", "PENDING")
+    book.set("LIMIT", "TRADED", 50, 120.0)
+    registry.poll_once()
+
+    assert client.cancelled == ["SL-M"]
+
+
+def test_order_manager_cancels_bracket_when_entry_is_rejected():
+    book = _OrderBook()
+    registry = OrderRegistry(book)
+    client = _CancellingClient()
+    manager = _live_manager(registry, client)
+
+    async def _place():
+        await manager.place_entries_async([_request()])
+        await manager.place_bracket_async(
+            _request("STOP_LOSS", "SL-M", 90.0, "SELL"),
+            _request("TARGET", "LIMIT", 120.0, "SELL"),
+        )
+
+    asyncio.run(_place())
+
+    book.set("MARKET", "REJECTED")
+    book.set("SL-M", "PENDING")
+    book.set("LIMIT", "PENDING")
+    registry.poll_once()
+
+    assert sorted(client.cancelled) == ["LIMIT", "SL-M"]
+    assert not registry.has_pending_entry("NIFTY26FEB22000CE")
+
+
+def test_order_manager_keeps_bracket_when_partly_filled_entry_is_cancelled():
+    book = _OrderBook()
+    registry = OrderRegistry(book)
+    client = _CancellingClient()
+    manager = _live_manager(registry, client)
+
+    async def _place():
+        await manager.place_entries_async([_request()])
+        await manager.place_stop_loss_async(_request("STOP_LOSS", "SL-M", 90.0, "SELL"))
+
+    asyncio.run(_place())
+
+    book.set("MARKET", "CANCELLED", 25, 100.0)
+    book.set("SL-M", "PENDING")
+    registry.poll_once()
+
+    assert client.cancelled == []
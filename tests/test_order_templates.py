@@ -0,0 +1,83 @@
+import json
+
+from bot.core.instrument_cache import InstrumentDelta, InstrumentTable
+from bot.core.order_templates import OrderTemplateCache
+from bot.core.order_types import OrderRequest
+from bot.core.security_ids import SecurityIdMap
+from bot.strategy.atm_option_selector import AtmSelection
+from bot.utils.metrics import LatencyRecorder
+
+
+def _request(symbol="NIFTY26FEB22000CE", order_type="MARKET", price=None):
+    return OrderRequest(
+        symbol=symbol,
+        exchange="NFO",
+        side="SELL",
+        quantity=75,
+        order_type=order_type,
+        product_type="INTRADAY",
+        price=price,
+    )
+
+
+def test_order_template_payload_matches_full_encoding():
+    cache = OrderTemplateCache()
+    cache.warm([AtmSelection(symbol="NIFTY26FEB22000CE", exchange="NFO", lot_size=75)])
+
+    payload = cache.payload(_request(order_type="SL-M", price=101.5))
+
+    assert json.loads(payload) == {
+        "symbol": "NIFTY26FEB22000CE",
+        "exchange": "NFO",
+        "product_type": "INTRADAY",
+        "side": "SELL",
+        "quantity": 75,
+        "order_type": "SL-M",
+        "price": 101.5,
+    }
+
+
+def test_order_template_cache_counts_misses_once_per_contract():
+    metrics = LatencyRecorder()
+    cache = OrderTemplateCache(metrics=metrics)
+    cache.warm([AtmSelection(symbol="NIFTY26FEB22000CE", exchange="NFO", lot_size=75)])
+
+    cache.payload(_request())
+    cache.payload(_request(symbol="NIFTY26FEB22050CE"))
+    cache.payload(_request(symbol="NIFTY26FEB22050CE"))
+
+    assert metrics.counter("order_template_miss") == 1
+    assert len(cache) == 2
+
+
+def test_order_template_carries_dhan_security_id():
+    security_ids = SecurityIdMap(
+        InstrumentTable.from_records([{"trading_symbol": "NIFTY26FEB22050CE", "exchange": "NFO", "security_id": 35002}])
+    )
+    cache = OrderTemplateCache(security_ids=security_ids)
+    cache.warm(
+        [AtmSelection(symbol="NIFTY26FEB22000CE", exchange="NFO", lot_size=75, security_id=35001, segment="NSE_FNO")]
+    )
+
+    warmed = json.loads(cache.payload(_request()))
+    resolved = json.loads(cache.payload(_request(symbol="NIFTY26FEB22050CE")))
+
+    assert (warmed["securityId"], warmed["exchangeSegment"]) == ("35001", "NSE_FNO")
+    assert (resolved["securityId"], resolved["exchangeSegment"]) == ("35002", "NSE_FNO")
+
+
+def test_order_template_resolves_contract_added_by_refresh():
+    security_ids = SecurityIdMap(InstrumentTable.from_records([]))
+    cache = OrderTemplateCache(security_ids=security_ids)
+
+    before = json.loads(cache.payload(_request()))
+    security_ids.apply_delta(
+        InstrumentDelta(
+            added=[{"trading_symbol": "NIFTY26FEB22000CE", "security_id": 35001, "segment": "NSE_FNO"}],
+            removed=[],
+        )
+    )
+    after = json.loads(cache.payload(_request()))
+
+    assert "securityId" not in before
+    assert after["securityId"] == "35001"
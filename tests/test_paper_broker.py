@@ -0,0 +1,161 @@
+import asyncio
+
+from bot.core.order_manager import OrderManager
+from bot.core.order_registry import OrderRegistry
+from bot.core.order_types import OrderRequest
+from bot.core.paper_broker import PaperBroker, PaperExecutionSettings
+from bot.core.position_manager import PositionManager
+from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.core.state_store import StateStore
+from bot.utils.metrics import LatencyRecorder
+
+
+def _request(side="BUY", order_type="MARKET", price=None, order_tag=None, symbol="NIFTY26FEB22000CE"):
+    return OrderRequest(
+        symbol=symbol,
+        exchange="NFO",
+        side=side,
+        quantity=50,
+        order_type=order_type,
+        product_type="INTRADAY",
+        price=price,
+        order_tag=order_tag,
+    )
+
+
+def _bracket(broker, stop=90.0, target=120.0, symbol="NIFTY26FEB22000CE"):
+    entry = broker.submit(_request(symbol=symbol))
+    stop_loss = broker.submit(_request("SELL", "SL-M", stop, "STOP_LOSS", symbol))
+    take_profit = broker.submit(_request("SELL", "LIMIT", target, "TARGET", symbol))
+    return entry, stop_loss, take_profit
+
+
+def test_paper_broker_waits_for_latency_and_applies_slippage():
+    now = [0.0]
+    broker = PaperBroker(PaperExecutionSettings(latency_ms=50, slippage_points=0.5), LatencyRecorder(), lambda: now[0])
+    broker.submit(_request())
+
+    assert broker.on_tick("NIFTY26FEB22000CE", 100.0) == []
+    now[0] = 0.05
+    fills = broker.on_tick("NIFTY26FEB22000CE", 101.0)
+
+    assert [(fill.price, fill.pnl) for fill in fills] == [(101.5, None)]
+    assert broker.position("NIFTY26FEB22000CE") == (50, 101.5)
+
+
+def test_paper_broker_target_fill_cancels_stop_loss():
+    broker = PaperBroker(metrics=LatencyRecorder())
+    _, stop_loss, _ = _bracket(broker)
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+
+    fills = broker.on_tick("NIFTY26FEB22000CE", 125.0)
+
+    assert [(fill.request.order_tag, fill.price, fill.pnl) for fill in fills] == [("TARGET", 125.0, 1250.0)]
+    assert broker.open_orders() == 0
+    assert broker.on_tick("NIFTY26FEB22000CE", 80.0) == []
+    assert broker.cancel(stop_loss["orderId"]) is False
+
+
+def test_paper_broker_gapped_stop_fills_at_tick_price():
+    broker = PaperBroker(metrics=LatencyRecorder())
+    _bracket(broker)
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+
+    fills = broker.on_tick("NIFTY26FEB22000CE", 85.0)
+
+    assert [(fill.request.order_tag, fill.price, fill.pnl) for fill in fills] == [("STOP_LOSS", 85.0, -750.0)]
+    assert broker.position("NIFTY26FEB22000CE") == (0, 0.0)
+
+
+def test_paper_broker_fills_only_triggered_orders_from_a_deep_book():
+    broker = PaperBroker(metrics=LatencyRecorder())
+    for price in range(1, 2001):
+        broker.submit(_request(order_type="LIMIT", price=float(price)))
+
+    fills = broker.on_tick("NIFTY26FEB22000CE", 1000.0)
+
+    assert len(fills) == 1001
+    assert {fill.price for fill in fills} == {1000.0}
+    assert broker.open_orders() == 999
+    assert broker.position("NIFTY26FEB22000CE") == (1001 * 50, 1000.0)
+
+
+def test_paper_broker_reports_symbols_that_need_prices():
+    broker = PaperBroker(metrics=LatencyRecorder())
+    broker.submit(_request(order_type="LIMIT", price=90.0, symbol="NIFTY26FEB21900CE"))
+    _bracket(broker)
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+
+    assert broker.active_symbols() == {"NIFTY26FEB21900CE", "NIFTY26FEB22000CE"}
+    broker.on_tick("NIFTY26FEB22000CE", 125.0)
+    assert broker.active_symbols() == {"NIFTY26FEB21900CE"}
+
+
+def test_paper_broker_order_book_drops_orders_closed_before_retention():
+    now = [0.0]
+    broker = PaperBroker(metrics=LatencyRecorder(), clock=lambda: now[0], closed_retention_seconds=60)
+    _bracket(broker)
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+    broker.on_tick("NIFTY26FEB22000CE", 125.0)
+
+    assert {row["orderStatus"] for row in broker.order_book()} == {"TRADED", "CANCELLED"}
+    now[0] = 61.0
+    assert broker.order_book() == []
+
+
+def test_order_manager_reports_paper_pnl_to_risk_manager():
+    class _Risk:
+        def __init__(self):
+            self.recorded = []
+
+        def reserve_batch(self, requests):
+            return [True for _ in requests]
+
+        def record_trade(self, request, response):
+            self.recorded.append((request.order_tag, response.get("pnl")))
+
+    class _Control:
+        def status(self):
+            return type("State", (), {"enabled": True})()
+
+    risk = _Risk()
+    broker = PaperBroker(metrics=LatencyRecorder())
+    manager = OrderManager(None, risk, _Control(), paper_broker=broker)
+
+    async def _trade():
+        entry = await manager.place_order_async(_request())
+        bracket = await manager.place_bracket_async(
+            _request("SELL", "SL-M", 90.0, "STOP_LOSS"),
+            _request("SELL", "LIMIT", 120.0, "TARGET"),
+        )
+        return entry, bracket
+
+    entry, bracket = asyncio.run(_trade())
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+    broker.on_tick("NIFTY26FEB22000CE", 88.0)
+
+    assert entry["orderStatus"] == "PENDING"
+    assert bracket.protected
+    assert risk.recorded == [(None, None), ("STOP_LOSS", None), ("TARGET", None), ("STOP_LOSS", -600.0)]
+
+
+def test_risk_manager_rejects_second_signal_once_paper_entry_fills(tmp_path):
+    class _Control:
+        def status(self):
+            return type("State", (), {"enabled": True})()
+
+    store = StateStore(tmp_path / "bot.db")
+    broker = PaperBroker(metrics=LatencyRecorder())
+    registry = OrderRegistry(broker.order_book)
+    limits = RiskLimits(max_trades_per_day=5, max_daily_loss=1000, risk_per_trade_pct=100.0)
+    # The position manager only ever sees the live account, which stays flat in paper mode.
+    risk = RiskManager(limits, store, PositionManager(store), order_registry=registry, paper_broker=broker)
+    manager = OrderManager(None, risk, _Control(), paper_broker=broker, order_registry=registry)
+
+    first = manager.place_order(_request())
+    broker.on_tick("NIFTY26FEB22000CE", 100.0)
+    registry.poll_once()
+
+    assert first is not None
+    assert not registry.has_pending_entry("NIFTY26FEB22000CE")
+    assert manager.place_order(_request()) is None
@@ -0,0 +1,57 @@
+from bot.core.instrument_cache import InstrumentTable
+from bot.core.position_manager import Position, PositionManager
+from bot.core.security_ids import SecurityIdMap
+from bot.core.state_store import StateStore
+
+
+def _broker_position(symbol, status="OPEN", quantity=50):
+    return {"symbol": symbol, "quantity": quantity, "side": "BUY", "entry_price": 101.5, "status": status}
+
+
+def test_position_manager_answers_open_lookups_from_book(tmp_path):
+    manager = PositionManager(StateStore(tmp_path / "bot.db"))
+
+    manager.record_from_broker([_broker_position("OPT1"), _broker_position("OPT2", status="EXITED")])
+
+    assert manager.has_open_position("OPT1") is True
+    assert manager.has_open_position("OPT2") is False
+    assert manager.get("OPT2").status == "EXITED"
+
+
+def test_position_manager_persists_only_changed_snapshots(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    manager = PositionManager(store)
+    payload = [_broker_position("OPT1")]
+
+    assert manager.update_positions(manager.parse_broker(payload)) is True
+    assert manager.update_positions(manager.parse_broker(payload)) is False
+    store.flush()
+
+    assert PositionManager(store).load() == [Position(symbol="OPT1", quantity=50, side="BUY", entry_price=101.5, status="OPEN")]
+    assert manager.update_positions([]) is True
+    store.close()
+    assert PositionManager(StateStore(tmp_path / "bot.db")).load() == []
+
+
+def test_position_manager_restores_legacy_position_list(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    store.put("positions", "book", [_broker_position("OPT1")])
+    store.flush()
+
+    manager = PositionManager(store)
+
+    assert manager.load() == [Position(symbol="OPT1", quantity=50, side="BUY", entry_price=101.5, status="OPEN")]
+    assert manager.has_open_position("OPT1") is True
+
+
+def test_position_manager_resolves_broker_security_ids(tmp_path):
+    security_ids = SecurityIdMap(
+        InstrumentTable.from_records([{"trading_symbol": "OPT1", "exchange": "NFO", "security_id": 35001}])
+    )
+    manager = PositionManager(StateStore(tmp_path / "bot.db"), security_ids)
+    row = {**_broker_position(""), "securityId": "35001", "exchangeSegment": "NSE_FNO"}
+    del row["symbol"]
+
+    manager.record_from_broker([row])
+
+    assert manager.has_open_position("OPT1") is True
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from bot.core.position_manager import PositionManager
+from bot.core.position_monitor import PollingPolicy, PositionMonitor
+from bot.core.state_store import StateStore
+from bot.utils.time_utils import IST
+
+
+class _FakeClient:
+    def __init__(self):
+        self.positions = []
+
+    def get_positions(self):
+        return list(self.positions)
+
+
+def _position(symbol, quantity=50, status="OPEN"):
+    return {"symbol": symbol, "quantity": quantity, "side": "BUY", "entry_price": 100.0, "status": status}
+
+
+def _monitor(tmp_path, now):
+    client = _FakeClient()
+    manager = PositionManager(StateStore(tmp_path / "bot.db"))
+    monitor = PositionMonitor(client, manager, PollingPolicy(), clock_source=lambda: now)
+    return client, manager, monitor
+
+
+def test_position_monitor_emits_only_change_events(tmp_path):
+    client, manager, monitor = _monitor(tmp_path, datetime(2026, 2, 3, 10, 0, tzinfo=IST))
+    seen = []
+    monitor.subscribe(lambda event: seen.append((event.kind, event.symbol)))
+
+    client.positions = [_position("OPT1"), _position("OPT2")]
+    monitor.poll_once()
+    monitor.poll_once()
+    client.positions = [_position("OPT1", quantity=25), _position("OPT2", quantity=0, status="EXITED")]
+    monitor.poll_once()
+
+    assert seen == [
+        ("OPENED", "OPT1"),
+        ("OPENED", "OPT2"),
+        ("QUANTITY_CHANGED", "OPT1"),
+        ("CLOSED", "OPT2"),
+    ]
+    assert manager.has_open_position("OPT2") is False
+
+
+def test_position_monitor_backs_off_when_flat_or_market_closed(tmp_path):
+    client, _, monitor = _monitor(tmp_path, datetime(2026, 2, 3, 10, 0, tzinfo=IST))
+    assert monitor.next_interval() == 5.0
+
+    client.positions = [_position("OPT1")]
+    monitor.poll_once()
+    assert monitor.next_interval() == 1.0
+
+    _, _, closed_monitor = _monitor(tmp_path / "closed", datetime(2026, 2, 7, 10, 0, tzinfo=IST))
+    assert closed_monitor.next_interval() == 60.0
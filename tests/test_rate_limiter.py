@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+
+from bot.core.rate_limiter import RateLimitSettings, RequestScheduler, TokenBucket, order_priority
+from bot.utils.retry import BackoffPolicy, parse_retry_after
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_configured_rate():
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=2, clock=clock)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0.5
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0
+
+
+def test_scheduler_releases_protective_orders_before_entries():
+    scheduler = RequestScheduler(RateLimitSettings({"orders": 20.0}))
+    released = []
+
+    async def _order(tag):
+        await scheduler.acquire("orders", order_priority(tag))
+        released.append(tag)
+
+    async def _run():
+        for _ in range(20):
+            await scheduler.acquire("orders")
+        await asyncio.gather(*(_order(tag) for tag in (None, "TARGET", None, "STOP_LOSS", "EXIT")))
+
+    asyncio.run(_run())
+
+    assert released == ["EXIT", "STOP_LOSS", "TARGET", None, None]
+
+
+def test_blocking_callers_release_protective_orders_before_entries():
+    scheduler = RequestScheduler(RateLimitSettings({"orders": 20.0}))
+    released = []
+
+    def _order(tag):
+        scheduler.acquire_blocking("orders", order_priority(tag))
+        released.append(tag)
+
+    for _ in range(20):
+        scheduler.acquire_blocking("orders")
+    entry = threading.Thread(target=_order, args=(None,))
+    entry.start()
+    time.sleep(0.01)
+    exit_order = threading.Thread(target=_order, args=("EXIT",))
+    exit_order.start()
+    entry.join()
+    exit_order.join()
+
+    assert released == ["EXIT", None]
+
+
+def test_backoff_honours_retry_after_and_caps_growth():
+    policy = BackoffPolicy(base_seconds=0.5, max_seconds=2.0)
+
+    assert 0.25 <= policy.delay(0) <= 0.5
+    assert 1.0 <= policy.delay(5) <= 2.0
+    assert 3.0 <= policy.delay(0, retry_after=parse_retry_after("3")) <= 3.5
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
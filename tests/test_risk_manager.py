@@ -0,0 +1,87 @@
+from bot.core.order_registry import OrderRegistry
+from bot.core.order_types import OrderRequest
+from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.core.state_store import StateStore
+
+
+class _FakePositionManager:
+    def has_open_position(self, symbol):
+        return False
+
+
+def _request(order_tag=None):
+    return OrderRequest(
+        symbol="NIFTY26FEB22000CE",
+        exchange="NFO",
+        side="BUY",
+        quantity=50,
+        order_type="MARKET",
+        product_type="INTRADAY",
+        order_tag=order_tag,
+    )
+
+
+def _manager(store):
+    limits = RiskLimits(max_trades_per_day=2, max_daily_loss=1000, risk_per_trade_pct=1.0)
+    return RiskManager(limits, store, _FakePositionManager())
+
+
+def test_risk_manager_enforces_trade_limit_from_memory(tmp_path):
+    manager = _manager(StateStore(tmp_path / "bot.db"))
+
+    manager.record_trade(_request(), {"ok": True})
+    manager.record_trade(_request(), {"ok": True})
+
+    assert manager.validate_order(_request()) is False
+    assert manager.validate_order(_request(order_tag="EXIT")) is True
+
+
+def test_risk_manager_recovers_counters_from_store(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    _manager(store).record_trade(_request(), {"pnl": -1200})
+    store.close()
+
+    recovered = _manager(StateStore(tmp_path / "bot.db"))
+
+    assert recovered.snapshot()["trades"] == 1
+    assert recovered.snapshot()["daily_loss"] == 1200
+    assert recovered.validate_order(_request()) is False
+
+
+def test_risk_manager_validates_batch_against_one_snapshot(tmp_path):
+    manager = _manager(StateStore(tmp_path / "bot.db"))
+    manager.record_trade(_request(), {"ok": True})
+    other = OrderRequest(
+        symbol="NIFTY26FEB22100PE",
+        exchange="NFO",
+        side="BUY",
+        quantity=50,
+        order_type="MARKET",
+        product_type="INTRADAY",
+    )
+
+    decisions = manager.validate_batch([_request(), _request(), other, _request(order_tag="STOP_LOSS")])
+
+    assert decisions == [True, False, False, True]
+
+
+def test_risk_manager_applies_realised_loss_from_protective_fills(tmp_path):
+    manager = _manager(StateStore(tmp_path / "bot.db"))
+    manager.record_trade(_request(), {"ok": True})
+
+    manager.record_trade(_request(order_tag="STOP_LOSS"), {"orderStatus": "PENDING"})
+    manager.record_trade(_request(order_tag="STOP_LOSS"), {"orderStatus": "TRADED", "pnl": -1000.0})
+
+    assert manager.snapshot() | {"date": None} == {"date": None, "trades": 1, "daily_loss": 1000.0}
+    assert manager.validate_order(_request()) is False
+
+
+def test_risk_manager_rejects_entry_while_one_is_pending(tmp_path):
+    registry = OrderRegistry(lambda: [{"orderId": "1", "orderStatus": "CANCELLED"}])
+    limits = RiskLimits(max_trades_per_day=5, max_daily_loss=1000, risk_per_trade_pct=1.0)
+    manager = RiskManager(limits, StateStore(tmp_path / "bot.db"), _FakePositionManager(), order_registry=registry)
+    registry.track(_request(), {"orderId": "1", "orderStatus": "TRANSIT"})
+
+    assert manager.validate_order(_request()) is False
+    registry.poll_once()
+    assert manager.validate_order(_request()) is True
@@ -0,0 +1,46 @@
+from bot.core.instrument_cache import InstrumentDelta, InstrumentTable
+from bot.core.security_ids import SecurityIdMap, SecurityRef
+
+
+def _instrument(trading_symbol, security_id, exchange="NFO", segment=None):
+    return {
+        "symbol": "NIFTY",
+        "trading_symbol": trading_symbol,
+        "exchange": exchange,
+        "security_id": security_id,
+        **({"segment": segment} if segment else {}),
+    }
+
+
+def test_security_id_map_resolves_both_ways():
+    security_ids = SecurityIdMap(
+        InstrumentTable.from_records(
+            [
+                _instrument("NIFTY26FEB22000CE", 35001),
+                _instrument("SENSEX26FEB80000CE", 35001, exchange="BFO"),
+                _instrument("UNLISTED", 0),
+            ]
+        )
+    )
+
+    assert len(security_ids) == 2
+    assert security_ids.resolve("NIFTY26FEB22000CE") == SecurityRef(security_id=35001, segment="NSE_FNO")
+    assert security_ids.resolve("UNLISTED") is None
+    assert security_ids.symbol("35001", "BSE_FNO") == "SENSEX26FEB80000CE"
+    assert security_ids.symbol(35001, "NSE_FNO") == "NIFTY26FEB22000CE"
+    assert security_ids.symbol("not-an-id") is None
+
+
+def test_security_id_map_applies_refresh_delta():
+    security_ids = SecurityIdMap(InstrumentTable.from_records([_instrument("NIFTY26FEB22000CE", 35001)]))
+
+    security_ids.apply_delta(
+        InstrumentDelta(
+            added=[{"trading_symbol": "NIFTY26FEB22050CE", "security_id": 35002, "segment": "NSE_FNO"}],
+            removed=[{"trading_symbol": "NIFTY26FEB22000CE"}],
+        )
+    )
+
+    assert security_ids.resolve("NIFTY26FEB22000CE") is None
+    assert security_ids.symbol(35001) is None
+    assert security_ids.symbol(35002) == "NIFTY26FEB22050CE"
@@ -1,6 +1,10 @@
+import asyncio
+import os
+import time
+
 import pytest
 
-from bot.strategy.signal_router import SignalRouter, SignalContext
+from bot.strategy.signal_router import SignalContext, SignalRouter, StrategyExecution, StrategyTimeout
 from bot.strategy.scalping_logic import Signal, TradePlan
 from bot.core.order_types import OrderRequest
 
@@ -54,3 +58,96 @@ def test_signal_router_rejects_unknown_strategy():
 
     with pytest.raises(ValueError):
         router.route(signal, SignalContext(spot_price=22000))
+
+
+class _SlowStrategy(_FakeStrategy):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def build_trade(self, signal, spot_price):
+        time.sleep(self.delay)
+        return super().build_trade(signal, spot_price)
+
+
+class _PicklableStrategy:
+    name = "PROCESS"
+
+    def build_trade(self, signal, spot_price):
+        return TradePlan(
+            entry=OrderRequest(
+                symbol=f"PID{os.getpid()}",
+                exchange="NFO",
+                side=signal.side,
+                quantity=1,
+                order_type="MARKET",
+                product_type="INTRADAY",
+            ),
+            stop_loss_price=spot_price - 10,
+        )
+
+
+def _signal(strategy="SCALP_ATM"):
+    return Signal(
+        strategy=strategy,
+        symbol="NIFTY",
+        side="BUY",
+        timeframe="1m",
+        price=22000,
+        timestamp="2026-02-03T10:00:00+00:00",
+    )
+
+
+def test_signal_router_times_out_thread_backed_strategy():
+    router = SignalRouter(
+        {"SLOW"},
+        {"SLOW": _SlowStrategy(0.5)},
+        execution={"SLOW": StrategyExecution(backend="thread", timeout_seconds=0.05)},
+    )
+
+    with pytest.raises(StrategyTimeout):
+        asyncio.run(router.route_async(_signal("SLOW"), SignalContext(spot_price=22000)))
+    router.close()
+
+
+def test_signal_router_fans_out_without_waiting_for_subscribers():
+    handled = []
+    router = SignalRouter(
+        {"SCALP_ATM", "SLOW"},
+        {"SCALP_ATM": _FakeStrategy(), "SLOW": _SlowStrategy(0.2)},
+        execution={"SLOW": StrategyExecution(backend="thread", timeout_seconds=1.0)},
+        subscriptions={"SCALP_ATM": ["SLOW"]},
+    )
+
+    async def _handler(name, signal, plan):
+        handled.append((name, plan.entry.symbol))
+
+    async def _run():
+        router.set_plan_handler(_handler)
+        started = time.perf_counter()
+        plan = await router.route_async(_signal(), SignalContext(spot_price=22000))
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0.4)
+        return plan, elapsed
+
+    plan, elapsed = asyncio.run(_run())
+    router.close()
+
+    assert plan.entry.symbol == "OPT"
+    assert elapsed < 0.1
+    assert handled == [("SLOW", "OPT")]
+
+
+def test_signal_router_runs_process_backed_strategy_in_worker():
+    router = SignalRouter(
+        {"PROCESS"},
+        {"PROCESS": _PicklableStrategy()},
+        execution={"PROCESS": StrategyExecution(backend="process", timeout_seconds=10)},
+        max_workers=1,
+    )
+
+    plan = router.route(_signal("PROCESS"), SignalContext(spot_price=22000))
+    router.close()
+
+    assert plan.entry.symbol != f"PID{os.getpid()}"
+    assert plan.stop_loss_price == 21990
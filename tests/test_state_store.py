@@ -0,0 +1,82 @@
+import json
+import threading
+
+import pytest
+
+from bot.core.state_store import StateStore
+
+
+def test_state_store_commits_transaction_writes_together(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+
+    with store.transaction():
+        store.put("risk", "daily", {"trades": 1})
+        with store.transaction():
+            store.put("orders", "signal-1:entry", {"orderId": "1"})
+        assert store.get("risk", "daily") is None
+    store.flush()
+
+    assert store.get("risk", "daily") == {"trades": 1}
+    assert store.get("orders", "signal-1:entry") == {"orderId": "1"}
+
+
+def test_state_store_durable_writes_are_committed_on_return(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    other = StateStore(tmp_path / "bot.db")
+
+    store.put("risk", "daily", {"trades": 1}, durable=True)
+    assert other.get("risk", "daily") == {"trades": 1}
+
+    with store.transaction():
+        store.put("idempotency", "signal-1", {"orderId": "1"})
+        store.put("risk", "daily", {"trades": 2}, durable=True)
+    assert other.get("risk", "daily") == {"trades": 2}
+    assert other.get("idempotency", "signal-1") == {"orderId": "1"}
+
+
+def test_state_store_drops_writes_of_failed_transaction(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    store.put("risk", "daily", {"trades": 1})
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.put("risk", "daily", {"trades": 2})
+            store.delete("risk", "daily")
+            raise RuntimeError("order failed")
+    store.flush()
+
+    assert store.get("risk", "daily") == {"trades": 1}
+
+
+def test_state_store_serialises_concurrent_writers(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+
+    def _write(thread):
+        for index in range(200):
+            store.put("orders", f"{thread}:{index}", {"index": index})
+
+    threads = [threading.Thread(target=_write, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    assert len(StateStore(tmp_path / "bot.db").items("orders")) == 800
+
+
+def test_state_store_imports_legacy_files_once(tmp_path):
+    (tmp_path / "risk.json").write_text(json.dumps({"trades": 1}), encoding="utf-8")
+    (tmp_path / "risk.journal").write_text('{"trades": 2}\n{"trades": ', encoding="utf-8")
+    records = [{"key": "a", "stored_at": 1.0, "response": {"orderId": "1"}}]
+    (tmp_path / "orders.jsonl").write_text("\n".join(json.dumps(record) for record in records), encoding="utf-8")
+    store = StateStore(tmp_path / "bot.db")
+
+    assert store.import_document("risk", "daily", tmp_path / "risk.json") is True
+    assert store.import_records("orders", tmp_path / "orders.jsonl") == 1
+
+    assert store.get("risk", "daily") == {"trades": 2}
+    assert store.items("orders") == [("a", {"stored_at": 1.0, "response": {"orderId": "1"}})]
+    assert not (tmp_path / "risk.json").exists()
+    assert (tmp_path / "risk.journal.migrated").exists()
+    assert store.import_document("risk", "daily", tmp_path / "risk.json") is False
@@ -0,0 +1,30 @@
+import time
+
+from bot.core.state_store import StateStore
+from bot.core.trading_control import TradingControl
+
+
+def test_trading_control_caches_until_refresh_interval(tmp_path):
+    control = TradingControl(StateStore(tmp_path / "bot.db"), refresh_interval_ms=50)
+    control.enable(reason="startup")
+
+    cli_store = StateStore(tmp_path / "bot.db")
+    TradingControl(cli_store).disable(reason="cli")
+    cli_store.close()
+
+    assert control.status().enabled is True
+    time.sleep(0.06)
+    state = control.status()
+    assert state.enabled is False
+    assert state.reason == "cli"
+
+
+def test_trading_control_skips_reload_when_store_unchanged(tmp_path):
+    store = StateStore(tmp_path / "bot.db")
+    control = TradingControl(store, refresh_interval_ms=0)
+    control.disable(reason="risk")
+    loads = []
+    control._load_state = lambda: loads.append(1)
+
+    assert control.status().enabled is False
+    assert loads == []
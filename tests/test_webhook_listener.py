@@ -1,9 +1,27 @@
+import json
+import threading
 from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from fastapi.testclient import TestClient
 
-from bot.core.order_types import OrderRequest
-from bot.strategy.scalping_logic import TradePlan, Signal
+from bot.core.dhan_client import AsyncDhanClient, DhanClient, DhanCredentials
+from bot.core.idempotency import IdempotencyCache
+from bot.core.instrument_cache import InstrumentTable
+from bot.core.order_manager import OrderManager
+from bot.core.order_templates import OrderTemplateCache
+from bot.core.position_manager import PositionManager
+from bot.core.risk_manager import RiskLimits, RiskManager
+from bot.core.security_ids import SecurityIdMap
+from bot.core.trading_control import TradingControl
+from bot.core.state_store import StateStore
+from bot.core.order_types import BracketResult, OrderRequest
+from bot.strategy.atm_option_selector import AtmOptionSelector
+from bot.strategy.scalping_logic import ScalpingLogic, TradePlan
+from bot.strategy.signal_router import SignalRouter
+from bot.strategy.strategies import ScalpAtmStrategy
+from bot.market_data.spot_provider import StalePriceError
+from bot.utils.metrics import LatencyRecorder
 from bot.webhook.listener import create_app
 
 
@@ -23,18 +41,27 @@ class _FakeRouter:
         )
         return TradePlan(entry=entry, stop_loss_price=123.0)
 
+    async def route_batch_async(self, signals, contexts):
+        return [self.route(signal, context) for signal, context in zip(signals, contexts)]
+
+    def set_plan_handler(self, handler):
+        self.plan_handler = handler
+
 
 class _FakeOrderManager:
     def __init__(self):
         self.orders = []
 
-    def place_order(self, request):
+    async def place_order_async(self, request):
         self.orders.append(("entry", request))
         return {"ok": True, "type": "entry"}
 
-    def place_stop_loss(self, request):
-        self.orders.append(("sl", request))
-        return {"ok": True, "type": "sl"}
+    async def place_entries_async(self, requests):
+        return [await self.place_order_async(request) for request in requests]
+
+    async def place_bracket_async(self, stop_loss, target=None):
+        self.orders.append(("sl", stop_loss))
+        return BracketResult(stop_loss={"ok": True, "type": "sl"}, target=None)
 
 
 class _FakeTradingControl:
@@ -94,3 +121,239 @@ def test_webhook_rejects_stale_signal():
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Stale signal"
+
+
+def test_webhook_exposes_connection_stats():
+    stats = {"orders": {"requests": 2, "new_connections": 0, "reused_connections": 2}}
+    app = create_app(
+        _FakeRouter(),
+        _FakeOrderManager(),
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=_FakeTradingControl(),
+        connection_stats_provider=lambda: stats,
+    )
+
+    response = TestClient(app).get("/metrics/connections")
+
+    assert response.json() == stats
+
+
+def test_webhook_records_stage_latencies_and_rejects_invalid_payload():
+    recorder = LatencyRecorder()
+    app = create_app(
+        _FakeRouter(),
+        _FakeOrderManager(),
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=_FakeTradingControl(),
+        metrics=recorder,
+    )
+    client = TestClient(app)
+
+    client.post("/signal", json=_payload(datetime.now(timezone.utc).isoformat()))
+    invalid = client.post("/signal", json={**_payload(datetime.now(timezone.utc).isoformat()), "extra": 1})
+    stages = client.get("/metrics").json()["stages"]
+
+    assert invalid.status_code == 422
+    for stage in ("ttl_check", "spot_price", "route", "entry_order", "bracket_orders"):
+        assert stages[stage]["count"] == 1
+    assert stages["payload_validation"]["count"] == 2
+    assert stages["signal_total"]["count"] == 2
+    assert stages["signal_total"]["max_ms"] >= stages["signal_total"]["p50_ms"]
+
+
+def test_webhook_rejects_signal_without_fresh_spot_price():
+    def _stale_provider(symbol, price):
+        raise StalePriceError(symbol)
+
+    app = create_app(
+        _FakeRouter(),
+        _FakeOrderManager(),
+        signal_ttl_seconds=30,
+        spot_price_provider=_stale_provider,
+        trading_control=_FakeTradingControl(),
+    )
+
+    response = TestClient(app).post("/signal", json=_payload(datetime.now(timezone.utc).isoformat()))
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Stale spot price"
+
+
+def test_failed_signal_can_be_retried_within_dedupe_window():
+    calls = []
+
+    def _provider(symbol, price):
+        calls.append(symbol)
+        if len(calls) == 1:
+            raise StalePriceError(symbol)
+        return price
+
+    app = create_app(
+        _FakeRouter(),
+        _FakeOrderManager(),
+        signal_ttl_seconds=30,
+        spot_price_provider=_provider,
+        trading_control=_FakeTradingControl(),
+    )
+    client = TestClient(app)
+    payload = _payload(datetime.now(timezone.utc).isoformat())
+
+    statuses = [client.post("/signal", json=payload).status_code for _ in range(2)]
+
+    assert statuses == [503, 200]
+
+
+def test_batch_endpoint_reports_per_signal_outcomes():
+    recorder = LatencyRecorder()
+    order_manager = _FakeOrderManager()
+    app = create_app(
+        _FakeRouter(),
+        order_manager,
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=_FakeTradingControl(),
+        metrics=recorder,
+    )
+    fresh = datetime.now(timezone.utc).isoformat()
+    stale = (datetime.now(timezone.utc) - timedelta(seconds=60)).isoformat()
+
+    response = TestClient(app).post("/signals/batch", json=[_payload(fresh), _payload(fresh), _payload(stale)])
+
+    results = response.json()["results"]
+    assert response.status_code == 200
+    assert [result["status_code"] for result in results] == [200, 409, 400]
+    assert results[0]["entry"]["ok"] is True
+    assert results[1]["detail"] == "Duplicate signal"
+    assert len(order_manager.orders) == 2
+    assert recorder.counter("duplicate_signals") == 1
+
+
+def test_single_signals_share_a_coalesced_batch():
+    order_manager = _FakeOrderManager()
+    recorder = LatencyRecorder()
+    app = create_app(
+        _FakeRouter(),
+        order_manager,
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=_FakeTradingControl(),
+        metrics=recorder,
+        coalesce_window_ms=5,
+    )
+    client = TestClient(app)
+    payload = _payload(datetime.now(timezone.utc).isoformat())
+
+    first = client.post("/signal", json=payload)
+    repeat = client.post("/signal", json=payload)
+
+    assert first.status_code == 200
+    assert repeat.json() == first.json()
+    assert len(order_manager.orders) == 2
+    assert recorder.counter("duplicate_signals") == 1
+
+
+def test_idempotency_key_header_replays_cached_response(tmp_path):
+    order_manager = _FakeOrderManager()
+    cache = IdempotencyCache(StateStore(tmp_path / "bot.db"))
+    app = create_app(
+        _FakeRouter(),
+        order_manager,
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=_FakeTradingControl(),
+        idempotency_cache=cache,
+    )
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "alert-42"}
+
+    first = client.post("/signal", json=_payload(datetime.now(timezone.utc).isoformat()), headers=headers)
+    retry = client.post("/signal", json=_payload(datetime.now(timezone.utc).isoformat()), headers=headers)
+
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert len(order_manager.orders) == 2
+    assert order_manager.orders[0][1].idempotency_key == "alert-42:entry"
+    assert cache.get("alert-42") == first.json()
+
+
+class _BrokerStub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    bodies = []
+
+    def do_POST(self):
+        _BrokerStub.bodies.append(json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0)))))
+        body = json.dumps({"orderId": str(len(_BrokerStub.bodies)), "orderStatus": "TRANSIT"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_live_orders_carry_security_ids_when_wired_like_main(tmp_path):
+    _BrokerStub.bodies = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BrokerStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    credentials = DhanCredentials(client_id="C1", access_token="T", base_url=f"http://127.0.0.1:{server.server_address[1]}")
+    expiry = datetime.now(timezone.utc).date().isoformat()
+    instruments = InstrumentTable.from_records(
+        [
+            {
+                "symbol": "NIFTY",
+                "expiry": expiry,
+                "strike": 22000,
+                "option_type": option_type,
+                "trading_symbol": f"NIFTY-22000-{option_type}",
+                "lot_size": 50,
+                "exchange": "NFO",
+                "security_id": security_id,
+            }
+            for option_type, security_id in (("CE", 35001), ("PE", 35002))
+        ]
+    )
+    store = StateStore(tmp_path / "bot.db")
+    security_ids = SecurityIdMap()
+    security_ids.load(instruments)
+    client = DhanClient(credentials, security_ids=security_ids)
+    async_client = AsyncDhanClient(credentials, security_ids=security_ids)
+    position_manager = PositionManager(store, security_ids)
+    risk_manager = RiskManager(RiskLimits(5, 5000, 0.5, None), store, position_manager)
+    trading_control = TradingControl(store)
+    order_templates = OrderTemplateCache(security_ids=security_ids)
+    order_manager = OrderManager(
+        client,
+        risk_manager,
+        trading_control,
+        execution_mode="live",
+        async_client=async_client,
+        state_store=store,
+        order_templates=order_templates,
+    )
+    selector = AtmOptionSelector(
+        instruments, {"NIFTY": 50}, on_ladder=lambda ladder: order_templates.warm(ladder.selections())
+    )
+    router = SignalRouter(
+        {"SCALP_ATM"},
+        {"SCALP_ATM": ScalpAtmStrategy(selector=selector, logic=ScalpingLogic(sl_points=15, target_points=30))},
+    )
+    app = create_app(
+        router=router,
+        order_manager=order_manager,
+        signal_ttl_seconds=30,
+        spot_price_provider=lambda s, p: p,
+        trading_control=trading_control,
+    )
+
+    response = TestClient(app).post("/signal", json=_payload(datetime.now(timezone.utc).isoformat()))
+    server.shutdown()
+    server.server_close()
+    store.close()
+
+    assert response.status_code == 200
+    assert _BrokerStub.bodies[0]["symbol"] == "NIFTY-22000-CE"
+    assert {(body["securityId"], body["exchangeSegment"]) for body in _BrokerStub.bodies} == {("35001", "NSE_FNO")}